@@ -0,0 +1,2 @@
+# test_game.py is an interactive script reading stdin, not a test module
+collect_ignore = ["test_game.py"]
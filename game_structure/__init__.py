@@ -4,7 +4,25 @@ from .game import Game
 from .deck import Deck
 from .player import HumanPlayer, AIPlayer
 from .game_state import GameState
+from .table_state import TableState
+from .rng import PCG32, DealGenerator
 from .betting_round import BettingRound
 from .action import Action, ActionType
 from .hand import Hand
-from .card import Card
+from .card import Card, CARDS
+from .stats import OpponentTracker
+from .features import FeaturePipeline, Feature
+from .evaluator import evaluate_codes
+from .hand_strength import HandStrengthCalculator, HandStrength, showdown_equities
+from .events import (
+    EventBus,
+    Event,
+    EventType,
+    HistoryWriter,
+    ConsoleRenderer,
+    ReplayBuffer,
+)
+from .checkpoint import save_checkpoint, load_checkpoint, save_session, load_session
+from .session import Session, BlindSchedule
+from .pot import build_pots, award_pots, uncalled_chips
+from .hand_range import Range, range_equity
@@ -12,7 +12,11 @@ class ActionType(Enum):
 
 
 class Action:
-    """Represents a player action (fold, check, call, raise)"""
+    """Represents a player action (fold, check, call, raise)
+
+    The amount of a raise is the total street bet raised to, chips already put in
+    during the street included, or -1 to go all-in.
+    """
 
     def __init__(
         self, action_type: str | ActionType, amount: Optional[int | str] = None
@@ -21,7 +25,8 @@ class Action:
 
         Args:
             action_type (str | ActionType): Type of action as string or ActionType
-            amount (Optional[int]): Amount for raise actions
+            amount (Optional[int]): Street bet to raise to for raise actions, -1 or
+                "allin" for all-in
         """
         # Convert string to ActionType if needed
         if isinstance(action_type, str):
@@ -27,11 +27,16 @@ class BettingRound:
         if len(active_players) == 1:
             return True
 
+        # All-in players cannot act anymore
+        can_act = [p for p in active_players if not p.is_all_in]
+        if not can_act or (
+            len(can_act) == 1 and can_act[0].current_bet >= self.current_bet
+        ):
+            return True
+
         # Check if all bets are matched
-        all_bets_matched = all(
-            p.current_bet == self.current_bet for p in active_players
-        )
-        all_players_spoke = all(p.spoke for p in active_players)
+        all_bets_matched = all(p.current_bet == self.current_bet for p in can_act)
+        all_players_spoke = all(p.spoke for p in can_act)
 
         if all_bets_matched and all_players_spoke:
             return True
@@ -39,11 +44,17 @@ class BettingRound:
         else:
             return False
 
-    def reset(self):
-        """Reset the betting round state"""
+    def reset(self, stage: int = 0):
+        """Reset the betting round state so the round can be reused for a new hand
+
+        Args:
+            stage (int, optional): Stage to restart from
+        """
+        self.stage = stage
         self.current_bet = 0
         self.min_bet = 0
         self.pot = 0
+        self.current_player_index = -1
 
     def update_pot(self, amount: int):
         """Update the pot with new bet amount
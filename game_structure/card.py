@@ -29,6 +29,20 @@ class Card:
         self.rank = rank
         self.suit = suit
 
+    @property
+    def code(self) -> int:
+        """Integer code of the card in 0-51, following the deck order (suit-major)"""
+        return self.suit * 13 + self.rank - 2
+
+    @classmethod
+    def from_code(cls, code: int) -> "Card":
+        """Create a card from its integer code
+
+        Args:
+            code (int): Card code in 0-51
+        """
+        return cls(code % 13 + 2, code // 13)
+
     def __str__(self):
         """Return string representation of the card"""
         return f"{RANKS[self.rank]}{SUITS[self.suit]}"
@@ -47,3 +61,7 @@ class Card:
         if not isinstance(other, Card):
             return NotImplemented
         return self.rank < other.rank
+
+
+# One shared card object per code, indexed by `Card.code`
+CARDS = tuple(Card.from_code(code) for code in range(52))
@@ -0,0 +1,347 @@
+import os
+import struct
+import zlib
+from typing import List
+from .action import Action, ActionType
+from .betting_round import BettingRound
+from .card import CARDS
+from .deck import Deck
+from .game import Game
+from .hand import Hand
+from .player import AIPlayer, HumanPlayer, Player
+from .session import BlindSchedule, Session
+from .table_state import NO_CARD
+
+MAGIC = b"RLPK"
+VERSION = 3  # 2: per-hand contributions column, 3: no game RNG state
+SESSION_MAGIC = b"RLSS"
+SESSION_VERSION = 1
+PLAYER_CLASSES = {cls.__name__: cls for cls in (Player, HumanPlayer, AIPlayer)}
+ACTION_TYPES = list(ActionType)
+
+_HEADER = struct.Struct("<4sH")
+_GAME = struct.Struct("<qiiii?QIqqq")
+_ROUND = struct.Struct("<bqqqi")
+_ACTION = struct.Struct("<bbbq")
+_CRC = struct.Struct("<I")
+# hands per level, rebuy chips, max rebuys (-1 if unlimited), freeze gc, hands played
+_SESSION = struct.Struct("<Iqq?Q")
+_COUNT = struct.Struct("<I")
+_LEVEL = struct.Struct("<qq")
+_INT = struct.Struct("<q")
+
+
+class _Writer:
+    """Appends binary fields to a buffer"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def pack(self, fmt: struct.Struct, *values):
+        self.buffer += fmt.pack(*values)
+
+    def text(self, value: str):
+        data = (value or "").encode()
+        self.buffer += struct.pack("<I", len(data)) + data
+
+    def blob(self, data: bytes):
+        self.buffer += struct.pack("<I", len(data)) + data
+
+
+class _Reader:
+    """Reads binary fields from a buffer"""
+
+    def __init__(self, buffer: bytes):
+        self.buffer = memoryview(buffer)
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self.buffer, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def blob(self) -> bytes:
+        (size,) = struct.unpack_from("<I", self.buffer, self.offset)
+        self.offset += 4 + size
+        return bytes(self.buffer[self.offset - size : self.offset])
+
+    def text(self) -> str:
+        return self.blob().decode()
+
+
+def dumps(game: Game) -> bytes:
+    """Serialize a game into a versioned binary snapshot
+
+    The snapshot holds the players and their table state, the dealer and blind positions,
+    the hand number, the seed and the position in the deals, the current betting round, the
+    cards of the hands and of the deck, the action history and the text history. Event
+    subscribers are not saved.
+
+    Args:
+        game (Game): Game to serialize
+
+    Returns:
+        bytes: Snapshot, ending with a CRC32 of its content
+    """
+    w = _Writer()
+    w.pack(_HEADER, MAGIC, VERSION)
+    w.pack(
+        _GAME,
+        game.hand_number,
+        game.pov,
+        game.dealer_position,
+        game.small_blind_position,
+        game.big_blind_position,
+        game.game_over,
+        game.seed,
+        game.deals.block_size,
+        game.deals_served,
+        game.parameter["small_blind"],
+        game.parameter["big_blind"],
+    )
+    w.text(game.name)
+
+    w.pack(struct.Struct("<H"), len(game.players))
+    for player in game.players:
+        w.text(type(player).__name__)
+        w.text(player.name)
+        w.text(getattr(player, "strategy", ""))
+        w.pack(struct.Struct("<i"), player.position)
+    w.blob(game.table.to_bytes())
+
+    community = game.players[0].hand.community_cards if game.players else []
+    w.blob(bytes(card.code for card in community))
+    w.blob(bytes(card.code for card in game.deck))
+
+    round_ = game.current_round
+    w.pack(struct.Struct("<?"), round_ is not None)
+    if round_ is not None:
+        w.pack(
+            _ROUND,
+            round_.stage,
+            round_.min_bet,
+            round_.current_bet,
+            round_.pot,
+            round_.current_player_index,
+        )
+
+    w.pack(struct.Struct("<I"), len(game.action_history))
+    for stage, position, action in game.action_history:
+        amount = action.amount if action.amount is not None else -2
+        w.pack(_ACTION, stage, position, ACTION_TYPES.index(action.type), amount)
+    w.text(game.game_state.historic)
+
+    w.pack(_CRC, zlib.crc32(w.buffer))
+    return bytes(w.buffer)
+
+
+def loads(snapshot: bytes) -> Game:
+    """Restore a game from a snapshot produced by `dumps`
+
+    Args:
+        snapshot (bytes): Snapshot to restore
+
+    Returns:
+        Game: Game in the exact state it was saved in
+    """
+    r = _check_snapshot(snapshot, MAGIC, VERSION, "game")
+    (
+        hand_number,
+        pov,
+        dealer_position,
+        small_blind_position,
+        big_blind_position,
+        game_over,
+        seed,
+        block_size,
+        deals_served,
+        small_blind,
+        big_blind,
+    ) = r.unpack(_GAME)
+    game = Game(name=r.text() or None, pov=pov, seed=seed)
+    game.hand_number = hand_number
+    game.dealer_position = dealer_position
+    game.small_blind_position = small_blind_position
+    game.big_blind_position = big_blind_position
+    game.game_over = game_over
+    game.deals.block_size = block_size
+    game.deals_served = deals_served
+    game.parameter = {"small_blind": small_blind, "big_blind": big_blind}
+
+    (num_players,) = r.unpack(struct.Struct("<H"))
+    for _ in range(num_players):
+        cls = PLAYER_CLASSES[r.text()]
+        name, strategy = r.text(), r.text()
+        player = cls(name, 0, strategy) if cls is AIPlayer else cls(name, 0)
+        game.add_player(player)
+        (player.position,) = r.unpack(struct.Struct("<i"))
+    game.table.load_bytes(r.blob())
+
+    community = [CARDS[code] for code in r.blob()]
+    for player in game.players:
+        player.hand = Hand()
+        for code in game.table.hole_cards[2 * player._seat : 2 * player._seat + 2]:
+            if code != NO_CARD:
+                player.hand.add_hole_card(CARDS[code])
+        for card in community:
+            player.hand.add_community_card(card)
+    game.deck = Deck(r.blob())
+
+    (has_round,) = r.unpack(struct.Struct("<?"))
+    if has_round:
+        stage, min_bet, current_bet, pot, current_player_index = r.unpack(_ROUND)
+        game.current_round = BettingRound(stage)
+        game.current_round.min_bet = min_bet
+        game.current_round.current_bet = current_bet
+        game.current_round.pot = pot
+        game.current_round.current_player_index = current_player_index
+
+    (num_actions,) = r.unpack(struct.Struct("<I"))
+    history: List = []
+    for _ in range(num_actions):
+        stage, position, type_index, amount = r.unpack(_ACTION)
+        action = Action(ACTION_TYPES[type_index], amount if amount != -2 else None)
+        history.append((stage, position, action))
+    game.action_history = history
+    game.game_state.historic = r.text()
+    return game
+
+
+def _check_snapshot(
+    snapshot: bytes, magic: bytes, version: int, kind: str
+) -> "_Reader":
+    """Check the CRC and header of a snapshot and return a reader past the header"""
+    (crc,) = _CRC.unpack_from(snapshot, len(snapshot) - _CRC.size)
+    if zlib.crc32(snapshot[: -_CRC.size]) != crc:
+        raise ValueError("Corrupted checkpoint (CRC mismatch)")
+    r = _Reader(snapshot)
+    found_magic, found_version = r.unpack(_HEADER)
+    if found_magic != magic:
+        raise ValueError(f"Not a {kind} checkpoint")
+    if found_version != version:
+        raise ValueError(f"Unsupported {kind} checkpoint version: {found_version}")
+    return r
+
+
+def dumps_session(session: Session) -> bytes:
+    """Serialize a session, its game included, into a versioned binary snapshot
+
+    On top of the game snapshot (see `dumps`), the session block holds the blind
+    schedule, the rebuy rules, the number of hands played (which sets the blind level),
+    the rebuys of each player and the eliminations.
+
+    Args:
+        session (Session): Session to serialize, between two hands
+
+    Returns:
+        bytes: Snapshot, ending with a CRC32 of its content
+    """
+    w = _Writer()
+    w.pack(_HEADER, SESSION_MAGIC, SESSION_VERSION)
+    schedule = session.schedule
+    levels = schedule.levels if schedule is not None else []
+    w.pack(
+        _SESSION,
+        schedule.hands_per_level if schedule is not None else 0,
+        session.rebuy_chips,
+        session.max_rebuys if session.max_rebuys is not None else -1,
+        session.freeze_gc,
+        session.hands_played,
+    )
+    w.pack(_COUNT, len(levels))
+    for small_blind, big_blind in levels:
+        w.pack(_LEVEL, small_blind, big_blind)
+    w.pack(_COUNT, len(session.rebuys))
+    for name, count in session.rebuys.items():
+        w.text(name)
+        w.pack(_INT, count)
+    w.pack(_COUNT, len(session.eliminated))
+    for name, hand_number in session.eliminated:
+        w.text(name)
+        w.pack(_INT, hand_number)
+    w.blob(dumps(session.game))
+
+    w.pack(_CRC, zlib.crc32(w.buffer))
+    return bytes(w.buffer)
+
+
+def loads_session(snapshot: bytes) -> Session:
+    """Restore a session from a snapshot produced by `dumps_session`
+
+    Args:
+        snapshot (bytes): Snapshot to restore
+
+    Returns:
+        Session: Session in the exact state it was saved in
+    """
+    r = _check_snapshot(snapshot, SESSION_MAGIC, SESSION_VERSION, "session")
+    hands_per_level, rebuy_chips, max_rebuys, freeze_gc, hands_played = r.unpack(
+        _SESSION
+    )
+    (num_levels,) = r.unpack(_COUNT)
+    levels = [r.unpack(_LEVEL) for _ in range(num_levels)]
+    rebuys = {}
+    (num_rebuys,) = r.unpack(_COUNT)
+    for _ in range(num_rebuys):
+        name = r.text()
+        (rebuys[name],) = r.unpack(_INT)
+    eliminated = []
+    (num_eliminated,) = r.unpack(_COUNT)
+    for _ in range(num_eliminated):
+        name = r.text()
+        (hand_number,) = r.unpack(_INT)
+        eliminated.append((name, hand_number))
+    game = loads(r.blob())
+
+    schedule = BlindSchedule(levels, hands_per_level) if levels else None
+    session = Session(
+        game,
+        schedule,
+        rebuy_chips,
+        max_rebuys if max_rebuys >= 0 else None,
+        freeze_gc,
+    )
+    session.hands_played = hands_played
+    session.rebuys = rebuys
+    session.eliminated = eliminated
+    return session
+
+
+def _write_atomically(data: bytes, path: str):
+    """Write to a temporary file which then replaces `path`"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def save_checkpoint(game: Game, path: str):
+    """Atomically write a snapshot of a game
+
+    The snapshot is written to a temporary file which then replaces `path`, so a crash
+    during the write leaves the previous checkpoint intact.
+
+    Args:
+        game (Game): Game to save
+        path (str): Destination file
+    """
+    _write_atomically(dumps(game), path)
+
+
+def load_checkpoint(path: str) -> Game:
+    """Restore a game from a checkpoint file written by `save_checkpoint`"""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def save_session(session: Session, path: str):
+    """Atomically write a snapshot of a session, see `save_checkpoint`"""
+    _write_atomically(dumps_session(session), path)
+
+
+def load_session(path: str) -> Session:
+    """Restore a session from a file written by `save_session`"""
+    with open(path, "rb") as f:
+        return loads_session(f.read())
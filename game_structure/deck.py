@@ -1,21 +1,54 @@
-from .card import Card
+from random import shuffle
+from typing import TYPE_CHECKING, Iterable, Optional
+from .card import CARDS
+
+if TYPE_CHECKING:
+    from .rng import PCG32
 
 
 class Deck(list):
 
-    def __init__(self):
-        """Initialize a standard 52-card deck"""
+    def __init__(self, order: Optional[Iterable[int]] = None, rng: "PCG32" = None):
+        """Initialize a standard 52-card deck
+
+        Args:
+            order (Iterable[int], optional): Card codes in deck order, the last one being
+                drawn first. If None, the deck is built and shuffled.
+            rng (PCG32, optional): Generator used to shuffle, global random state if None
+        """
         super().__init__()
-        for suit in range(4):  # 0=hearts, 1=diamonds, 2=clubs, 3=spades
-            for rank in range(2, 15):  # 2-14 representing 2 through Ace
-                self.append(Card(rank, suit))
-        self.shuffle()
+        if order is not None:
+            self.extend(CARDS[code] for code in order)
+            return
+        # Codes follow this order: 0=hearts, 1=diamonds, 2=clubs, 3=spades, then 2 to Ace
+        self.extend(CARDS)
+        self.shuffle(rng)
+
+    def reset(self, order: Optional[Iterable[int]] = None, rng: "PCG32" = None):
+        """Refill the deck in place, reusing the list and the shared `Card` objects
+
+        Args:
+            order (Iterable[int], optional): Card codes in deck order, the last one being
+                drawn first. If None, the deck is refilled and shuffled.
+            rng (PCG32, optional): Generator used to shuffle, global random state if None
+        """
+        self.clear()
+        if order is not None:
+            self.extend(map(CARDS.__getitem__, order))
+            return
+        self.extend(CARDS)
+        self.shuffle(rng)
 
-    def shuffle(self):
-        """Shuffle the deck"""
-        from random import shuffle
+    def shuffle(self, rng: "PCG32" = None):
+        """Shuffle the deck
 
-        shuffle(self)
+        Args:
+            rng (PCG32, optional): Generator used to shuffle, global random state if None
+        """
+        if rng is None:
+            shuffle(self)
+        else:
+            rng.shuffle(self)
 
     def draw(self):
         """Remove and return the top card"""
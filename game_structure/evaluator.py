@@ -0,0 +1,102 @@
+from typing import Iterable, List
+
+# Hand values are `category * CATEGORY_FACTOR + tiebreak`, the categories matching
+# HAND_VALUE_NAME_MAPPING (0=High Card ... 8=Straight Flush) and the tiebreak encoding up
+# to five ranks (2-14) in base 15, which always stays below CATEGORY_FACTOR.
+CATEGORY_FACTOR = 1000000
+STRAIGHT_FLUSH, FOUR_OF_A_KIND, FULL_HOUSE, FLUSH, STRAIGHT = 8, 7, 6, 5, 4
+THREE_OF_A_KIND, TWO_PAIR, ONE_PAIR, HIGH_CARD = 3, 2, 1, 0
+
+
+def _tiebreak(ranks: Iterable[int]) -> int:
+    """Encode ranks, most significant first, as a base 15 number"""
+    value = 0
+    for rank in ranks:
+        value = value * 15 + rank
+    return value
+
+
+def _straight_high(rank_mask: int) -> int:
+    """Return the high card of the best straight in a rank bitmask (bit r = rank r), or 0"""
+    if rank_mask & (1 << 14):
+        rank_mask |= 1 << 1  # the ace also plays low
+    run = rank_mask & (rank_mask >> 1) & (rank_mask >> 2) & (rank_mask >> 3)
+    run &= rank_mask >> 4
+    return run.bit_length() + 3 if run else 0
+
+
+def _top_ranks(rank_mask: int, count: int) -> List[int]:
+    """Return the `count` highest ranks of a rank bitmask"""
+    ranks = []
+    while rank_mask and len(ranks) < count:
+        rank = rank_mask.bit_length() - 1
+        ranks.append(rank)
+        rank_mask &= ~(1 << rank)
+    return ranks
+
+
+def evaluate_codes(codes: Iterable[int]) -> int:
+    """Evaluate the best five-card hand among card codes (see `Card.code`)
+
+    Args:
+        codes (Iterable[int]): Codes of 5 to 7 cards
+
+    Returns:
+        int: Hand value (higher is better)
+    """
+    counts = [0] * 15
+    suit_masks = [0, 0, 0, 0]
+    suit_counts = [0, 0, 0, 0]
+    for code in codes:
+        rank = code % 13 + 2
+        suit = code // 13
+        counts[rank] += 1
+        suit_masks[suit] |= 1 << rank
+        suit_counts[suit] += 1
+
+    for suit in range(4):
+        if suit_counts[suit] >= 5:
+            flush_mask = suit_masks[suit]
+            high = _straight_high(flush_mask)
+            if high:
+                return STRAIGHT_FLUSH * CATEGORY_FACTOR + high
+            break
+    else:
+        flush_mask = 0
+
+    quads, trips, pairs, singles = [], [], [], 0
+    rank_mask = 0
+    for rank in range(14, 1, -1):
+        count = counts[rank]
+        if count:
+            rank_mask |= 1 << rank
+            if count == 4:
+                quads.append(rank)
+            elif count == 3:
+                trips.append(rank)
+            elif count == 2:
+                pairs.append(rank)
+            else:
+                singles |= 1 << rank
+
+    if quads:
+        kicker = _top_ranks(rank_mask & ~(1 << quads[0]), 1)
+        return FOUR_OF_A_KIND * CATEGORY_FACTOR + _tiebreak([quads[0]] + kicker)
+    if trips and (len(trips) > 1 or pairs):
+        pair = max(trips[1:] + pairs)
+        return FULL_HOUSE * CATEGORY_FACTOR + _tiebreak([trips[0], pair])
+    if flush_mask:
+        return FLUSH * CATEGORY_FACTOR + _tiebreak(_top_ranks(flush_mask, 5))
+    high = _straight_high(rank_mask)
+    if high:
+        return STRAIGHT * CATEGORY_FACTOR + high
+    if trips:
+        kickers = _top_ranks(rank_mask & ~(1 << trips[0]), 2)
+        return THREE_OF_A_KIND * CATEGORY_FACTOR + _tiebreak([trips[0]] + kickers)
+    if len(pairs) >= 2:
+        kicker = _top_ranks(rank_mask & ~(1 << pairs[0]) & ~(1 << pairs[1]), 1)
+        return TWO_PAIR * CATEGORY_FACTOR + _tiebreak(pairs[:2] + kicker)
+    if pairs:
+        kickers = _top_ranks(singles, 3)
+        return ONE_PAIR * CATEGORY_FACTOR + _tiebreak([pairs[0]] + kickers)
+    return HIGH_CARD * CATEGORY_FACTOR + _tiebreak(_top_ranks(singles, 5))
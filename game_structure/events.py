@@ -0,0 +1,210 @@
+from collections import deque
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+from .action import ActionType
+
+if TYPE_CHECKING:
+    from .card import Card
+    from .game import Game
+    from .game_state import GameState
+
+
+class EventType(Enum):
+    """Enumeration of the events emitted by a `Game`"""
+
+    DEAL = "deal"  # hole cards dealt, a new hand starts
+    BLIND = "blind"  # a blind is posted
+    ACTION = "action"  # a player action succeeded
+    STREET = "street"  # a new stage starts and community cards are dealt
+    REVEAL = "reveal"  # a player reveals their hand at the end of the hand
+    AWARD = "award"  # the pot is awarded, the hand is over
+
+
+class Event:
+    """An event emitted by a `Game`, fields not relevant to the event type are None"""
+
+    __slots__ = (
+        "type",
+        "game",
+        "hand_number",
+        "stage",
+        "position",
+        "action",
+        "amount",
+        "cards",
+        "value",
+        "winners",
+        "pots",
+    )
+
+    def __init__(
+        self,
+        type: EventType,
+        game: "Game",
+        stage: int = 0,
+        position: Optional[int] = None,
+        action: Optional[ActionType] = None,
+        amount: Optional[int] = None,
+        cards: Optional[List["Card"]] = None,
+        value: Optional[int] = None,
+        winners: Optional[List[int]] = None,
+        pots: Optional[List[Tuple[int, List[int]]]] = None,
+    ):
+        """Initialize an event
+
+        Args:
+            type (EventType): Type of the event
+            game (Game): Game emitting the event
+            stage (int, optional): Stage of the hand (0=preflop ... 3=river)
+            position (int, optional): Position of the player concerned
+            action (ActionType, optional): Action performed (ACTION)
+            amount (int, optional): Chips posted (BLIND), chips called or street bet
+                reached by a raise (ACTION), or chips awarded over every pot (AWARD)
+            cards (List[Card], optional): Community cards dealt (STREET)
+            value (int, optional): Hand value (REVEAL)
+            winners (List[int], optional): Positions of the players winning chips (AWARD)
+            pots (List[Tuple[int, List[int]]], optional): Chips won by each winner and
+                positions of the winners of every pot, main pot first (AWARD)
+        """
+        self.type = type
+        self.game = game
+        self.hand_number = game.hand_number
+        self.stage = stage
+        self.position = position
+        self.action = action
+        self.amount = amount
+        self.cards = cards
+        self.value = value
+        self.winners = winners
+        self.pots = pots
+
+    def __repr__(self):
+        fields = ", ".join(
+            f"{name}={getattr(self, name)}"
+            for name in self.__slots__[2:]
+            if getattr(self, name) is not None
+        )
+        return f"Event({self.type.value}, {fields})"
+
+
+class EventBus:
+    """Dispatches game events to the subscribers of each event type
+
+    `subscribers[event_type]` is an empty list when nobody listens, so the emitter can
+    test it before building the event and pay nothing for unobserved events.
+    """
+
+    def __init__(self):
+        self.subscribers: Dict[EventType, List[Callable[[Event], None]]] = {
+            event_type: [] for event_type in EventType
+        }
+
+    def subscribe(
+        self,
+        subscriber: Callable[[Event], None],
+        event_types: Optional[Iterable[EventType]] = None,
+    ):
+        """Register a subscriber
+
+        Args:
+            subscriber (Callable[[Event], None]): Callback receiving the events
+            event_types (Iterable[EventType], optional): Types to receive. Defaults to the
+                subscriber's `event_types` attribute, or every type.
+        """
+        if event_types is None:
+            event_types = getattr(subscriber, "event_types", None) or list(EventType)
+        for event_type in event_types:
+            self.subscribers[event_type].append(subscriber)
+
+    def unsubscribe(self, subscriber: Callable[[Event], None]):
+        """Remove a subscriber from every event type"""
+        for subscribers in self.subscribers.values():
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+
+    def emit(self, event: Event):
+        """Send an event to its subscribers"""
+        for subscriber in self.subscribers[event.type]:
+            subscriber(event)
+
+
+class HistoryWriter:
+    """Writes the text history of the hands into a `GameState`"""
+
+    event_types = [EventType.ACTION, EventType.REVEAL, EventType.AWARD]
+
+    def __init__(self, game_state: "GameState"):
+        """Initialize the writer
+
+        Args:
+            game_state (GameState): Game state whose `historic` is written
+        """
+        self.game_state = game_state
+
+    def __call__(self, event: Event):
+        player = (
+            event.game.players[event.position] if event.position is not None else None
+        )
+        if event.type == EventType.ACTION:
+            if event.action == ActionType.FOLD:
+                line = f"{player.name} folds"
+            elif event.action == ActionType.CHECK:
+                line = f"{player.name} checks"
+            elif event.action == ActionType.CALL:
+                line = f"{player.name} calls {event.amount}"
+            else:
+                line = f"{player.name} raises to {event.amount}"
+        elif event.type == EventType.REVEAL:
+            hand_name = self.game_state._get_hand_name(event.value)
+            line = f"{player.name} reveals {player.hand} ({hand_name})"
+        else:
+            # one line per pot, main pot first
+            line = "\n".join(
+                ", ".join(event.game.players[p].name for p in winners)
+                + f" win {share} chips"
+                for share, winners in event.pots
+            )
+        self.game_state.add_to_history(line)
+
+
+class ConsoleRenderer:
+    """Prints each action, and the full game state when a hand or a street starts and
+    when the pot is awarded"""
+
+    event_types = [EventType.DEAL, EventType.ACTION, EventType.STREET, EventType.AWARD]
+
+    def __call__(self, event: Event):
+        if event.type == EventType.ACTION:
+            name = event.game.players[event.position].name
+            if event.action in (ActionType.CALL, ActionType.RAISE):
+                print(f"{name}: {event.action.value} {event.amount}")
+            else:
+                print(f"{name}: {event.action.value}")
+        else:
+            print(event.game)
+
+
+class ReplayBuffer:
+    """Keeps the last events in a bounded buffer"""
+
+    def __init__(self, capacity: int = 100000):
+        """Initialize the buffer
+
+        Args:
+            capacity (int, optional): Maximum number of events kept
+        """
+        self.events: "deque[Event]" = deque(maxlen=capacity)
+
+    def __call__(self, event: Event):
+        self.events.append(event)
+
+    def hand(self, hand_number: int) -> List[Event]:
+        """Return the buffered events of a hand"""
+        return [event for event in self.events if event.hand_number == hand_number]
+
+    def clear(self):
+        """Empty the buffer"""
+        self.events.clear()
+
+    def __len__(self):
+        return len(self.events)
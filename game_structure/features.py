@@ -0,0 +1,247 @@
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+from weakref import WeakKeyDictionary
+from .action import ActionType
+
+if TYPE_CHECKING:
+    from .game import Game
+    from .player import Player
+
+# Dependencies of a feature, from the least to the most frequently changing
+HAND = "hand"  # recomputed when a new hand is dealt
+STREET = "street"  # recomputed when the stage changes (and the board is dealt)
+ACTION = "action"  # recomputed after every action
+DEPENDENCIES = (HAND, STREET, ACTION)
+
+POSITION_NAMES = ["BTN", "SB", "BB", "CO", "HJ", "LJ", "UTG", "UTG+"]
+ACTION_TYPES = list(ActionType)
+HISTORY_LENGTH = 8
+
+
+class Feature:
+    """A named block of the feature vector with the state it depends on"""
+
+    def __init__(
+        self,
+        name: str,
+        size: int,
+        depends_on: str,
+        compute: Callable[["Game", "Player"], Sequence[float]],
+    ):
+        """Initialize a feature
+
+        Args:
+            name (str): Name of the feature
+            size (int): Number of values written in the feature vector
+            depends_on (str): HAND, STREET or ACTION, the state the feature is derived from
+            compute (Callable): Function of (game, player) returning `size` values
+        """
+        if depends_on not in DEPENDENCIES:
+            raise ValueError(f"Invalid dependency: {depends_on}")
+        self.name = name
+        self.size = size
+        self.depends_on = depends_on
+        self.compute = compute
+
+
+def chen_score(player: "Player") -> float:
+    """Chen formula score of the hole cards, normalized to [0, 1]"""
+    high, low = sorted(player.hand.hole_cards, key=lambda card: card.rank, reverse=True)
+    base = {14: 10, 13: 8, 12: 7, 11: 6}
+    score = base.get(high.rank, high.rank / 2)
+    if high.rank == low.rank:
+        score = max(score * 2, 5)
+    else:
+        gap = high.rank - low.rank - 1
+        score -= [0, 1, 2, 4][gap] if gap < 4 else 5
+        if gap <= 1 and high.rank < 12:
+            score += 1
+    if high.suit == low.suit:
+        score += 2
+    return (score + 1.5) / 21.5
+
+
+def hole_strength(game: "Game", player: "Player") -> Sequence[float]:
+    return [chen_score(player)]
+
+
+def position_label(game: "Game", position: int) -> str:
+    """Label of a position in `POSITION_NAMES`, as in `GameState.get_position_name`
+    with the UTG+k positions merged into "UTG+"
+    """
+    if position == game.dealer_position:
+        return "BTN"
+    if position == game.small_blind_position:
+        return "SB"
+    if position == game.big_blind_position:
+        return "BB"
+    from_button = (game.dealer_position - position) % len(game.players)
+    if from_button <= 3:
+        return ("CO", "HJ", "LJ")[from_button - 1]
+    if position == (game.big_blind_position + 1) % len(game.players):
+        return "UTG"
+    return "UTG+"
+
+
+def position(game: "Game", player: "Player") -> Sequence[float]:
+    name = position_label(game, player.position)
+    return [float(name == position_name) for position_name in POSITION_NAMES]
+
+
+def stage(game: "Game", player: "Player") -> Sequence[float]:
+    return [float(game.current_round.stage == i) for i in range(4)]
+
+
+def made_hand(game: "Game", player: "Player") -> Sequence[float]:
+    return [player.hand.evaluate() / 9000000]
+
+
+def board_texture(game: "Game", player: "Player") -> Sequence[float]:
+    board = player.hand.community_cards
+    suits = [card.suit for card in board]
+    ranks = [card.rank for card in board]
+    flush_draw = any(suits.count(suit) >= 3 for suit in set(suits))
+    paired = len(set(ranks)) < len(ranks)
+    return [float(flush_draw), float(paired)]
+
+
+def pot_odds(game: "Game", player: "Player") -> Sequence[float]:
+    to_call = max(game.current_round.current_bet - player.current_bet, 0)
+    to_call = min(to_call, player.chips)
+    pot = game.current_round.pot
+    return [to_call / (pot + to_call) if pot + to_call else 0.0]
+
+
+def stacks(game: "Game", player: "Player") -> Sequence[float]:
+    big_blind = game.parameter["big_blind"]
+    pot = game.current_round.pot
+    opponents = [p for p in game.players if p is not player and not p.folded]
+    mean_opponent_stack = (
+        sum(p.chips for p in opponents) / len(opponents) if opponents else 0.0
+    )
+    return [
+        player.chips / (100 * big_blind),
+        mean_opponent_stack / (100 * big_blind),
+        player.chips / pot if pot else 0.0,  # stack-to-pot ratio
+        len(opponents) / max(len(game.players) - 1, 1),
+    ]
+
+
+def action_history(game: "Game", player: "Player") -> Sequence[float]:
+    """One-hot action types of the last HISTORY_LENGTH actions of the hand"""
+    encoding = [0.0] * (HISTORY_LENGTH * len(ACTION_TYPES))
+    recent = game.action_history[-HISTORY_LENGTH:]
+    for i, (_, _, action) in enumerate(reversed(recent)):
+        encoding[i * len(ACTION_TYPES) + ACTION_TYPES.index(action.type)] = 1.0
+    return encoding
+
+
+DEFAULT_FEATURES = [
+    Feature("hole_strength", 1, HAND, hole_strength),
+    Feature("position", len(POSITION_NAMES), HAND, position),
+    Feature("stage", 4, STREET, stage),
+    Feature("made_hand", 1, STREET, made_hand),
+    Feature("board_texture", 2, STREET, board_texture),
+    Feature("pot_odds", 1, ACTION, pot_odds),
+    Feature("stacks", 4, ACTION, stacks),
+    Feature(
+        "action_history", HISTORY_LENGTH * len(ACTION_TYPES), ACTION, action_history
+    ),
+]
+
+
+class _CacheEntry:
+    """Last feature vector extracted for one seat and the state keys it was built from"""
+
+    __slots__ = ("vector", "keys")
+
+    def __init__(self, size: int):
+        self.vector = array("d", bytes(8 * size))
+        self.keys: Dict[str, Tuple] = dict.fromkeys(DEPENDENCIES)
+
+
+class FeaturePipeline:
+    """Builds the network input vector of a player and recomputes features lazily
+
+    Each feature is recomputed only when the state it depends on changed since the last
+    extraction for the same seat: HAND features once per hand, STREET features once per
+    street and ACTION features after each action.
+    """
+
+    def __init__(self, features: Optional[List[Feature]] = None):
+        """Initialize the pipeline
+
+        Args:
+            features (List[Feature], optional): Features in vector order, defaults to
+                DEFAULT_FEATURES
+        """
+        self.features = features if features is not None else DEFAULT_FEATURES
+        self.layout: Dict[str, slice] = {}
+        offset = 0
+        for feature in self.features:
+            self.layout[feature.name] = slice(offset, offset + feature.size)
+            offset += feature.size
+        self.size = offset
+        self._cache: "WeakKeyDictionary[Game, Dict[int, _CacheEntry]]" = (
+            WeakKeyDictionary()
+        )
+
+    @staticmethod
+    def _state_keys(game: "Game") -> Dict[str, Tuple]:
+        """Return the key identifying the current state for each dependency"""
+        hand_key = (game.hand_number,)
+        street_key = hand_key + (game.current_round.stage,)
+        return {
+            HAND: hand_key,
+            STREET: street_key,
+            ACTION: street_key + (len(game.action_history),),
+        }
+
+    def extract(
+        self, game: "Game", player: "Player", out: array = None, offset: int = 0
+    ) -> array:
+        """Extract the feature vector of a player
+
+        Args:
+            game (Game): Game the player sits at
+            player (Player): Player whose point of view is encoded
+            out (array, optional): Array to write the vector into, a new one if None
+            offset (int, optional): Index of the first value in `out`
+
+        Returns:
+            array: The array the vector was written into
+        """
+        seats = self._cache.setdefault(game, {})
+        entry = seats.get(player.position)
+        if entry is None:
+            entry = seats[player.position] = _CacheEntry(self.size)
+
+        keys = self._state_keys(game)
+        stale = {name for name in DEPENDENCIES if entry.keys[name] != keys[name]}
+        if stale:
+            vector = entry.vector
+            for feature in self.features:
+                if feature.depends_on in stale:
+                    vector[self.layout[feature.name]] = array(
+                        "d", feature.compute(game, player)
+                    )
+            entry.keys = keys
+
+        if out is None:
+            return array("d", entry.vector)
+        out[offset : offset + self.size] = entry.vector
+        return out
+
+    def extract_batch(self, seats: List[Tuple["Game", "Player"]]) -> array:
+        """Extract the feature vectors of several (game, player) pairs
+
+        Args:
+            seats (List[Tuple[Game, Player]]): Pairs to encode
+
+        Returns:
+            array: Row-major matrix of shape (len(seats), size)
+        """
+        out = array("d", bytes(8 * self.size * len(seats)))
+        for i, (game, player) in enumerate(seats):
+            self.extract(game, player, out, i * self.size)
+        return out
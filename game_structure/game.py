@@ -1,39 +1,72 @@
-from typing import List, Optional
+import os
+from typing import List, Optional, Tuple
 from .deck import Deck
 from .player import Player
 from .betting_round import BettingRound
 from .action import Action, ActionType
 from .game_state import GameState
+from .table_state import TableState
+from .pot import award_pots, build_pots, uncalled_chips
+from .rng import MASK_64, ORDERED_DECK, DealGenerator
+from .events import ConsoleRenderer, Event, EventBus, EventType, HistoryWriter
 import time
 
 
 class Game:
     """Main game controller coordinating all components"""
 
-    def __init__(self, name: str = None, pov: int = -1):
+    def __init__(
+        self,
+        name: str = None,
+        pov: int = -1,
+        seed: Optional[int] = None,
+        deals: Optional[DealGenerator] = None,
+    ):
         """Initialize a poker game
 
         Args:
             name (str, optional): Name of the game
             pov (int, optional): Point of view player position (-1 for omniscient)
+            seed (int, optional): Seed of the game's deals. Games sharing a seed
+                are dealt the same cards. Reduced modulo 2**64, so that negative or large
+                seeds fit in a checkpoint. Drawn from the OS if None, or taken from
+                `deals` if given.
+            deals (DealGenerator, optional): Generator of the deals, which games dealt
+                in lockstep (e.g. duplicate rotations) can share to generate every deal
+                once. Built from the seed if None.
         """
+        if deals is not None:
+            if seed is None:
+                seed = deals.seed
+            elif seed & MASK_64 != deals.seed:
+                raise ValueError("The deal generator was built from another seed")
         self.name = name
         self.pov = pov
-        self.deck = Deck()
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "little")
+        self.seed = seed & MASK_64
+        self.deals = deals if deals is not None else DealGenerator(self.seed)
+        self.deals_served = 0
+        self.deck = Deck(ORDERED_DECK)  # refilled from `deals` at every hand
         self.players: List[Player] = []
+        self.table = TableState()
         self.dealer_position = 0
         self.small_blind_position = 1  # TODO create a class that handle player position
         self.big_blind_position = 2
         self.current_round: Optional[BettingRound] = None
         self.hand_number = 0
+        # (stage, position, action) of every action of the hand
+        self.action_history: List[Tuple[int, int, Action]] = []
         self.game_over = False
         self.game_state = GameState()
         self.parameter = {"small_blind": 1, "big_blind": 2}
+        self.events = EventBus()
 
     def add_player(self, player: Player):
         """Add a player to the game"""
         player.position = len(self.players)
         self.players.append(player)
+        self.table.add_seat(player)
 
     def set_pov(self, player_name: str):
         """Set the point of view player"""
@@ -43,38 +76,61 @@ class Game:
         """Remove a player from the game"""
         if player in self.players:
             removed_pos = player.position
+            self.table.remove_seat(player._seat)
             self.players.remove(player)
             for p in self.players:
                 if p.position > removed_pos:
                     p.position -= 1
 
+            # Keep the button on the same player and the blinds right after it. A
+            # removed dealer leaves it to the player before, so that it moves on to the
+            # player after at the next hand
+            num_players = len(self.players)
+            if num_players:
+                if removed_pos <= self.dealer_position:
+                    self.dealer_position -= 1
+                self.dealer_position %= num_players
+                self.small_blind_position = (self.dealer_position + 1) % num_players
+                self.big_blind_position = (self.dealer_position + 2) % num_players
+
     def start_new_hand(self):
         """Initialize a new hand"""
         self.hand_number += 1
-        self.deck = Deck()
-        self.deck.shuffle()
+        self.game_over = False
+        self.action_history.clear()
+        self.deck.reset(self.deals.deal(self.deals_served))
+        self.deals_served += 1
         self._rotate_positions()
 
-        # Reset player states
+        # Reset player states, reusing the hands of the previous hand
+        self.table.reset_hand()
         for player in self.players:
-            player.reset_hand()
+            player.hand.clear()
 
         # Initialize betting round before posting blinds
-        self.current_round = BettingRound(stage=0)
-        self.current_round.current_player_index = self._get_first_to_act()
+        if self.current_round is None:
+            self.current_round = BettingRound(stage=0)
+        else:
+            self.current_round.reset(stage=0)
 
         # Post blinds
         self._post_blinds()
+        self.current_round.current_player_index = self._get_first_to_act()
 
         # Update betting round with blinds
-        self.current_round.pot = (
-            self.parameter["small_blind"] + self.parameter["big_blind"]
-        )
+        self.current_round.pot = sum(self.table.current_bet)  # short stacks post less
         self.current_round.current_bet = self.parameter["big_blind"]
 
         # Deal cards
         self._deal_cards()
 
+        if self.events.subscribers[EventType.DEAL]:
+            self.events.emit(Event(EventType.DEAL, self))
+
+        # The blinds may have put every player but one all-in
+        if self.current_round.is_complete(self.players):
+            self._advance_game_state()
+
     def _rotate_positions(self):
         """Rotate dealer and blind positions after each hand"""
         num_players = len(self.players)
@@ -84,36 +140,60 @@ class Game:
 
     def _post_blinds(self):
         """Post small and big blinds"""
-        sb_player = self.players[self.small_blind_position]
-        bb_player = self.players[self.big_blind_position]
-
-        # Post small blind
-        sb_amount = self.parameter["small_blind"]
-        sb_player.place_bet(sb_amount, blind_bet=True)
-
-        # Post big blind
         bb_amount = self.parameter["big_blind"]
-        bb_player.place_bet(bb_amount, blind_bet=True)
+        positions = [self.small_blind_position, self.big_blind_position]
+        amounts = [self.parameter["small_blind"], bb_amount]
+        self.table.post_blinds(positions, amounts)
 
         self.current_round.set_current_bet(bb_amount)
 
+        if self.events.subscribers[EventType.BLIND]:
+            for position, amount in zip(positions, amounts):
+                self.events.emit(
+                    Event(EventType.BLIND, self, position=position, amount=amount)
+                )
+
     def _deal_cards(self):
         """Deal cards to players"""
         # Deal hole cards
-        for _ in range(2):
+        for index in range(2):
             for player in self.players:
                 card = self.deck.draw()
                 player.hand.add_hole_card(card)
+                self.table.set_hole_card(player._seat, index, card.code)
 
     def _get_first_to_act(self) -> int:
-        """Determine first player to act"""
+        """Determine first player to act, skipping the players who folded or are all-in"""
         if self.current_round.stage == 0:  # Pre-flop
-            return (self.big_blind_position + 1) % len(self.players)
-        return self.small_blind_position
+            first = (self.big_blind_position + 1) % len(self.players)
+        else:
+            first = self.small_blind_position
+        return self._next_able_position(first - 1)
+
+    def _next_able_position(self, position: int) -> int:
+        """Return the first position after `position` whose player can still act
+
+        Args:
+            position (int): Position to start after
+
+        Returns:
+            int: Position of a player who has not folded and is not all-in, or the
+                position right after `position` if nobody can act
+        """
+        num_players = len(self.players)
+        for step in range(1, num_players + 1):
+            player = self.players[(position + step) % num_players]
+            if not player.folded and not player.is_all_in:
+                return player.position
+        return (position + 1) % num_players
 
     def handle_action(self, player: Player, action: Action) -> bool:
         """Handle a player's action
 
+        A raise gives the street bet the player raises to, not the increment: facing a bet
+        of 10 with 4 already in, "raise 30" puts 26 more chips in. The ACTION event then
+        carries the street bet reached, and the call amount for the other actions.
+
         Args:
             player (Player): Player making the action
             action (Action): Action to perform
@@ -124,6 +204,8 @@ class Game:
         if not self._validate_action(player, action):
             return False
 
+        stage = self.current_round.stage
+        chips_before = player.chips
         success = False
         if action.type == ActionType.FOLD:
             success = self._handle_fold(player)
@@ -137,6 +219,22 @@ class Game:
             raise print(f"Invalid action type: {action.type}")
 
         if success:
+            self.action_history.append((stage, player.position, action))
+            if self.events.subscribers[EventType.ACTION]:
+                if action.type == ActionType.RAISE:
+                    amount = player.current_bet
+                else:
+                    amount = chips_before - player.chips
+                self.events.emit(
+                    Event(
+                        EventType.ACTION,
+                        self,
+                        stage=stage,
+                        position=player.position,
+                        action=action.type,
+                        amount=amount,
+                    )
+                )
             self._advance_game_state()
 
         return success
@@ -172,7 +270,6 @@ class Game:
     def _handle_fold(self, player: Player) -> bool:
         """Handle fold action, return False if the player cannot fold and True if success"""
         player.fold()
-        self.game_state.add_to_history(f"{player.name} folds")
         return True
 
     def _handle_check(self, player: Player) -> bool:
@@ -181,7 +278,6 @@ class Game:
             print("Cannot check when there is a bet to call")
             return False
         player.speak()
-        self.game_state.add_to_history(f"{player.name} checks")
         return True
 
     def _handle_call(self, player: Player) -> bool:
@@ -198,7 +294,6 @@ class Game:
             return False
 
         self.current_round.update_pot(amount_to_call)
-        self.game_state.add_to_history(f"{player.name} calls {amount_to_call}")
         return True
 
     def _handle_raise(self, player: Player, amount: int) -> bool:
@@ -206,45 +301,52 @@ class Game:
 
         Args:
             player (Player): Player making the raise
-            amount (int): Amount to raise. If = -1, the player raise to all-in
+            amount (int): Street bet to raise to. If = -1, the player raise to all-in
 
         Returns:
             bool: True if raise was successful
         """
         if amount == -1:
-            amount = player.chips
+            amount = player.chips + player.current_bet
 
-        if not player.place_bet(amount):
+        paid = amount - player.current_bet
+        if not player.place_bet(paid):
             return False
 
-        self.current_round.update_pot(
-            player.current_bet - self.current_round.current_bet
+        self.current_round.update_pot(paid)
+        # an all-in for less than the current bet does not lower it
+        self.current_round.set_current_bet(
+            max(player.current_bet, self.current_round.current_bet)
         )
-        self.current_round.set_current_bet(player.current_bet)
-        self.game_state.add_to_history(f"{player.name} raises to {player.current_bet}")
         return True
 
-    def _handle_reveal(self, player: Player) -> bool:
+    def _handle_reveal(
+        self, player: Player, hand_value: int, best_revealed: int
+    ) -> bool:
         """When the hand is over, reveal the player's hand if no other player has revealed a
         stronger hand.
 
         Args:
             player (Player): Player revealing their hand
+            hand_value (int): Value of the player's hand
+            best_revealed (int): Best hand value revealed so far (-1 if none)
 
         Returns:
             bool: True if reveal was successful
         """
-        hand_value = player.hand.evaluate()
-        revealed_players = [p for p in self.players if p.revealed]
-        if any(
-            hand_value < other_hand_value
-            for other_hand_value in [p.hand.evaluate() for p in revealed_players]
-        ):
+        if hand_value < best_revealed:
             return False
         player.reveal()
-        self.game_state.add_to_history(
-            f"{player.name} reveals {player.hand} ({self.game_state._get_hand_name(hand_value)})"
-        )
+        if self.events.subscribers[EventType.REVEAL]:
+            self.events.emit(
+                Event(
+                    EventType.REVEAL,
+                    self,
+                    stage=self.current_round.stage,
+                    position=player.position,
+                    value=hand_value,
+                )
+            )
         return True
 
     def _advance_game_state(self):
@@ -255,76 +357,115 @@ class Game:
         active_players = [p for p in self.players if not p.folded]
 
         if len(active_players) == 1:
-            self._end_hand(active_players)
+            self._end_hand()
 
         elif self.current_round.is_complete(self.players):
-            if self.current_round.stage < 3:
+            # Streets where nobody can bet anymore (all-in) are dealt right away
+            while self.current_round.stage < 3:
                 self._advance_stage()
-            else:
-                self._end_hand(self._determine_winners(active_players))
+                if not self.current_round.is_complete(self.players):
+                    return
+            self._end_hand()
         else:
             self._get_next_player()
 
     def _get_next_player(self):
         """Get the next player to act"""
-        self.current_round.current_player_index = (
-            self.current_round.current_player_index + 1
-        ) % len(self.players)
+        self.current_round.current_player_index = self._next_able_position(
+            self.current_round.current_player_index
+        )
 
     def _advance_stage(self):
         """Advance to the next stage of the game"""
         self.current_round.next_stage()
-        for player in self.players:
-            player.new_stage()
+        self.table.new_stage()
 
         # Deal community cards
+        cards = []
         if self.current_round.stage == 1:  # Flop
             for _ in range(3):
                 card = self.deck.draw()
+                cards.append(card)
                 for player in self.players:
                     player.hand.add_community_card(card)
 
         elif self.current_round.stage in [2, 3]:  # Turn or River
             card = self.deck.draw()
+            cards.append(card)
             for player in self.players:
                 player.hand.add_community_card(card)
 
         self.current_round.current_player_index = self._get_first_to_act()
 
-    def _determine_winners(self, active_players: List[Player]) -> List[Player]:
-        """Determine the winner(s) of the hand"""
-        if len(active_players) == 1:
-            return active_players
-
-        best_hand = -1
-        winners = []
-
-        for player in active_players:
-            hand_value = player.hand.evaluate()
-            if hand_value > best_hand:
-                best_hand = hand_value
-                winners = [player]
-            elif hand_value == best_hand:
-                winners.append(player)
+        if self.events.subscribers[EventType.STREET]:
+            self.events.emit(
+                Event(
+                    EventType.STREET, self, stage=self.current_round.stage, cards=cards
+                )
+            )
 
-        return winners
+    def _rank_hands(self, active_players: List[Player]) -> List[Tuple[int, int]]:
+        """Evaluate every live hand once and rank them
 
-    def _end_hand(self, winners: List[Player]) -> str:
-        """End the current hand and distribute pot"""
+        Returns:
+            List[Tuple[int, int]]: (hand value, position) of the players, best first
+        """
+        if len(active_players) == 1:
+            return [(0, active_players[0].position)]
+        ranking = [
+            (player.hand.evaluate(), player.position) for player in active_players
+        ]
+        ranking.sort(key=lambda item: item[0], reverse=True)
+        return ranking
+
+    def _end_hand(self) -> str:
+        """End the current hand and distribute the main pot and the side pots"""
         active_players = [p for p in self.players if not p.folded]
-        for player in active_players:
-            self._handle_reveal(player)
+        ranking = self._rank_hands(active_players)
 
-        pot = self.current_round.pot
-        for winner in winners:
-            winner.chips += pot // len(winners)
+        values = {position: value for value, position in ranking}
+        best_revealed = -1
+        for player in active_players:
+            if self._handle_reveal(player, values[player.position], best_revealed):
+                best_revealed = max(best_revealed, values[player.position])
+
+        # the bet nobody matched goes back to its owner, it is not won
+        contributions = self.table.contributed
+        seat, uncalled = uncalled_chips(contributions)
+        if uncalled:
+            contributions[seat] -= uncalled
+            self.players[seat].chips += uncalled
+            self.current_round.pot -= uncalled
+
+        live = [not folded for folded in self.table.folded]
+        awards, pots = award_pots(
+            build_pots(contributions, live),
+            contributions,
+            ranking,
+            (self.dealer_position + 1) % len(self.players),
+        )
+        for player in self.players:
+            player.chips += awards[player.position]
 
-        # TODO handle the case when a player is in all-in
-        message = f"{', '.join([winner.name for winner in winners])} win {pot//len(winners)} chips"
+        message = ", ".join(
+            f"{', '.join(self.players[p].name for p in winners)} win {share} chips"
+            for share, winners in pots
+        )
 
-        self.game_state.add_to_history(message)
         self.game_over = True
 
+        if self.events.subscribers[EventType.AWARD]:
+            self.events.emit(
+                Event(
+                    EventType.AWARD,
+                    self,
+                    stage=self.current_round.stage,
+                    amount=sum(awards),
+                    winners=[p for p, award in enumerate(awards) if award > 0],
+                    pots=pots,
+                )
+            )
+
         return message
 
     def _update_game_state(self):
@@ -333,6 +474,7 @@ class Game:
 
         self.game_state.update(
             players=self.players,
+            table=self.table,
             community_cards=community_cards,
             current_round=self.current_round,
             dealer_position=self.dealer_position,
@@ -348,6 +490,23 @@ class Game:
         self._update_game_state()
         return str(self.game_state)
 
+    def play_hand(self) -> List[int]:
+        """Play a full hand where every player acts through its `get_action` method
+
+        Returns:
+            List[int]: Chips won (or lost if negative) by each player, in position order
+        """
+        chips_before = [player.chips for player in self.players]
+        self.start_new_hand()
+        while not self.game_over:
+            player = self.players[self.current_round.current_player_index]
+            action = player.get_action(self.current_round)
+            if not self.handle_action(player, action):
+                raise ValueError(f"Invalid action: {action}")
+        return [
+            player.chips - chips for player, chips in zip(self.players, chips_before)
+        ]
+
     def start_interactive_hand(self, debug_mode=False):
         """Start an interactive game session
 
@@ -355,9 +514,13 @@ class Game:
             debug_mode (bool): If True, allows controlling all players. If False, only controls POV
                 player.
         """
+        history_writer = HistoryWriter(self.game_state)
+        renderer = ConsoleRenderer()
+        self.events.subscribe(history_writer)
+        self.events.subscribe(renderer)
+
         print("\nStarting new poker hand...")
         self.start_new_hand()
-        print(self)
 
         while not self.game_over:
             current_player = next(
@@ -384,7 +547,6 @@ class Game:
                     )
                     success = self.handle_action(current_player, action)
                     if success:
-                        print(action)
                         break
                     else:
                         print("Action not allowed, try again")
@@ -394,18 +556,17 @@ class Game:
                 time.sleep(1)
                 action = current_player.get_action(self.current_round)
                 success = self.handle_action(current_player, action)
-                if success:
-                    print(action)
-                else:
+                if not success:
                     raise ValueError(f"Invalid action: {action}")
                 time.sleep(1)
 
-            print(self)  # Show updated game state
-
             # Check if hand is over
             if self.game_over:
                 break
 
+        self.events.unsubscribe(renderer)
+        self.events.unsubscribe(history_writer)
+
         print("\nHand complete!")
         with open("historic.txt", "w") as f:
             f.write(self.game_state.historic)
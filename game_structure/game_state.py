@@ -1,5 +1,6 @@
 from typing import List, TYPE_CHECKING
 from .betting_round import BettingRound
+from .table_state import TableState
 
 
 if TYPE_CHECKING:
@@ -24,6 +25,7 @@ class GameState:
 
     def __init__(self):
         self.players: List["Player"] = []
+        self.table = TableState()
         self.community_cards: List["Card"] = []
         self.hand_number = 0
         self.game_over = False
@@ -37,6 +39,7 @@ class GameState:
     def update(
         self,
         players: List["Player"],
+        table: "TableState",
         community_cards: List["Card"],
         hand_number: int,
         game_over: bool,
@@ -51,6 +54,7 @@ class GameState:
         Args:
             stage (int): Current game stage
             players (List[Player]): List of players
+            table (TableState): Per-seat state of the players
             community_cards (List[Card]): List of community cards
             hand_number (int): Current hand number
             game_over (bool): Whether the game is over
@@ -61,6 +65,7 @@ class GameState:
             pov (int): Position of the player of view
         """
         self.players = players
+        self.table = table
         self.community_cards = community_cards
         self.hand_number = hand_number
         self.game_over = game_over
@@ -132,8 +137,10 @@ class GameState:
 
         # Player information
         output.append("\nPlayers:")
+        table = self.table
         for i, player in enumerate(self.players):
-            status = "FOLDED" if player.folded else "ACTIVE"
+            seat = player._seat
+            status = "FOLDED" if table.folded[seat] else "ACTIVE"
             position = self.get_position_name(player.position)
             current_indicator = (
                 "-> "
@@ -142,7 +149,7 @@ class GameState:
             )
 
             # Handle card display based on stage and POV
-            if player.revealed:
+            if table.revealed[seat]:
                 player_cards = str(player.hand.hole_cards)
                 hand_name = self._get_hand_name(player.hand.evaluate())
             elif i == self.pov or self.pov == -1:
@@ -157,9 +164,9 @@ class GameState:
                 f"{player.name:<15} "
                 f"[{position+']':<4} "
                 f"Cards: {player_cards:<10} "
-                f"Chips: {player.chips:<6} "
+                f"Chips: {table.chips[seat]:<6} "
                 f"Status: {status:<8} "
-                f"Spoke: {player.spoke}"
+                f"Spoke: {bool(table.spoke[seat])}"
                 f"{f' ({hand_name})' if hand_name else ''}"
             )
             output.append(player_str)
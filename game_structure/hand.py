@@ -1,5 +1,6 @@
 from typing import List
 from .card import Card
+from .evaluator import evaluate_codes
 
 
 class Hand:
@@ -23,6 +24,11 @@ class Hand:
         else:
             raise ValueError("Cannot add more than 5 community cards")
 
+    def clear(self):
+        """Remove every card, keeping the lists for the next hand"""
+        self.hole_cards.clear()
+        self.community_cards.clear()
+
     def get_all_cards(self) -> List[Card]:
         """Get all cards in the hand (hole cards + community cards)"""
         return self.hole_cards + self.community_cards
@@ -40,55 +46,7 @@ class Hand:
         if len(all_cards) < 5:
             return 0
 
-        # Sort cards by rank
-        sorted_cards = sorted(all_cards, reverse=True)
-
-        # Check for flush
-        suits = [card.suit for card in sorted_cards]
-        is_flush = len(set(suits)) == 1
-
-        # Check for straight
-        ranks = [card.rank for card in sorted_cards]
-        is_straight = False
-        for i in range(len(ranks) - 4):
-            if ranks[i] - ranks[i + 4] == 4:
-                is_straight = True
-                break
-
-        # Count rank frequencies
-        rank_counts = {}
-        for rank in ranks:
-            rank_counts[rank] = rank_counts.get(rank, 0) + 1
-
-        # Determine hand value
-        if is_straight and is_flush:
-            return 8000000 + max(ranks)  # Straight flush
-        elif 4 in rank_counts.values():
-            return 7000000 + max(
-                r for r, c in rank_counts.items() if c == 4
-            )  # Four of a kind
-        elif 3 in rank_counts.values() and 2 in rank_counts.values():
-            return 6000000 + max(
-                r for r, c in rank_counts.items() if c == 3
-            )  # Full house
-        elif is_flush:
-            return 5000000 + max(ranks)  # Flush
-        elif is_straight:
-            return 4000000 + max(ranks)  # Straight
-        elif 3 in rank_counts.values():
-            return 3000000 + max(
-                r for r, c in rank_counts.items() if c == 3
-            )  # Three of a kind
-        elif list(rank_counts.values()).count(2) == 2:
-            return 2000000 + max(
-                r for r, c in rank_counts.items() if c == 2
-            )  # Two pair
-        elif 2 in rank_counts.values():
-            return 1000000 + max(
-                r for r, c in rank_counts.items() if c == 2
-            )  # One pair
-        else:
-            return max(ranks)  # High card
+        return evaluate_codes([card.code for card in all_cards])
 
     def __str__(self):
         """Return string representation of the hand"""
@@ -0,0 +1,334 @@
+from array import array
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from .card import RANKS
+from .evaluator import evaluate_codes
+from .rng import PCG32
+
+# Every two-card holding (hole card codes, lowest first) and its index in a Range
+COMBOS: List[Tuple[int, int]] = list(combinations(range(52), 2))
+NUM_COMBOS = len(COMBOS)  # 1326
+COMBO_INDEX: Dict[Tuple[int, int], int] = {combo: i for i, combo in enumerate(COMBOS)}
+# Indices of the combos containing each card
+CARD_COMBOS: List[List[int]] = [
+    [i for i, combo in enumerate(COMBOS) if card in combo] for card in range(52)
+]
+
+RANK_FROM_CHAR = {char: rank for rank, char in RANKS.items()}
+SUIT_FROM_CHAR = {"h": 0, "d": 1, "c": 2, "s": 3}
+
+
+def combo_index(card_a: int, card_b: int) -> int:
+    """Return the index of the holding made of two card codes"""
+    return COMBO_INDEX[(card_a, card_b) if card_a < card_b else (card_b, card_a)]
+
+
+def _code(rank: int, suit: int) -> int:
+    return suit * 13 + rank - 2
+
+
+def _class_combos(high: int, low: int, kind: str) -> List[int]:
+    """Combos of a hand class, e.g. (14, 13, "s") for AKs. kind is "s", "o" or ""."""
+    indices = []
+    for suit_a in range(4):
+        for suit_b in range(4):
+            if high == low and suit_b <= suit_a:
+                continue
+            if kind == "s" and suit_a != suit_b:
+                continue
+            if kind == "o" and suit_a == suit_b:
+                continue
+            indices.append(combo_index(_code(high, suit_a), _code(low, suit_b)))
+    return indices
+
+
+def _parse_class(text: str) -> Tuple[int, int, str]:
+    """Parse "AKs", "AKo", "AK" or "TT" into (high rank, low rank, kind)"""
+    if len(text) not in (2, 3) or text[0] not in RANK_FROM_CHAR:
+        raise ValueError(f"Invalid hand class: {text}")
+    if text[1] not in RANK_FROM_CHAR:
+        raise ValueError(f"Invalid hand class: {text}")
+    high, low = RANK_FROM_CHAR[text[0]], RANK_FROM_CHAR[text[1]]
+    kind = text[2] if len(text) == 3 else ""
+    if kind not in ("", "s", "o") or (high == low and kind):
+        raise ValueError(f"Invalid hand class: {text}")
+    if high < low:
+        high, low = low, high
+    return high, low, kind
+
+
+def parse_combos(token: str) -> List[int]:
+    """Return the combo indices described by one range token
+
+    Supported tokens: pairs ("TT"), pair ranges ("TT+", "22-55"), suited/offsuit/any
+    classes ("AKs", "AKo", "AK"), kicker ranges ("ATs+", "A5s-A2s") and explicit combos
+    ("AhKd").
+    """
+    token = token.strip()
+    if len(token) == 4 and token[1] in SUIT_FROM_CHAR and token[3] in SUIT_FROM_CHAR:
+        card_a = _code(RANK_FROM_CHAR[token[0]], SUIT_FROM_CHAR[token[1]])
+        card_b = _code(RANK_FROM_CHAR[token[2]], SUIT_FROM_CHAR[token[3]])
+        return [combo_index(card_a, card_b)]
+
+    if "-" in token:
+        first, last = (_parse_class(part) for part in token.split("-"))
+        if first[0] == first[1]:  # pair range
+            if last[0] != last[1]:
+                raise ValueError(f"Invalid range: {token}")
+            lows = range(min(first[0], last[0]), max(first[0], last[0]) + 1)
+            return [i for rank in lows for i in _class_combos(rank, rank, "")]
+        if first[0] != last[0] or first[2] != last[2]:
+            raise ValueError(f"Invalid range: {token}")
+        lows = range(min(first[1], last[1]), max(first[1], last[1]) + 1)
+        return [i for low in lows for i in _class_combos(first[0], low, first[2])]
+
+    if token.endswith("+"):
+        high, low, kind = _parse_class(token[:-1])
+        if high == low:
+            return [i for rank in range(low, 15) for i in _class_combos(rank, rank, "")]
+        return [i for k in range(low, high) for i in _class_combos(high, k, kind)]
+
+    return _class_combos(*_parse_class(token))
+
+
+# The 169 preflop hand classes, e.g. "AA", "AKs", "AKo", and the combos of each one
+HAND_CLASSES: List[str] = [
+    RANKS[high] + RANKS[low] + kind
+    for high in range(14, 1, -1)
+    for low in range(high, 1, -1)
+    for kind in ([""] if high == low else ["s", "o"])
+]
+CLASS_COMBOS: List[List[int]] = [parse_combos(name) for name in HAND_CLASSES]
+
+
+class Range:
+    """Weighted range of hole cards, one weight per each of the 1326 holdings
+
+    Combos are indexed as in `COMBOS`, built from the project's card codes (`Card.code`).
+    """
+
+    def __init__(self, weights: Optional[Iterable[float]] = None):
+        """Initialize a range
+
+        Args:
+            weights (Iterable[float], optional): Weight of each combo, empty range if None
+        """
+        if weights is None:
+            self.weights = array("d", bytes(8 * NUM_COMBOS))
+        else:
+            self.weights = array("d", weights)
+            if len(self.weights) != NUM_COMBOS:
+                raise ValueError(f"A range has {NUM_COMBOS} weights")
+
+    @classmethod
+    def from_string(cls, notation: str) -> "Range":
+        """Parse a range in standard notation, e.g. "AKs, TT+, A5s-A2s, KQo:0.5"
+
+        A token may end with ":weight" to include its combos with that weight.
+
+        Args:
+            notation (str): Comma separated tokens
+
+        Returns:
+            Range: Parsed range
+        """
+        hand_range = cls()
+        for token in notation.split(","):
+            if not token.strip():
+                continue
+            token, _, weight = token.partition(":")
+            weight = float(weight) if weight else 1.0
+            for i in parse_combos(token):
+                hand_range.weights[i] = weight
+        return hand_range
+
+    @classmethod
+    def full(cls) -> "Range":
+        """Range containing every holding with weight 1"""
+        return cls([1.0] * NUM_COMBOS)
+
+    @staticmethod
+    def dead_mask(dead_cards: Iterable[int]) -> array:
+        """Return a mask with 0 for the combos that contain one of the dead cards"""
+        mask = array("b", [1] * NUM_COMBOS)
+        for card in dead_cards:
+            for i in CARD_COMBOS[card]:
+                mask[i] = 0
+        return mask
+
+    def remove_dead(self, dead_cards: Iterable[int]) -> "Range":
+        """Return a copy of the range without the combos blocked by the dead cards
+
+        Args:
+            dead_cards (Iterable[int]): Codes of the cards that cannot be held
+
+        Returns:
+            Range: Range with the blocked combos set to 0
+        """
+        mask = self.dead_mask(dead_cards)
+        return Range(w * m for w, m in zip(self.weights, mask))
+
+    def total(self) -> float:
+        """Sum of the weights"""
+        return sum(self.weights)
+
+    def combos(self) -> List[Tuple[Tuple[int, int], float]]:
+        """Return the combos with a non-zero weight and their weight"""
+        return [(COMBOS[i], w) for i, w in enumerate(self.weights) if w]
+
+    def __len__(self):
+        return sum(1 for w in self.weights if w)
+
+
+def ranked_combos(
+    board: Sequence[int], live: Iterable[int] = range(NUM_COMBOS)
+) -> List:
+    """Return the (hand value, combo index) of the live combos on a complete board
+
+    Combos blocked by the board are left out. The list is sorted by increasing value.
+    """
+    blocked = set(board)
+    board = list(board)
+    values = []
+    for i in live:
+        card_a, card_b = COMBOS[i]
+        if card_a not in blocked and card_b not in blocked:
+            values.append((evaluate_codes([card_a, card_b] + board), i))
+    values.sort()
+    return values
+
+
+def showdown_sweep(
+    ranked: List,
+    hero: Sequence[float],
+    villain: Sequence[float],
+    wins: array,
+    ties: array,
+    matchups: array,
+):
+    """Add the wins, ties and valid matchups of every hero combo on a complete board
+
+    Combos are swept in increasing hand value while maintaining the villain weight seen so
+    far, in total and per card. Card removal is then handled by inclusion-exclusion on the
+    two cards of the hero combo, so the cost is O(n) instead of O(n^2) pairs.
+
+    Args:
+        ranked (List): Combos ranked on the board, as returned by `ranked_combos`
+        hero (Sequence[float]): Hero weights, combos with a zero weight are skipped
+        villain (Sequence[float]): Villain weights
+        wins (array): Villain weight beaten by each hero combo, added to
+        ties (array): Villain weight tied by each hero combo, added to
+        matchups (array): Villain weight compatible with each hero combo, added to
+    """
+    all_total = 0.0
+    all_by_card = [0.0] * 52
+    for _, i in ranked:
+        all_total += villain[i]
+        card_a, card_b = COMBOS[i]
+        all_by_card[card_a] += villain[i]
+        all_by_card[card_b] += villain[i]
+
+    less_total = 0.0
+    less_by_card = [0.0] * 52
+    start = 0
+    while start < len(ranked):
+        end = start
+        value = ranked[start][0]
+        while end < len(ranked) and ranked[end][0] == value:
+            end += 1
+        group = ranked[start:end]
+
+        eq_total = 0.0
+        eq_by_card: Dict[int, float] = {}
+        for _, i in group:
+            card_a, card_b = COMBOS[i]
+            eq_total += villain[i]
+            eq_by_card[card_a] = eq_by_card.get(card_a, 0.0) + villain[i]
+            eq_by_card[card_b] = eq_by_card.get(card_b, 0.0) + villain[i]
+
+        for _, i in group:
+            if not hero[i]:
+                continue
+            card_a, card_b = COMBOS[i]
+            # the villain holding the very same combo is subtracted twice, add it back
+            wins[i] += less_total - less_by_card[card_a] - less_by_card[card_b]
+            ties[i] += (
+                eq_total - eq_by_card.get(card_a, 0.0) - eq_by_card.get(card_b, 0.0)
+            ) + villain[i]
+            matchups[i] += (
+                all_total - all_by_card[card_a] - all_by_card[card_b] + villain[i]
+            )
+
+        for _, i in group:
+            card_a, card_b = COMBOS[i]
+            less_total += villain[i]
+            less_by_card[card_a] += villain[i]
+            less_by_card[card_b] += villain[i]
+        start = end
+
+
+def range_equity(
+    hero: Range,
+    villain: Range,
+    board: Sequence[int] = (),
+    max_runouts: int = 2000,
+    rng: Optional[PCG32] = None,
+) -> Tuple[float, array]:
+    """Compute the equity of a range against another on a board
+
+    Runouts are enumerated when there are at most `max_runouts` of them, otherwise
+    `max_runouts` runouts are sampled from `rng`.
+
+    Args:
+        hero (Range): Range whose equity is computed
+        villain (Range): Opposing range
+        board (Sequence[int], optional): Codes of the known community cards
+        max_runouts (int, optional): Maximum number of runouts evaluated
+        rng (PCG32, optional): Generator used to sample runouts
+
+    Returns:
+        Tuple[float, array]: Equity of the hero range, and equity of each hero combo
+            (0 for combos absent from the range or fully blocked)
+    """
+    board = list(board)
+    hero_weights = hero.remove_dead(board).weights
+    villain_weights = villain.remove_dead(board).weights
+    live = [i for i in range(NUM_COMBOS) if hero_weights[i] or villain_weights[i]]
+
+    deck = [code for code in range(52) if code not in board]
+    missing = 5 - len(board)
+    runout_count = 1
+    for k in range(missing):
+        runout_count = runout_count * (len(deck) - k) // (k + 1)
+    if runout_count <= max_runouts:
+        runouts = combinations(deck, missing)
+    else:
+        rng = rng or PCG32()
+        runouts = []
+        for _ in range(max_runouts):
+            for i in range(missing):
+                j = i + rng.randbelow(len(deck) - i)
+                deck[i], deck[j] = deck[j], deck[i]
+            runouts.append(deck[:missing])
+
+    wins = array("d", bytes(8 * NUM_COMBOS))
+    ties = array("d", bytes(8 * NUM_COMBOS))
+    matchups = array("d", bytes(8 * NUM_COMBOS))
+    for runout in runouts:
+        showdown_sweep(
+            ranked_combos(board + list(runout), live),
+            hero_weights,
+            villain_weights,
+            wins,
+            ties,
+            matchups,
+        )
+
+    combo_equity = array("d", bytes(8 * NUM_COMBOS))
+    numerator = denominator = 0.0
+    for i in live:
+        if hero_weights[i] and matchups[i]:
+            combo_equity[i] = (wins[i] + ties[i] / 2) / matchups[i]
+            numerator += hero_weights[i] * (wins[i] + ties[i] / 2)
+            denominator += hero_weights[i] * matchups[i]
+    return (numerator / denominator if denominator else 0.0), combo_equity
@@ -0,0 +1,220 @@
+from collections import OrderedDict
+from itertools import combinations, permutations
+from typing import List, NamedTuple, Optional, Sequence, Tuple, TYPE_CHECKING
+from .evaluator import evaluate_codes
+from .rng import PCG32
+
+if TYPE_CHECKING:
+    from .hand import Hand
+
+AHEAD, TIED, BEHIND = 0, 1, 2
+SUIT_PERMUTATIONS = list(permutations(range(4)))
+
+
+class HandStrength(NamedTuple):
+    """Hand strength against one random opponent and its potential over the next cards"""
+
+    hs: float  # share of opponent holdings currently beaten (ties count half)
+    ppot: float  # probability of getting ahead when currently behind or tied
+    npot: float  # probability of falling behind when currently ahead or tied
+    ehs: float  # effective hand strength, hs * (1 - npot) + (1 - hs) * ppot
+
+
+def canonical_key(hole: Sequence[int], board: Sequence[int]) -> Tuple:
+    """Return a key shared by all the suit-isomorphic (hole, board) pairs
+
+    Args:
+        hole (Sequence[int]): Codes of the hole cards
+        board (Sequence[int]): Codes of the community cards
+
+    Returns:
+        Tuple: Smallest (hole, board) relabelling over the 24 suit permutations
+    """
+    best = None
+    for permutation in SUIT_PERMUTATIONS:
+        key = (
+            tuple(sorted(permutation[c // 13] * 13 + c % 13 for c in hole)),
+            tuple(sorted(permutation[c // 13] * 13 + c % 13 for c in board)),
+        )
+        if best is None or key < best:
+            best = key
+    return best
+
+
+class HandStrengthCalculator:
+    """Computes HS, PPot, NPot and EHS with an LRU cache keyed by canonical (board, hole)
+
+    Opponent holdings and runouts are enumerated exhaustively: our rank is evaluated once
+    per runout, but every (opponent holding, runout) pair needs an evaluation of its own.
+    Results are cached, so a single calculator can be shared by every table of a session.
+    """
+
+    def __init__(self, cache_size: int = 100000, lookahead: int = 1):
+        """Initialize the calculator
+
+        Args:
+            cache_size (int, optional): Maximum number of cached results
+            lookahead (int, optional): Number of future community cards considered for the
+                potential (1 or 2, capped by the cards left to deal)
+        """
+        self.cache_size = cache_size
+        self.lookahead = lookahead
+        self.cache: "OrderedDict[Tuple, HandStrength]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def evaluate_hand(self, hand: "Hand") -> HandStrength:
+        """Compute the hand strength of a `Hand` (2 hole cards, 3 to 5 community cards)"""
+        return self.evaluate(
+            [card.code for card in hand.hole_cards],
+            [card.code for card in hand.community_cards],
+        )
+
+    def evaluate(self, hole: Sequence[int], board: Sequence[int]) -> HandStrength:
+        """Compute the hand strength of hole cards on a board
+
+        Args:
+            hole (Sequence[int]): Codes of the 2 hole cards
+            board (Sequence[int]): Codes of the 3 to 5 community cards
+
+        Returns:
+            HandStrength: Strength and potential of the hand
+        """
+        if len(hole) != 2 or not 3 <= len(board) <= 5:
+            raise ValueError("Hand strength needs 2 hole cards and 3 to 5 board cards")
+        key = canonical_key(hole, board)
+        result = self.cache.get(key)
+        if result is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = self._compute(list(hole), list(board))
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+    def _compute(self, hole: List[int], board: List[int]) -> HandStrength:
+        dead = set(hole) | set(board)
+        deck = [code for code in range(52) if code not in dead]
+        opponents = list(combinations(deck, 2))
+
+        our_rank = evaluate_codes(hole + board)
+        opponent_ranks = [evaluate_codes(list(opp) + board) for opp in opponents]
+        states = [
+            AHEAD if our_rank > rank else TIED if our_rank == rank else BEHIND
+            for rank in opponent_ranks
+        ]
+        totals = [states.count(AHEAD), states.count(TIED), states.count(BEHIND)]
+        hs = (totals[AHEAD] + totals[TIED] / 2) / len(opponents)
+
+        lookahead = min(self.lookahead, 5 - len(board))
+        if lookahead == 0:
+            return HandStrength(hs, 0.0, 0.0, hs)
+
+        # potential[current state][final state], weighted by the runouts
+        potential = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
+        runouts = list(combinations(deck, lookahead))
+        our_final = {
+            runout: evaluate_codes(hole + board + list(runout)) for runout in runouts
+        }
+        runout_totals = [0, 0, 0]
+        for opp, state in zip(opponents, states):
+            row = potential[state]
+            for runout in runouts:
+                if opp[0] in runout or opp[1] in runout:
+                    continue
+                runout_totals[state] += 1
+                ours = our_final[runout]
+                theirs = evaluate_codes(list(opp) + board + list(runout))
+                row[AHEAD if ours > theirs else TIED if ours == theirs else BEHIND] += 1
+
+        behind_or_tied = runout_totals[BEHIND] + runout_totals[TIED] / 2
+        ahead_or_tied = runout_totals[AHEAD] + runout_totals[TIED] / 2
+        ppot = (
+            (
+                potential[BEHIND][AHEAD]
+                + potential[BEHIND][TIED] / 2
+                + potential[TIED][AHEAD] / 2
+            )
+            / behind_or_tied
+            if behind_or_tied
+            else 0.0
+        )
+        npot = (
+            (
+                potential[AHEAD][BEHIND]
+                + potential[TIED][BEHIND] / 2
+                + potential[AHEAD][TIED] / 2
+            )
+            / ahead_or_tied
+            if ahead_or_tied
+            else 0.0
+        )
+        return HandStrength(hs, ppot, npot, hs * (1 - npot) + (1 - hs) * ppot)
+
+    def clear(self):
+        """Empty the cache"""
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Calculator shared by the tables of a process
+default_calculator: Optional[HandStrengthCalculator] = None
+
+
+def get_default_calculator() -> HandStrengthCalculator:
+    """Return the process-wide calculator, created on first use"""
+    global default_calculator
+    if default_calculator is None:
+        default_calculator = HandStrengthCalculator()
+    return default_calculator
+
+
+def showdown_equities(
+    holes: Sequence[Sequence[int]],
+    board: Sequence[int],
+    samples: int = 1000,
+    rng: Optional["PCG32"] = None,
+) -> List[float]:
+    """Share of the pot each player wins on average once the board is completed
+
+    Runouts are enumerated exhaustively when at most two community cards are missing,
+    otherwise `samples` runouts are drawn (without bias) from `rng`.
+
+    Args:
+        holes (Sequence[Sequence[int]]): Codes of the hole cards of each player
+        board (Sequence[int]): Codes of the known community cards
+        samples (int, optional): Number of sampled runouts when enumeration is too large
+        rng (PCG32, optional): Generator used to sample runouts
+
+    Returns:
+        List[float]: Equity of each player, summing to 1
+    """
+    dead = {code for hole in holes for code in hole} | set(board)
+    deck = [code for code in range(52) if code not in dead]
+    missing = 5 - len(board)
+    if missing <= 2:
+        runouts = list(combinations(deck, missing))
+    else:
+        rng = rng or PCG32()
+        runouts = []
+        for _ in range(samples):
+            for i in range(missing):
+                j = i + rng.randbelow(len(deck) - i)
+                deck[i], deck[j] = deck[j], deck[i]
+            runouts.append(deck[:missing])
+
+    equities = [0.0] * len(holes)
+    board = list(board)
+    for runout in runouts:
+        full_board = board + list(runout)
+        values = [evaluate_codes(list(hole) + full_board) for hole in holes]
+        best = max(values)
+        winners = [i for i, value in enumerate(values) if value == best]
+        for i in winners:
+            equities[i] += 1 / len(winners)
+    return [equity / len(runouts) for equity in equities]
@@ -1,25 +1,64 @@
 from typing import TYPE_CHECKING
 from .hand import Hand
 from .action import Action, ActionType
+from .table_state import TableState
 
 if TYPE_CHECKING:
     from .betting_round import BettingRound
 
 
+class SeatColumn:
+    """Descriptor exposing one column of the player's `TableState` seat as an attribute"""
+
+    def __init__(self, cast: type = int):
+        self.cast = cast
+
+    def __set_name__(self, owner, name: str):
+        self.column = name
+
+    def __get__(self, player: "Player", owner=None):
+        if player is None:
+            return self
+        return self.cast(getattr(player._table, self.column)[player._seat])
+
+    def __set__(self, player: "Player", value):
+        getattr(player._table, self.column)[player._seat] = int(value)
+
+
 class Player:
-    """Represents a player at the table with their chips and position"""
+    """Represents a player at the table with their chips and position
+
+    The per-seat state (chips, bets and flags) lives in a `TableState`; the player is a view
+    over its seat. A player owns a single-seat table until a `Game` seats it at its own table.
+    """
+
+    chips = SeatColumn()
+    current_bet = SeatColumn()
+    contributed = SeatColumn()
+    is_active = SeatColumn(bool)
+    folded = SeatColumn(bool)
+    spoke = SeatColumn(bool)
+    revealed = SeatColumn(bool)
+    is_all_in = SeatColumn(bool)
 
     def __init__(self, name: str, chips: int):
+        self._table = TableState(1)
+        self._seat = 0
+        self._table.players[0] = self
         self.name = name
         self.chips = chips
         self.position = -1
         self.hand: "Hand" = Hand()
-        self.is_active = True
-        self.current_bet = 0
-        self.folded = False
-        self.spoke = False
-        self.revealed = False
-        self.is_all_in = False
+
+    def _bind(self, table: "TableState", seat: int):
+        """Bind the player to a seat of a table
+
+        Args:
+            table (TableState): Table holding the player's state
+            seat (int): Seat index in the table
+        """
+        self._table = table
+        self._seat = seat
 
     def place_bet(self, amount: int, blind_bet: bool = False) -> bool:
         """Place a bet of the specified amount
@@ -41,6 +80,7 @@ class Player:
 
         self.chips -= amount
         self.current_bet += amount
+        self.contributed += amount
 
         return True
 
@@ -52,8 +92,9 @@ class Player:
 
     def reset_hand(self):
         """Reset the player's state for a new hand"""
-        self.hand = Hand()
+        self.hand.clear()
         self.current_bet = 0
+        self.contributed = 0
         self.folded = False
         self.is_active = True
         self.spoke = False
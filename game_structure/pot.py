@@ -0,0 +1,111 @@
+from typing import List, Sequence, Tuple
+
+
+def uncalled_chips(contributions: Sequence[int]) -> Tuple[int, int]:
+    """Find the chips of the biggest contribution that no other seat matched
+
+    They go back to their owner before the pots are built: nobody can win them.
+
+    Args:
+        contributions (Sequence[int]): Chips put in the pot by each seat during the hand
+
+    Returns:
+        Tuple[int, int]: Seat of the biggest contribution and the chips it put in above
+            the second biggest one (0 if it was matched)
+    """
+    seat = max(range(len(contributions)), key=contributions.__getitem__)
+    matched = max(
+        (chips for other, chips in enumerate(contributions) if other != seat),
+        default=0,
+    )
+    return seat, contributions[seat] - matched
+
+
+def build_pots(
+    contributions: Sequence[int], live: Sequence[bool]
+) -> List[Tuple[int, int]]:
+    """Split the chips put in a hand into a main pot and side pots
+
+    Seats are sorted by contribution and every distinct contribution level closes a
+    layer paid by all the seats that reached it. Consecutive layers contested by the same
+    live seats are merged, and chips no live seat can win (contributed above every live
+    seat by players who folded) go to the last pot. Chips nobody matched should be
+    returned with `uncalled_chips` first, they would make a pot of their own. Sorting
+    dominates: O(n log n).
+
+    Args:
+        contributions (Sequence[int]): Chips put in the pot by each seat during the hand
+        live (Sequence[bool]): Whether each seat can still win (has not folded)
+
+    Returns:
+        List[Tuple[int, int]]: (amount, level) of each pot, main pot first. The live seats
+            whose contribution is at least `level` are eligible to the pot.
+    """
+    n = len(contributions)
+    order = sorted(range(n), key=contributions.__getitem__)
+    pots: List[Tuple[int, int]] = []
+    live_left = sum(1 for seat in range(n) if live[seat])
+    live_since_pot = True  # whether a live seat dropped out since the last pot
+    live_level = 0  # highest contribution of a live seat seen so far
+    previous = 0
+    for index, seat in enumerate(order):
+        level = contributions[seat]
+        if level > previous:
+            amount = (level - previous) * (n - index)
+            if pots and (live_left == 0 or not live_since_pot):
+                pots[-1] = (pots[-1][0] + amount, pots[-1][1])
+            elif live_left == 0:  # no pot yet: the live seats put in less than this
+                pots.append((amount, live_level))
+            else:
+                pots.append((amount, level))
+                live_since_pot = False
+            previous = level
+        if live[seat]:
+            live_left -= 1
+            live_since_pot = True
+            live_level = level
+    return pots
+
+
+def award_pots(
+    pots: List[Tuple[int, int]],
+    contributions: Sequence[int],
+    ranking: List[Tuple[int, int]],
+    first_seat: int,
+) -> Tuple[List[int], List[Tuple[int, List[int]]]]:
+    """Award every pot to the best eligible hands of a single ranking
+
+    A split pot is shared equally, the odd chips going one each to the winners closest
+    to the left of the dealer.
+
+    Args:
+        pots (List[Tuple[int, int]]): Pots returned by `build_pots`
+        contributions (Sequence[int]): Chips put in the pot by each seat
+        ranking (List[Tuple[int, int]]): (hand value, seat) of the live seats, best first
+        first_seat (int): Seat receiving the first odd chip (left of the dealer)
+
+    Returns:
+        Tuple[List[int], List[Tuple[int, List[int]]]]: Chips won by each seat, and for
+            each pot the share of each winner (odd chips excluded) and the winning seats
+            in odd-chip order
+    """
+    n = len(contributions)
+    awards = [0] * n
+    results = []
+    for amount, level in pots:
+        winners: List[int] = []
+        best = None
+        for value, seat in ranking:
+            if contributions[seat] < level:
+                continue
+            if best is None:
+                best = value
+            elif value != best:
+                break
+            winners.append(seat)
+        winners.sort(key=lambda seat: (seat - first_seat) % n)
+        share, odd_chips = divmod(amount, len(winners))
+        for index, seat in enumerate(winners):
+            awards[seat] += share + (index < odd_chips)
+        results.append((share, winners))
+    return awards, results
@@ -0,0 +1,223 @@
+import os
+import random
+import sys
+from array import array
+from typing import List, MutableSequence, Optional
+
+MASK_32 = 0xFFFFFFFF
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+PCG_MULTIPLIER = 6364136223846793005
+DECK_SIZE = 52
+ORDERED_DECK = bytes(range(DECK_SIZE))
+KEY_BYTES = 8  # sort key of a card in a deal: 7 random bytes above the card code
+DEAL_CHUNK = 64  # deals generated at once
+
+
+class PCG32:
+    """PCG32 (XSH-RR) random number generator
+
+    Each generator is identified by a seed and a stream; two generators with the same seed
+    and stream produce the same sequence, and different streams are independent sequences.
+    """
+
+    def __init__(self, seed: Optional[int] = None, stream: int = 0):
+        """Initialize the generator
+
+        Args:
+            seed (int, optional): Seed of the generator, drawn from the OS if None. Any
+                integer is accepted and reduced modulo 2**64.
+            stream (int, optional): Stream selector
+        """
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "little")
+        seed &= MASK_64
+        self.seed = seed
+        self.stream = stream
+        self.state = 0
+        self.inc = ((stream << 1) | 1) & MASK_64
+        self.next_uint32()
+        self.state = (self.state + seed) & MASK_64
+        self.next_uint32()
+
+    def next_uint32(self) -> int:
+        """Return the next 32-bit unsigned integer of the stream"""
+        old = self.state
+        self.state = (old * PCG_MULTIPLIER + self.inc) & MASK_64
+        xorshifted = (((old >> 18) ^ old) >> 27) & MASK_32
+        rot = old >> 59
+        return ((xorshifted >> rot) | (xorshifted << (-rot & 31))) & MASK_32
+
+    def randbelow(self, n: int) -> int:
+        """Return an unbiased integer in [0, n)
+
+        Args:
+            n (int): Exclusive upper bound, at most 2**32
+        """
+        threshold = (MASK_32 + 1 - n) % n
+        while True:
+            r = self.next_uint32()
+            if r >= threshold:
+                return r % n
+
+    def random(self) -> float:
+        """Return a float in [0, 1)"""
+        return self.next_uint32() / 4294967296.0
+
+    def shuffle(self, items: MutableSequence):
+        """Shuffle a sequence in place (Fisher-Yates)
+
+        Args:
+            items (MutableSequence): Sequence to shuffle
+        """
+        for i in range(len(items) - 1, 0, -1):
+            j = self.randbelow(i + 1)
+            items[i], items[j] = items[j], items[i]
+
+    def advance(self, delta: int):
+        """Jump the stream ahead by `delta` steps in O(log delta)
+
+        Args:
+            delta (int): Number of steps to skip
+        """
+        acc_mult, acc_plus = 1, 0
+        cur_mult, cur_plus = PCG_MULTIPLIER, self.inc
+        delta &= MASK_64
+        while delta:
+            if delta & 1:
+                acc_mult = (acc_mult * cur_mult) & MASK_64
+                acc_plus = (acc_plus * cur_mult + cur_plus) & MASK_64
+            cur_plus = ((cur_mult + 1) * cur_plus) & MASK_64
+            cur_mult = (cur_mult * cur_mult) & MASK_64
+            delta >>= 1
+        self.state = (acc_mult * self.state + acc_plus) & MASK_64
+
+    def get_state(self) -> List[int]:
+        """Return the internal state as [state, inc]"""
+        return [self.state, self.inc]
+
+    def set_state(self, state: List[int]):
+        """Restore an internal state returned by `get_state`
+
+        Args:
+            state (List[int]): Internal state as [state, inc]
+        """
+        self.state, self.inc = state
+
+
+class DealGenerator:
+    """Generates blocks of deck permutations from a seed
+
+    Block `k` is drawn from a Mersenne Twister (`random.Random`) seeded with the seed and
+    `k`, so every block can be regenerated independently: games built with the same seed
+    see the same sequence of deals, and the generator can be repositioned on any deal
+    without replaying the previous ones. Random bytes are drawn in bulk and each deal is
+    the order of 52 random keys: 7 random bytes above the card code, so that sorting the
+    keys as integers sorts the cards and ties (about one deal in 10**14) are broken by
+    card code. The current block is filled lazily, `DEAL_CHUNK` deals at a time up to the
+    last deal requested, and several games reading the same deals can share one generator
+    through `deal`.
+    """
+
+    def __init__(self, seed: int, block_size: int = 1024):
+        """Initialize the generator
+
+        Args:
+            seed (int): Seed of the deals, reduced modulo 2**64
+            block_size (int, optional): Number of deals drawn from each random source
+        """
+        self.seed = seed & MASK_64
+        self.block_size = block_size
+        self.deals_served = 0
+        self._block_index = -1
+        self._block = bytearray()
+        self._block_rng: Optional[random.Random] = None
+        self._generated = 0  # deals of the current block generated so far
+
+    def _block_source(self, block_index: int) -> random.Random:
+        """Random source of a block"""
+        return random.Random(self.seed << 64 | block_index)
+
+    @staticmethod
+    def _draw_deals(rng: random.Random, count: int) -> bytes:
+        """Draw the next `count` permutations of the 52 card codes from a block source"""
+        size = DECK_SIZE * count
+        raw = bytearray(KEY_BYTES * size)
+        raw[0::KEY_BYTES] = (
+            ORDERED_DECK * count
+        )  # lowest byte of the little-endian keys
+        random_bytes = rng.randbytes((KEY_BYTES - 1) * size)
+        for index in range(1, KEY_BYTES):
+            raw[index::KEY_BYTES] = random_bytes[index - 1 :: KEY_BYTES - 1]
+        keys = array("Q", raw)
+        if sys.byteorder == "big":
+            keys.byteswap()
+        values = keys.tolist()
+        order: List[int] = []
+        for start in range(0, size, DECK_SIZE):
+            order += sorted(values[start : start + DECK_SIZE])
+        keys = array("Q", order)
+        if sys.byteorder == "big":
+            keys.byteswap()
+        return keys.tobytes()[0::KEY_BYTES]
+
+    def generate_block(self, block_index: int) -> bytearray:
+        """Generate a whole block of `block_size` permutations of the 52 card codes
+
+        Args:
+            block_index (int): Index of the block
+
+        Returns:
+            bytearray: Concatenated permutations, 52 bytes per deal
+        """
+        rng = self._block_source(block_index)
+        block = bytearray()
+        for start in range(0, self.block_size, DEAL_CHUNK):
+            block += self._draw_deals(rng, min(DEAL_CHUNK, self.block_size - start))
+        return block
+
+    def deal(self, deal_index: int) -> memoryview:
+        """Return the permutation of a given deal
+
+        Args:
+            deal_index (int): Index of the deal in the sequence
+
+        Returns:
+            memoryview: 52 card codes, the last one being on top of the deck
+        """
+        block_index, offset = divmod(deal_index, self.block_size)
+        if block_index != self._block_index:
+            # filled in place, so the views returned earlier stay valid
+            self._block = bytearray(DECK_SIZE * self.block_size)
+            self._block_rng = self._block_source(block_index)
+            self._block_index = block_index
+            self._generated = 0
+        while self._generated <= offset:
+            count = min(DEAL_CHUNK, self.block_size - self._generated)
+            start = self._generated * DECK_SIZE
+            self._block[start : start + DECK_SIZE * count] = self._draw_deals(
+                self._block_rng, count
+            )
+            self._generated += count
+        offset *= DECK_SIZE
+        return memoryview(self._block)[offset : offset + DECK_SIZE]
+
+    def next_deal(self) -> memoryview:
+        """Return the permutation of the next deal and move forward"""
+        order = self.deal(self.deals_served)
+        self.deals_served += 1
+        return order
+
+    def to_array(self, start: int, count: int) -> array:
+        """Return several consecutive deals as a flat array of card codes
+
+        Args:
+            start (int): Index of the first deal
+            count (int): Number of deals
+
+        Returns:
+            array: `52 * count` card codes
+        """
+        deals = array("B")
+        for deal_index in range(start, start + count):
+            deals.frombytes(self.deal(deal_index))
+        return deals
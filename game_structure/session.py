@@ -0,0 +1,141 @@
+import gc
+from typing import Dict, List, Optional, Sequence, Tuple
+from .game import Game
+from .player import Player
+
+
+class BlindSchedule:
+    """Blind levels, each one lasting a fixed number of hands"""
+
+    def __init__(self, levels: Sequence[Tuple[int, int]], hands_per_level: int = 0):
+        """Initialize the schedule
+
+        Args:
+            levels (Sequence[Tuple[int, int]]): (small blind, big blind) of each level
+            hands_per_level (int, optional): Hands played at each level, the last level
+                lasting forever. If 0, the first level is never left.
+        """
+        if not levels:
+            raise ValueError("A blind schedule needs at least one level")
+        self.levels = list(levels)
+        self.hands_per_level = hands_per_level
+
+    def level(self, hand_index: int) -> int:
+        """Return the level of the `hand_index`-th hand of a session (0-based)"""
+        if not self.hands_per_level:
+            return 0
+        return min(hand_index // self.hands_per_level, len(self.levels) - 1)
+
+    def blinds(self, hand_index: int) -> Tuple[int, int]:
+        """Return the (small blind, big blind) of the `hand_index`-th hand"""
+        return self.levels[self.level(hand_index)]
+
+
+class Session:
+    """Plays consecutive hands of a game until one player is left or a hand limit
+
+    The game's deck, hands, betting round and table columns are reset in place between
+    hands, so steady-state play allocates almost nothing. Busted players rebuy while
+    the rebuy rules allow it, and are eliminated otherwise.
+    """
+
+    def __init__(
+        self,
+        game: Game,
+        schedule: Optional[BlindSchedule] = None,
+        rebuy_chips: int = 0,
+        max_rebuys: Optional[int] = 0,
+        freeze_gc: bool = True,
+    ):
+        """Initialize a session
+
+        Args:
+            game (Game): Game with its players seated
+            schedule (BlindSchedule, optional): Blind schedule, the game's blinds are kept
+                if None
+            rebuy_chips (int, optional): Chips received by a busted player who rebuys
+            max_rebuys (int, optional): Rebuys allowed per player, unlimited if None
+            freeze_gc (bool, optional): Whether to move the objects alive when the
+                session first plays out of the garbage collector's reach, so collections
+                do not rescan the long-lived session objects. The freeze is done once and
+                never undone: `gc.unfreeze` would also release the objects frozen by
+                other code. Frozen objects are still freed by reference counting, only
+                their reference cycles are never collected.
+        """
+        self.game = game
+        self.schedule = schedule
+        self.rebuy_chips = rebuy_chips
+        self.max_rebuys = max_rebuys
+        self.freeze_gc = freeze_gc
+        self._gc_frozen = False
+        self.hands_played = 0
+        self.rebuys: Dict[str, int] = {player.name: 0 for player in game.players}
+        self.eliminated: List[Tuple[str, int]] = []  # (name, hand number)
+
+    @property
+    def is_over(self) -> bool:
+        return len(self.game.players) < 2
+
+    def _apply_blinds(self):
+        if self.schedule is None:
+            return
+        small_blind, big_blind = self.schedule.blinds(self.hands_played)
+        self.game.parameter["small_blind"] = small_blind
+        self.game.parameter["big_blind"] = big_blind
+
+    def _can_rebuy(self, player: Player) -> bool:
+        if self.rebuy_chips <= 0:
+            return False
+        return self.max_rebuys is None or self.rebuys[player.name] < self.max_rebuys
+
+    def _handle_busted(self, won: List[int]):
+        """Rebuy or eliminate the players left without chips
+
+        Args:
+            won (List[int]): Chips won by each player during the hand, in position order.
+                Players busted by the same hand are eliminated smallest stack first.
+        """
+        busted = sorted(
+            (player for player in self.game.players if player.chips <= 0),
+            key=lambda player: player.chips - won[player.position],
+        )
+        for player in busted:
+            if self._can_rebuy(player):
+                player.chips = self.rebuy_chips
+                self.rebuys[player.name] += 1
+            else:
+                self.game.remove_player(player)
+                self.eliminated.append((player.name, self.game.hand_number))
+
+    def play(self, hands: int) -> int:
+        """Play hands until the limit is reached or a single player is left
+
+        Args:
+            hands (int): Maximum number of hands to play
+
+        Returns:
+            int: Number of hands played
+        """
+        if self.freeze_gc and not self._gc_frozen:
+            gc.collect()
+            gc.freeze()
+            self._gc_frozen = True
+        played = 0
+        while played < hands and not self.is_over:
+            self._apply_blinds()
+            won = self.game.play_hand()
+            self.hands_played += 1
+            played += 1
+            self._handle_busted(won)
+        return played
+
+    def standings(self) -> List[str]:
+        """Return the player names from first to last
+
+        Remaining players are ranked by chips, then eliminated players by reverse order of
+        elimination (players busted by the same hand by their stack before it).
+        """
+        remaining = sorted(self.game.players, key=lambda player: -player.chips)
+        return [player.name for player in remaining] + [
+            name for name, _ in reversed(self.eliminated)
+        ]
@@ -0,0 +1,259 @@
+from array import array
+from typing import Dict, List, Optional, TYPE_CHECKING
+from .action import ActionType
+from .events import Event, EventType
+
+if TYPE_CHECKING:
+    from .game import Game
+    from .player import Player
+
+
+class WindowedCounter:
+    """Counter keeping an all-time sum, a sliding window sum and an exponentially decayed sum
+
+    Every update is O(1): the window is a fixed-size ring buffer whose running sum is
+    updated with the value entering and the value leaving the window.
+    """
+
+    __slots__ = ("total", "window", "window_sum", "index", "decayed", "decay")
+
+    def __init__(self, depth: int, decay: float):
+        """Initialize the counter
+
+        Args:
+            depth (int): Number of samples in the sliding window
+            decay (float): Factor applied to the decayed sum before each sample
+        """
+        self.total = 0
+        self.window = array("l", bytes(array("l").itemsize * depth))
+        self.window_sum = 0
+        self.index = 0
+        self.decayed = 0.0
+        self.decay = decay
+
+    def add(self, value: int):
+        """Add a sample to the counter
+
+        Args:
+            value (int): Value of the sample
+        """
+        self.total += value
+        self.window_sum += value - self.window[self.index]
+        self.window[self.index] = value
+        self.index = (self.index + 1) % len(self.window)
+        self.decayed = self.decayed * self.decay + value
+
+    def get(self, scope: str = "all") -> float:
+        """Return the sum over a scope ("all", "window" or "decay")"""
+        if scope == "all":
+            return self.total
+        if scope == "window":
+            return self.window_sum
+        if scope == "decay":
+            return self.decayed
+        raise ValueError(f"Unknown scope: {scope}")
+
+
+class PlayerStats:
+    """Counters of one tracked player, one sample per hand dealt"""
+
+    # Name of each counter, the ratios are built from these pairs
+    COUNTERS = (
+        "hands",
+        "vpip",
+        "pfr",
+        "aggressive",
+        "calls",
+        "cbet_faced",
+        "cbet_folded",
+        "saw_flop",
+        "showdown",
+        "showdown_won",
+    )
+
+    def __init__(self, depth: int, decay: float):
+        self.counters: Dict[str, WindowedCounter] = {
+            name: WindowedCounter(depth, decay) for name in self.COUNTERS
+        }
+
+    def commit_hand(self, samples: Dict[str, int]):
+        """Push the samples of a hand into the counters"""
+        for name, value in samples.items():
+            self.counters[name].add(value)
+
+    def ratio(self, numerator: str, denominator: str, scope: str) -> float:
+        """Return the ratio of two counters over a scope, 0 when undefined"""
+        den = self.counters[denominator].get(scope)
+        return self.counters[numerator].get(scope) / den if den else 0.0
+
+
+class _HandState:
+    """Samples and continuation bet state of the hand in progress in one game"""
+
+    __slots__ = ("samples", "preflop_aggressor", "cbet_made", "facing_cbet")
+
+    def __init__(self):
+        self.samples: Dict[str, Dict[str, int]] = {}
+        self.preflop_aggressor: Optional[str] = None
+        self.cbet_made = False
+        self.facing_cbet: List[str] = []
+
+    def get(self, name: str) -> Dict[str, int]:
+        """Return the samples of a player in this hand"""
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = dict.fromkeys(PlayerStats.COUNTERS, 0)
+        return samples
+
+
+class OpponentTracker:
+    """Tracks opponent tendencies from the actions observed in a `Game`
+
+    Subscribe it to the event bus of one or more games (`game.events.subscribe(tracker)`).
+    The state of the hand in progress is kept per game, so the events of several games
+    may interleave. Statistics are maintained incrementally, so every query is O(1) and
+    can be made on each decision.
+    """
+
+    event_types = [EventType.DEAL, EventType.ACTION, EventType.AWARD]
+
+    def __init__(self, memory_depth: int = 100, decay: float = 0.99):
+        """Initialize the tracker
+
+        Args:
+            memory_depth (int, optional): Number of hands in the sliding window
+            decay (float, optional): Per-hand decay factor of the decayed statistics
+        """
+        self.memory_depth = memory_depth
+        self.decay = decay
+        self.players: Dict[str, PlayerStats] = {}
+        self._hands: Dict[int, _HandState] = {}  # by id of the game
+
+    def _get(self, name: str) -> PlayerStats:
+        if name not in self.players:
+            self.players[name] = PlayerStats(self.memory_depth, self.decay)
+        return self.players[name]
+
+    def _hand(self, game: "Game") -> _HandState:
+        hand = self._hands.get(id(game))
+        if hand is None:
+            hand = self._hands[id(game)] = _HandState()
+        return hand
+
+    def __call__(self, event: Event):
+        game = event.game
+        if event.type == EventType.DEAL:
+            self.on_hand_start(game)
+        elif event.type == EventType.ACTION:
+            player = game.players[event.position]
+            self.on_action(game, player, event.action, event.stage)
+        elif event.type == EventType.AWARD:
+            self.on_hand_end(game, [game.players[p] for p in event.winners])
+
+    def on_hand_start(self, game: "Game"):
+        """Record that a new hand was dealt to the players of the game"""
+        hand = self._hands[id(game)] = _HandState()
+        for player in game.players:
+            self._get(player.name)
+            hand.get(player.name)["hands"] = 1
+
+    def on_action(self, game: "Game", player: "Player", action: ActionType, stage: int):
+        """Record a successful action
+
+        Args:
+            game (Game): Game where the action happened
+            player (Player): Player who acted
+            action (ActionType): Type of the action performed
+            stage (int): Stage of the action (0=preflop, 1=flop, 2=turn, 3=river)
+        """
+        hand = self._hand(game)
+        current = hand.get(player.name)
+        if stage == 0:
+            if action in (ActionType.CALL, ActionType.RAISE):
+                current["vpip"] = 1
+            if action == ActionType.RAISE:
+                current["pfr"] = 1
+                hand.preflop_aggressor = player.name
+            return
+
+        if stage == 1:
+            current["saw_flop"] = 1
+            if player.name in hand.facing_cbet:
+                hand.facing_cbet.remove(player.name)
+                current["cbet_faced"] = 1
+                current["cbet_folded"] = int(action == ActionType.FOLD)
+            if (
+                action == ActionType.RAISE
+                and not hand.cbet_made
+                and player.name == hand.preflop_aggressor
+            ):
+                hand.facing_cbet = [
+                    p.name for p in game.players if not p.folded and p is not player
+                ]
+            if action == ActionType.RAISE:
+                hand.cbet_made = True
+
+        if action == ActionType.RAISE:
+            current["aggressive"] += 1
+        elif action == ActionType.CALL:
+            current["calls"] += 1
+
+    def on_hand_end(self, game: "Game", winners: List["Player"]):
+        """Record the showdown results and commit the hand for every player"""
+        hand = self._hands.pop(id(game), None) or _HandState()
+        active_players = [p for p in game.players if not p.folded]
+        if len(active_players) > 1:
+            for player in active_players:
+                current = hand.get(player.name)
+                current["showdown"] = 1
+                current["showdown_won"] = int(player in winners)
+        if game.current_round.stage > 0:
+            for player in active_players:
+                hand.get(player.name)["saw_flop"] = 1
+        for player in game.players:
+            self._get(player.name).commit_hand(hand.get(player.name))
+
+    def vpip(self, name: str, scope: str = "all") -> float:
+        """Voluntarily put money in pot: share of hands with a preflop call or raise"""
+        return self._get(name).ratio("vpip", "hands", scope)
+
+    def pfr(self, name: str, scope: str = "all") -> float:
+        """Preflop raise: share of hands with a preflop raise"""
+        return self._get(name).ratio("pfr", "hands", scope)
+
+    def aggression_factor(self, name: str, scope: str = "all") -> float:
+        """Postflop raises divided by postflop calls"""
+        return self._get(name).ratio("aggressive", "calls", scope)
+
+    def fold_to_cbet(self, name: str, scope: str = "all") -> float:
+        """Share of flop continuation bets faced that were folded"""
+        return self._get(name).ratio("cbet_folded", "cbet_faced", scope)
+
+    def went_to_showdown(self, name: str, scope: str = "all") -> float:
+        """Share of the hands that saw the flop and reached showdown"""
+        return self._get(name).ratio("showdown", "saw_flop", scope)
+
+    def won_at_showdown(self, name: str, scope: str = "all") -> float:
+        """Share of the showdowns that were won"""
+        return self._get(name).ratio("showdown_won", "showdown", scope)
+
+    def get_stats(self, name: str, scope: str = "all") -> Dict[str, float]:
+        """Return all the statistics of a player over a scope
+
+        Args:
+            name (str): Name of the player
+            scope (str, optional): "all" (all-time), "window" (last `memory_depth`
+                hands) or "decay" (exponentially decayed)
+
+        Returns:
+            Dict[str, float]: Statistics by name
+        """
+        return {
+            "hands": self._get(name).counters["hands"].get(scope),
+            "vpip": self.vpip(name, scope),
+            "pfr": self.pfr(name, scope),
+            "aggression_factor": self.aggression_factor(name, scope),
+            "fold_to_cbet": self.fold_to_cbet(name, scope),
+            "went_to_showdown": self.went_to_showdown(name, scope),
+            "won_at_showdown": self.won_at_showdown(name, scope),
+        }
@@ -0,0 +1,168 @@
+from array import array
+from typing import List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .player import Player
+
+# Per-seat columns, integer valued (int64) and boolean flags (int8). `contributed` holds
+# the chips put in the pot during the whole hand, `current_bet` those of the street.
+INT_COLUMNS = ("chips", "current_bet", "contributed")
+FLAG_COLUMNS = ("is_active", "folded", "spoke", "revealed", "is_all_in")
+NO_CARD = -1
+
+
+class TableState:
+    """Struct-of-arrays storage for the per-seat state of a table
+
+    Every column is a contiguous `array` indexed by seat, so bulk operations (stage reset,
+    blind posting, showdown) touch flat buffers instead of walking `Player` objects, and the
+    whole table can be copied or serialized with a single buffer copy.
+    """
+
+    def __init__(self, num_seats: int = 0):
+        """Initialize an empty table
+
+        Args:
+            num_seats (int, optional): Number of seats to preallocate
+        """
+        self.num_seats = num_seats
+        self.chips = array("q", bytes(8 * num_seats))
+        self.current_bet = array("q", bytes(8 * num_seats))
+        self.contributed = array("q", bytes(8 * num_seats))
+        self.is_active = array("b", [1] * num_seats)
+        self.folded = array("b", bytes(num_seats))
+        self.spoke = array("b", bytes(num_seats))
+        self.revealed = array("b", bytes(num_seats))
+        self.is_all_in = array("b", bytes(num_seats))
+        self.hole_cards = array("b", [NO_CARD] * (2 * num_seats))
+        self.players: List["Player"] = [None] * num_seats
+        self._build_templates()
+
+    def _build_templates(self):
+        """Build the preallocated reset values, slice-assigned by the stage resets"""
+        self._zeros = array("q", bytes(8 * self.num_seats))
+        self._flags_off = array("b", bytes(self.num_seats))
+        self._flags_on = array("b", [1] * self.num_seats)
+        self._no_cards = array("b", [NO_CARD] * (2 * self.num_seats))
+
+    def _columns(self) -> List[array]:
+        """Return all the columns in serialization order"""
+        return [getattr(self, name) for name in INT_COLUMNS + FLAG_COLUMNS] + [
+            self.hole_cards
+        ]
+
+    def add_seat(self, player: "Player") -> int:
+        """Append a seat initialized from the player's current state and bind the player to it
+
+        Args:
+            player (Player): Player taking the seat
+
+        Returns:
+            int: Index of the new seat
+        """
+        seat = self.num_seats
+        for name in INT_COLUMNS + FLAG_COLUMNS:
+            getattr(self, name).append(getattr(player, name))
+        self.hole_cards.extend(
+            player._table.hole_cards[2 * player._seat : 2 * player._seat + 2]
+        )
+        self.players.append(player)
+        self.num_seats += 1
+        self._build_templates()
+        player._bind(self, seat)
+        return seat
+
+    def remove_seat(self, seat: int):
+        """Remove a seat, detach its player and shift the following seats down
+
+        Args:
+            seat (int): Index of the seat to remove
+        """
+        player = self.players.pop(seat)
+        detached = TableState(0)
+        detached.add_seat(player)
+        for name in INT_COLUMNS + FLAG_COLUMNS:
+            del getattr(self, name)[seat]
+        del self.hole_cards[2 * seat : 2 * seat + 2]
+        self.num_seats -= 1
+        self._build_templates()
+        for index in range(seat, self.num_seats):
+            self.players[index]._seat = index
+
+    def reset_hand(self):
+        """Reset every seat for a new hand, in place"""
+        self.current_bet[:] = self._zeros
+        self.contributed[:] = self._zeros
+        self.is_active[:] = self._flags_on
+        self.folded[:] = self._flags_off
+        self.spoke[:] = self._flags_off
+        self.revealed[:] = self._flags_off
+        self.is_all_in[:] = self._flags_off
+        self.hole_cards[:] = self._no_cards
+
+    def new_stage(self):
+        """Reset the street bets and spoke flags of every seat, in place"""
+        self.current_bet[:] = self._zeros
+        self.spoke[:] = self._flags_off
+
+    def post_blinds(self, seats: List[int], amounts: List[int]):
+        """Post the blinds of several seats at once
+
+        Args:
+            seats (List[int]): Seats posting a blind
+            amounts (List[int]): Blind amount of each seat, capped by the seat's chips
+        """
+        for seat, amount in zip(seats, amounts):
+            amount = min(amount, self.chips[seat])
+            self.chips[seat] -= amount
+            self.current_bet[seat] += amount
+            self.contributed[seat] += amount
+            if self.chips[seat] == 0:
+                self.is_all_in[seat] = 1
+
+    def set_hole_card(self, seat: int, index: int, card_code: int):
+        """Store the code of a hole card
+
+        Args:
+            seat (int): Seat receiving the card
+            index (int): Index of the hole card (0 or 1)
+            card_code (int): Card code (see `Card.code`)
+        """
+        self.hole_cards[2 * seat + index] = card_code
+
+    def active_seats(self) -> List[int]:
+        """Return the seats that have not folded"""
+        return [seat for seat, folded in enumerate(self.folded) if not folded]
+
+    def to_bytes(self) -> bytes:
+        """Serialize the columns into a single buffer"""
+        header = array("q", [self.num_seats]).tobytes()
+        return header + b"".join(column.tobytes() for column in self._columns())
+
+    def load_bytes(self, buffer: bytes):
+        """Restore the columns from a buffer produced by `to_bytes`
+
+        The table must already have the same number of seats as the serialized one.
+
+        Args:
+            buffer (bytes): Serialized columns
+        """
+        (num_seats,) = array("q", buffer[:8])
+        if num_seats != self.num_seats:
+            raise ValueError(
+                f"Buffer holds {num_seats} seats, table has {self.num_seats}"
+            )
+        offset = 8
+        for column in self._columns():
+            size = len(column) * column.itemsize
+            column[:] = array(column.typecode, buffer[offset : offset + size])
+            offset += size
+
+    def copy(self) -> "TableState":
+        """Return an unbound copy of the columns (players are not copied)"""
+        table = TableState(self.num_seats)
+        table.load_bytes(self.to_bytes())
+        return table
+
+    def __len__(self):
+        return self.num_seats
@@ -0,0 +1,6 @@
+# flake8: noqa
+
+from .league import League, Match, RatingTable, play_match
+from .duplicate import DuplicateEvaluator, RunningStats
+from .coordinator import Coordinator, make_matches, run_local, run_worker
+from .param_server import ParameterServer, ParameterClient
@@ -0,0 +1,451 @@
+import json
+import multiprocessing
+import os
+import selectors
+import socket
+import struct
+import threading
+import time
+from collections import OrderedDict, deque
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Tuple
+from .league import Match, play_match
+
+_LENGTH = struct.Struct("!I")
+
+
+def send_message(sock: socket.socket, message: dict):
+    """Send a message as a length-prefixed compact JSON frame"""
+    data = json.dumps(message, separators=(",", ":")).encode()
+    sock.sendall(_LENGTH.pack(len(data)) + data)
+
+
+def recv_message(sock: socket.socket) -> Optional[dict]:
+    """Receive one frame sent by `send_message`, None if the connection is closed"""
+    header = _recv_exactly(sock, _LENGTH.size)
+    if header is None:
+        return None
+    (size,) = _LENGTH.unpack(header)
+    data = _recv_exactly(sock, size)
+    return None if data is None else json.loads(data)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            return None
+        buffer += chunk
+    return bytes(buffer)
+
+
+class FrameReader:
+    """Splits the bytes received on a non-blocking connection into messages"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[dict]:
+        """Add received bytes and return the messages they complete"""
+        self.buffer += data
+        messages = []
+        while len(self.buffer) >= _LENGTH.size:
+            (size,) = _LENGTH.unpack_from(self.buffer)
+            end = _LENGTH.size + size
+            if len(self.buffer) < end:
+                break
+            messages.append(json.loads(bytes(self.buffer[_LENGTH.size : end])))
+            del self.buffer[:end]
+        return messages
+
+
+def make_matches(
+    strategies: Dict[str, str],
+    seeds: Iterable[int],
+    hands: int,
+    players_per_match: int = 2,
+) -> List[Match]:
+    """Create the matches of every group of entrants in every seat rotation, per seed
+
+    Args:
+        strategies (Dict[str, str]): `AIPlayer` strategy of each entrant, by name
+        seeds (Iterable[int]): Seeds to play, each group playing once per seed and rotation
+        hands (int): Number of hands of each match
+        players_per_match (int, optional): Number of entrants seated in each match
+
+    Returns:
+        List[Match]: Matches, in a deterministic order
+    """
+    matches = []
+    for seed in seeds:
+        for group in combinations(strategies, players_per_match):
+            for shift in range(len(group)):
+                seats = list(group[shift:] + group[:shift])
+                match_id = f"s{seed}:" + "|".join(seats)
+                matches.append(Match(match_id, 0, seats, seed, hands))
+    return matches
+
+
+class _Worker:
+    """Coordinator-side state of a connected worker"""
+
+    def __init__(self, sock: socket.socket, address: Tuple):
+        self.sock = sock
+        self.address = address
+        self.name = f"{address[0]}:{address[1]}"
+        self.reader = FrameReader()
+        # batch id -> whether the worker started it, in assignment order
+        self.assigned: "OrderedDict[int, bool]" = OrderedDict()
+        self.revoking: Optional[int] = None
+        self.last_seen = time.monotonic()
+
+    def unstarted(self) -> List[int]:
+        return [batch for batch, started in self.assigned.items() if not started]
+
+
+class Coordinator:
+    """Hands out batches of matches to TCP workers and collects their results
+
+    Every message is a length-prefixed JSON frame. A worker keeps up to `prefetch`
+    batches: the one it plays and the next ones, which it reports when it starts them.
+    The batches of a worker whose connection breaks or which stops sending heartbeats are
+    re-queued. When the queue is empty and a worker is idle, a batch another worker has
+    not started yet is revoked and handed to the idle worker. Results are reduced to the
+    per-seat sums on the worker side, the coordinator rebuilding the `play_match` result.
+    """
+
+    def __init__(
+        self,
+        matches: List[Match],
+        strategies: Dict[str, str],
+        starting_chips: int = 200,
+        batch_size: int = 8,
+        prefetch: int = 2,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        heartbeat_timeout: float = 10.0,
+    ):
+        """Initialize the coordinator and start listening
+
+        Args:
+            matches (List[Match]): Matches to play
+            strategies (Dict[str, str]): `AIPlayer` strategy of each entrant, by name
+            starting_chips (int, optional): Stack of every player at the start of a hand
+            batch_size (int, optional): Number of matches sent at once
+            prefetch (int, optional): Batches a worker holds, including the one it plays
+            host (str, optional): Interface to listen on
+            port (int, optional): Port to listen on, 0 for any free port
+            heartbeat_timeout (float, optional): Seconds of silence after which a worker
+                is considered dead
+        """
+        self.matches = {match.match_id: match for match in matches}
+        self.strategies = strategies
+        self.starting_chips = starting_chips
+        self.prefetch = max(prefetch, 1)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.batches: Dict[int, List[Match]] = {
+            index: matches[start : start + batch_size]
+            for index, start in enumerate(range(0, len(matches), batch_size))
+        }
+        self.pending: "deque[int]" = deque(self.batches)
+        self.results: Dict[int, List[dict]] = {}
+        self.workers: Dict[socket.socket, _Worker] = {}
+        self.requeued = 0
+        self.stolen = 0
+
+        self.listener = socket.create_server((host, port))
+        self.listener.setblocking(False)
+        self.address: Tuple[str, int] = self.listener.getsockname()[:2]
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+
+    def _accept(self):
+        sock, address = self.listener.accept()
+        sock.setblocking(True)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        worker = _Worker(sock, address)
+        self.workers[sock] = worker
+        self.selector.register(sock, selectors.EVENT_READ)
+        self._send(
+            worker,
+            {
+                "type": "config",
+                "strategies": self.strategies,
+                "starting_chips": self.starting_chips,
+            },
+        )
+
+    def _send(self, worker: _Worker, message: dict):
+        try:
+            send_message(worker.sock, message)
+        except OSError:
+            self._drop(worker)
+
+    def _drop(self, worker: _Worker):
+        """Forget a dead worker and re-queue its batches"""
+        if worker.sock not in self.workers:
+            return
+        del self.workers[worker.sock]
+        self.selector.unregister(worker.sock)
+        worker.sock.close()
+        for batch in reversed(worker.assigned):
+            if batch not in self.results:
+                self.pending.appendleft(batch)
+                self.requeued += 1
+
+    def _receive(self, worker: _Worker):
+        try:
+            data = worker.sock.recv(1 << 16)
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(worker)
+            return
+        worker.last_seen = time.monotonic()
+        for message in worker.reader.feed(data):
+            self._handle(worker, message)
+
+    def _handle(self, worker: _Worker, message: dict):
+        kind = message["type"]
+        if kind == "started":
+            if message["batch"] in worker.assigned:
+                worker.assigned[message["batch"]] = True
+        elif kind == "result":
+            batch = message["batch"]
+            worker.assigned.pop(batch, None)
+            if batch not in self.results:  # a re-queued batch may finish twice
+                self.results[batch] = [
+                    self._expand(*entry) for entry in message["results"]
+                ]
+                if batch in self.pending:
+                    self.pending.remove(batch)
+        elif kind == "revoked":
+            batch = message["batch"]
+            worker.revoking = None
+            if message["ok"] and worker.assigned.pop(batch, None) is not None:
+                self.pending.appendleft(batch)
+                self.stolen += 1
+
+    def _expand(self, match_id: str, total: List[float], total_sq: List[float]) -> dict:
+        match = self.matches[match_id]
+        return {
+            "match_id": match_id,
+            "round": match.round_number,
+            "seats": match.seats,
+            "hands": match.hands,
+            "total": total,
+            "total_sq": total_sq,
+        }
+
+    def _dispatch(self):
+        """Fill the workers' prefetch queues, stealing work for idle workers"""
+        for worker in list(self.workers.values()):
+            while len(worker.assigned) < self.prefetch and self.pending:
+                batch = self.pending.popleft()
+                worker.assigned[batch] = False
+                jobs = [
+                    [m.match_id, m.seats, m.seed, m.hands] for m in self.batches[batch]
+                ]
+                self._send(worker, {"type": "batch", "batch": batch, "jobs": jobs})
+                if worker.sock not in self.workers:
+                    break
+            if worker.assigned or self.pending or worker.sock not in self.workers:
+                continue
+            victims = [
+                w for w in self.workers.values() if w.revoking is None and w.unstarted()
+            ]
+            if victims:
+                victim = max(victims, key=lambda w: len(w.unstarted()))
+                victim.revoking = victim.unstarted()[-1]
+                self._send(victim, {"type": "revoke", "batch": victim.revoking})
+
+    def _check_heartbeats(self):
+        now = time.monotonic()
+        for worker in list(self.workers.values()):
+            if now - worker.last_seen > self.heartbeat_timeout:
+                self._drop(worker)
+
+    def run(self, timeout: Optional[float] = None) -> List[dict]:
+        """Serve workers until every batch has a result
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to run
+
+        Returns:
+            List[dict]: Match results (see `play_match`), in match order
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while len(self.results) < len(self.batches):
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(
+                        f"{len(self.results)}/{len(self.batches)} batches completed"
+                    )
+                for key, _ in self.selector.select(timeout=0.2):
+                    if key.fileobj is self.listener:
+                        self._accept()
+                    elif key.fileobj in self.workers:
+                        self._receive(self.workers[key.fileobj])
+                self._check_heartbeats()
+                self._dispatch()
+        finally:
+            self.close()
+        return [
+            result for batch in sorted(self.results) for result in self.results[batch]
+        ]
+
+    def close(self):
+        """Tell the workers to stop and close every connection"""
+        for worker in list(self.workers.values()):
+            try:
+                send_message(worker.sock, {"type": "shutdown"})
+            except OSError:
+                pass
+            self.selector.unregister(worker.sock)
+            worker.sock.close()
+        self.workers.clear()
+        self.selector.unregister(self.listener)
+        self.listener.close()
+        self.selector.close()
+
+
+def run_worker(
+    host: str,
+    port: int,
+    heartbeat_interval: float = 1.0,
+    fail_after: Optional[int] = None,
+):
+    """Connect to a coordinator and play the batches it sends until it shuts down
+
+    A reader thread queues the incoming batches and answers revocations of the batches not
+    started yet, a heartbeat thread reports the worker alive while it plays.
+
+    Args:
+        host (str): Coordinator address
+        port (int): Coordinator port
+        heartbeat_interval (float, optional): Seconds between heartbeats
+        fail_after (int, optional): Exit abruptly after this many batches, without
+            returning their results (to test failure handling)
+    """
+    sock = socket.create_connection((host, port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    config = recv_message(sock)
+    if config is None:
+        return
+    send_lock = threading.Lock()
+    queue_lock = threading.Condition()
+    queue: "deque[dict]" = deque()
+    stopped = threading.Event()
+
+    def send(message: dict):
+        with send_lock:
+            send_message(sock, message)
+
+    def read():
+        try:
+            while True:
+                message = recv_message(sock)
+                if message is None or message["type"] == "shutdown":
+                    break
+                if message["type"] == "batch":
+                    with queue_lock:
+                        queue.append(message)
+                        queue_lock.notify()
+                elif message["type"] == "revoke":
+                    with queue_lock:
+                        found = next(
+                            (m for m in queue if m["batch"] == message["batch"]), None
+                        )
+                        if found is not None:
+                            queue.remove(found)
+                    send(
+                        {
+                            "type": "revoked",
+                            "batch": message["batch"],
+                            "ok": found is not None,
+                        }
+                    )
+        except OSError:
+            pass
+        stopped.set()
+        with queue_lock:
+            queue_lock.notify()
+
+    def heartbeat():
+        while not stopped.wait(heartbeat_interval):
+            try:
+                send({"type": "heartbeat"})
+            except OSError:
+                break
+
+    threading.Thread(target=read, daemon=True).start()
+    threading.Thread(target=heartbeat, daemon=True).start()
+
+    done = 0
+    try:
+        while True:
+            with queue_lock:
+                while not queue and not stopped.is_set():
+                    queue_lock.wait()
+                if stopped.is_set():
+                    break
+                message = queue.popleft()
+                # reported under the lock so that a revocation cannot race with it
+                send({"type": "started", "batch": message["batch"]})
+            results = []
+            for match_id, seats, seed, hands in message["jobs"]:
+                match = Match(match_id, 0, seats, seed, hands)
+                result = play_match(
+                    match, config["strategies"], config["starting_chips"]
+                )
+                results.append([match_id, result["total"], result["total_sq"]])
+            done += 1
+            if fail_after is not None and done >= fail_after:
+                os._exit(1)
+            send({"type": "result", "batch": message["batch"], "results": results})
+    except OSError:
+        pass
+    finally:
+        stopped.set()
+        sock.close()
+
+
+def run_local(
+    coordinator: Coordinator,
+    workers: int = 4,
+    fail_after: Optional[Dict[int, int]] = None,
+    timeout: Optional[float] = None,
+) -> List[dict]:
+    """Run a coordinator with worker processes on this machine
+
+    Args:
+        coordinator (Coordinator): Coordinator to run
+        workers (int, optional): Number of worker processes
+        fail_after (Dict[int, int], optional): Workers that exit abruptly after a number
+            of batches, by worker index
+        timeout (float, optional): Maximum number of seconds to run
+
+    Returns:
+        List[dict]: Match results, see `Coordinator.run`
+    """
+    host, port = coordinator.address
+    fail_after = fail_after or {}
+    processes = [
+        multiprocessing.Process(
+            target=run_worker,
+            args=(host, port),
+            kwargs={"fail_after": fail_after.get(index)},
+            daemon=True,
+        )
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        return coordinator.run(timeout)
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
@@ -0,0 +1,231 @@
+import math
+from typing import Dict, List, Optional
+from game_structure import (
+    Game,
+    AIPlayer,
+    ActionType,
+    Event,
+    EventType,
+    DealGenerator,
+    PCG32,
+    showdown_equities,
+)
+
+# Number of community cards known during each stage
+BOARD_SIZE = [0, 3, 4, 5]
+# Equity sampling of deal k uses the PCG32 stream EQUITY_STREAM + k of the seed
+EQUITY_STREAM = 1 << 62
+# Adjusted results are kept in integer millionths of a chip, so results cancelling out
+# across rotations sum to exactly zero
+ADJUSTED_SCALE = 10**6
+
+
+class RunningStats:
+    """Mean and variance of a stream of samples (Welford's algorithm)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def standard_error(self) -> float:
+        return math.sqrt(self.variance / self.count) if self.count else 0.0
+
+
+class ShowdownRecorder:
+    """Records what is needed to replace a showdown result by its all-in equity value
+
+    The equity is taken on the board known when the last chips went into the pot, which
+    removes the luck of the cards dealt afterwards.
+    """
+
+    event_types = [EventType.DEAL, EventType.BLIND, EventType.ACTION, EventType.AWARD]
+
+    def __init__(self):
+        self.money_stage = 0
+        self.showdown: Optional[dict] = None
+
+    def __call__(self, event: Event):
+        if event.type == EventType.DEAL:
+            self.money_stage = 0
+            self.showdown = None
+        elif event.type == EventType.ACTION:
+            if event.action in (ActionType.CALL, ActionType.RAISE):
+                self.money_stage = event.stage
+        elif event.type == EventType.AWARD:
+            players = event.game.players
+            active = [p.position for p in players if not p.folded]
+            if len(active) < 2:
+                return
+            contributions = [player.contributed for player in players]
+            board = players[0].hand.community_cards[: BOARD_SIZE[self.money_stage]]
+            self.showdown = {
+                "active": active,
+                "holes": [
+                    [card.code for card in players[p].hand.hole_cards] for p in active
+                ],
+                "board": [card.code for card in board],
+                "contributions": contributions,
+            }
+
+
+class DuplicateEvaluator:
+    """Evaluates strategies on duplicate deals, optionally with equity control variates
+
+    Every deal is played once per seat rotation: the cards and the button stay at the same
+    seats while the entrants rotate through them, so the luck of the cards cancels out
+    between entrants. With `control_variate`, showdown results are replaced by the
+    all-in equity of each player when the last chips went in, which has the same
+    expectation but much less variance. The equity runouts of a deal are drawn from a
+    stream of their own, so a showdown replayed in another rotation gets the very same
+    equities and the duplicate cancellation is kept.
+    """
+
+    def __init__(
+        self,
+        strategies: Dict[str, str],
+        starting_chips: int = 200,
+        seed: int = 0,
+        control_variate: bool = True,
+        equity_samples: int = 200,
+    ):
+        """Initialize the evaluator
+
+        Args:
+            strategies (Dict[str, str]): `AIPlayer` strategy of each entrant, by name
+            starting_chips (int, optional): Stack of every player at the start of a hand
+            seed (int, optional): Seed of the deals
+            control_variate (bool, optional): Whether to apply the all-in equity control
+                variate at showdown
+            equity_samples (int, optional): Runouts sampled for the equity when more than
+                two community cards are missing
+        """
+        self.strategies = strategies
+        self.entrants = list(strategies)
+        self.starting_chips = starting_chips
+        self.seed = seed
+        self.control_variate = control_variate
+        self.equity_samples = equity_samples
+        self.deals_played = 0
+
+        # One game per rotation, all sharing the deals so hand k is dealt identically
+        n = len(self.entrants)
+        deals = DealGenerator(seed)
+        self.games: List[Game] = []
+        self.recorders: List[ShowdownRecorder] = []
+        for rotation in range(n):
+            game = Game(name=f"duplicate-{rotation}", deals=deals)
+            for seat in range(n):
+                name = self.entrants[(seat + rotation) % n]
+                game.add_player(AIPlayer(name, starting_chips, strategies[name]))
+            recorder = ShowdownRecorder()
+            if control_variate:
+                game.events.subscribe(recorder)
+            self.games.append(game)
+            self.recorders.append(recorder)
+
+        self.naive = {name: RunningStats() for name in self.entrants}
+        self.duplicate = {name: RunningStats() for name in self.entrants}
+        self.adjusted = {name: RunningStats() for name in self.entrants}
+
+    def _adjusted_results(
+        self, results: List[int], recorder: ShowdownRecorder
+    ) -> List[int]:
+        """Replace the showdown results of a hand by their equity value
+
+        Returns:
+            List[int]: Result of each seat, in millionths of a chip
+        """
+        showdown = recorder.showdown
+        if showdown is None:
+            return [result * ADJUSTED_SCALE for result in results]
+        rng = PCG32(self.seed, stream=EQUITY_STREAM + self.deals_played)
+        equities = showdown_equities(
+            showdown["holes"], showdown["board"], self.equity_samples, rng
+        )
+        pot = sum(showdown["contributions"]) * ADJUSTED_SCALE
+        shares = [round(equity * pot) for equity in equities]
+        shares[-1] = pot - sum(shares[:-1])
+        adjusted = [-c * ADJUSTED_SCALE for c in showdown["contributions"]]
+        for position, share in zip(showdown["active"], shares):
+            adjusted[position] += share
+        return adjusted
+
+    def play_deal(self):
+        """Play the next deal in every rotation and update the estimators"""
+        n = len(self.entrants)
+        big_blind = self.games[0].parameter["big_blind"]
+        realized = dict.fromkeys(self.entrants, 0)
+        adjusted = dict.fromkeys(self.entrants, 0)
+        for rotation, (game, recorder) in enumerate(zip(self.games, self.recorders)):
+            for player in game.players:
+                player.chips = self.starting_chips
+            results = game.play_hand()
+            if self.control_variate:
+                adjusted_results = self._adjusted_results(results, recorder)
+            else:
+                adjusted_results = [result * ADJUSTED_SCALE for result in results]
+            for seat, player in enumerate(game.players):
+                if rotation == 0:
+                    self.naive[player.name].add(results[seat] / big_blind)
+                realized[player.name] += results[seat]
+                adjusted[player.name] += adjusted_results[seat]
+
+        for name in self.entrants:
+            self.duplicate[name].add(realized[name] / big_blind / n)
+            self.adjusted[name].add(adjusted[name] / ADJUSTED_SCALE / big_blind / n)
+        self.deals_played += 1
+
+    def run(self, deals: int) -> Dict[str, dict]:
+        """Play a number of deals and report the estimates
+
+        Args:
+            deals (int): Number of deals, each played once per seat rotation
+
+        Returns:
+            Dict[str, dict]: For each entrant, the win rate (bb/100) and its standard error
+                for the naive, duplicate and adjusted (control variate) estimators, and
+                the variance reduction of the duplicate and adjusted estimators over the
+                naive one. `best` names the estimator with the smallest measured standard
+                error, the duplicate one on ties, and `hands_saved_factor` compares its
+                variance per hand played, a duplicate deal costing one hand per rotation.
+        """
+        for _ in range(deals):
+            self.play_deal()
+
+        n = len(self.entrants)
+        report = {}
+        for name in self.entrants:
+            naive = self.naive[name]
+            estimators = {"duplicate": self.duplicate[name]}
+            if self.control_variate:
+                estimators["adjusted"] = self.adjusted[name]
+            best = min(estimators, key=lambda key: estimators[key].standard_error)
+            best_variance = estimators[best].variance
+            report[name] = {
+                "deals": self.duplicate[name].count,
+                "naive_bb_per_100": naive.mean * 100,
+                "naive_se": naive.standard_error * 100,
+                "best": best,
+                "hands_saved_factor": (
+                    naive.variance / (best_variance * n) if best_variance else math.inf
+                ),
+            }
+            for key, stats in estimators.items():
+                report[name][f"{key}_bb_per_100"] = stats.mean * 100
+                report[name][f"{key}_se"] = stats.standard_error * 100
+                report[name][f"{key}_variance_reduction"] = (
+                    naive.variance / stats.variance if stats.variance else math.inf
+                )
+        return report
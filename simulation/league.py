@@ -0,0 +1,341 @@
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+from typing import Dict, Iterator, List, Optional, Set
+from game_structure import Game, AIPlayer
+
+ELO_K = 16
+INITIAL_RATING = 1500.0
+
+
+class Match:
+    """A match between entrants seated in a given order, played over a number of hands"""
+
+    def __init__(
+        self,
+        match_id: str,
+        round_number: int,
+        seats: List[str],
+        seed: int,
+        hands: int,
+    ):
+        """Initialize a match
+
+        Args:
+            match_id (str): Unique identifier of the match in the league
+            round_number (int): League round the match belongs to
+            seats (List[str]): Entrant names in seat order
+            seed (int): Seed of the match's game
+            hands (int): Number of hands to play
+        """
+        self.match_id = match_id
+        self.round_number = round_number
+        self.seats = seats
+        self.seed = seed
+        self.hands = hands
+
+
+def play_match(
+    match: Match,
+    strategies: Dict[str, str],
+    starting_chips: int = 200,
+) -> dict:
+    """Play a match, stacks being refilled to `starting_chips` before every hand
+
+    Args:
+        match (Match): Match to play
+        strategies (Dict[str, str]): `AIPlayer` strategy of each entrant
+        starting_chips (int, optional): Stack of every player at the start of each hand
+
+    Returns:
+        dict: Result with, for each seat, the sum and the sum of squares of the per-hand
+            winnings in big blinds
+    """
+    game = Game(name=match.match_id, seed=match.seed)
+    for name in match.seats:
+        game.add_player(AIPlayer(name, starting_chips, strategies[name]))
+    big_blind = game.parameter["big_blind"]
+
+    total = [0.0] * len(match.seats)
+    total_sq = [0.0] * len(match.seats)
+    for _ in range(match.hands):
+        for player in game.players:
+            player.chips = starting_chips
+        for seat, won in enumerate(game.play_hand()):
+            won /= big_blind
+            total[seat] += won
+            total_sq[seat] += won * won
+
+    return {
+        "match_id": match.match_id,
+        "round": match.round_number,
+        "seats": match.seats,
+        "hands": match.hands,
+        "total": total,
+        "total_sq": total_sq,
+    }
+
+
+class RatingTable:
+    """Aggregates match results into Elo ratings and bb/100 win rates incrementally"""
+
+    def __init__(self, entrants: List[str]):
+        self.ratings = {name: INITIAL_RATING for name in entrants}
+        self.hands = dict.fromkeys(entrants, 0)
+        self.total = dict.fromkeys(entrants, 0.0)
+        self.total_sq = dict.fromkeys(entrants, 0.0)
+        self.matches = dict.fromkeys(entrants, 0)
+
+    def add_result(self, result: dict):
+        """Add the result of a match
+
+        Args:
+            result (dict): Result returned by `play_match`
+        """
+        seats = result["seats"]
+        for name, total, total_sq in zip(seats, result["total"], result["total_sq"]):
+            self.hands[name] += result["hands"]
+            self.total[name] += total
+            self.total_sq[name] += total_sq
+            self.matches[name] += 1
+
+        # Every pair of seats is scored as a head-to-head game
+        updates = dict.fromkeys(seats, 0.0)
+        for a, b in combinations(range(len(seats)), 2):
+            name_a, name_b = seats[a], seats[b]
+            diff = result["total"][a] - result["total"][b]
+            score = 1.0 if diff > 0 else 0.0 if diff < 0 else 0.5
+            expected = 1 / (
+                1 + 10 ** ((self.ratings[name_b] - self.ratings[name_a]) / 400)
+            )
+            updates[name_a] += ELO_K * (score - expected)
+            updates[name_b] -= ELO_K * (score - expected)
+        for name, update in updates.items():
+            self.ratings[name] += update
+
+    def win_rate(self, name: str, z: float = 1.96) -> Dict[str, float]:
+        """Return the win rate of an entrant in bb/100 hands with its confidence interval
+
+        Args:
+            name (str): Entrant name
+            z (float, optional): Normal quantile of the interval (1.96 for 95%)
+
+        Returns:
+            Dict[str, float]: "bb_per_100", "ci_low" and "ci_high"
+        """
+        n = self.hands[name]
+        if n == 0:
+            return {"bb_per_100": 0.0, "ci_low": 0.0, "ci_high": 0.0}
+        mean = self.total[name] / n
+        variance = max(self.total_sq[name] / n - mean * mean, 0.0)
+        margin = z * math.sqrt(variance / n) * 100 if n > 1 else math.inf
+        return {
+            "bb_per_100": mean * 100,
+            "ci_low": mean * 100 - margin,
+            "ci_high": mean * 100 + margin,
+        }
+
+    def standings(self) -> List[dict]:
+        """Return the entrants sorted by rating with their statistics"""
+        return [
+            {
+                "name": name,
+                "rating": rating,
+                "hands": self.hands[name],
+                **self.win_rate(name),
+            }
+            for name, rating in sorted(
+                self.ratings.items(), key=lambda item: item[1], reverse=True
+            )
+        ]
+
+
+class League:
+    """Round-robin or Swiss league between `AIPlayer` strategies
+
+    Match results are appended to a JSON lines file as soon as they complete. When the
+    league is run again with the same file, completed matches are read back instead of
+    being played, so an interrupted run resumes where it stopped. The first line of the
+    file records the configuration of the league, and a league refuses to resume from a
+    file written with another configuration.
+    """
+
+    def __init__(
+        self,
+        strategies: Dict[str, str],
+        results_path: str,
+        format: str = "round_robin",
+        players_per_match: int = 2,
+        hands_per_match: int = 1000,
+        rounds: int = 1,
+        starting_chips: int = 200,
+        processes: Optional[int] = None,
+        seed: int = 0,
+    ):
+        """Initialize a league
+
+        Args:
+            strategies (Dict[str, str]): `AIPlayer` strategy of each entrant, by name
+            results_path (str): JSON lines file where match results are streamed
+            format (str, optional): "round_robin" or "swiss"
+            players_per_match (int, optional): Number of entrants seated in each match
+                (Swiss leagues are heads-up)
+            hands_per_match (int, optional): Number of hands of each match
+            rounds (int, optional): Number of rounds. A round-robin round plays every
+                group of entrants once in each seat rotation.
+            starting_chips (int, optional): Stack of every player at the start of a hand
+            processes (int, optional): Size of the process pool, 0 to play in-process,
+                None for one process per CPU
+            seed (int, optional): Base seed, each match derives its own from it
+        """
+        if format not in ("round_robin", "swiss"):
+            raise ValueError(f"Unknown league format: {format}")
+        if format == "swiss" and players_per_match != 2:
+            raise ValueError("Swiss leagues are played heads-up")
+        self.strategies = strategies
+        self.entrants = list(strategies)
+        self.results_path = results_path
+        self.format = format
+        self.players_per_match = players_per_match
+        self.hands_per_match = hands_per_match
+        self.rounds = rounds
+        self.starting_chips = starting_chips
+        self.processes = processes
+        self.seed = seed
+        self.table = RatingTable(self.entrants)
+        self.results: Dict[str, dict] = {}
+
+    def _match(self, round_number: int, seats: List[str]) -> Match:
+        match_id = f"r{round_number}:" + "|".join(seats)
+        seed = (self.seed * 1000003 + hash_text(match_id)) & 0xFFFFFFFFFFFFFFFF
+        return Match(match_id, round_number, seats, seed, self.hands_per_match)
+
+    def _round_robin(self, round_number: int) -> Iterator[Match]:
+        for group in combinations(self.entrants, self.players_per_match):
+            for shift in range(len(group)):
+                yield self._match(round_number, list(group[shift:] + group[:shift]))
+
+    def _swiss(self, round_number: int) -> Iterator[Match]:
+        """Pair entrants of close rating, avoiding rematches when possible"""
+        played: Set[frozenset] = {
+            frozenset(result["seats"])
+            for result in self.results.values()
+            if result["round"] < round_number
+        }
+        unpaired = sorted(
+            self.entrants, key=lambda name: (-self.table.ratings[name], name)
+        )
+        while len(unpaired) > 1:
+            first = unpaired.pop(0)
+            opponent = next(
+                (name for name in unpaired if frozenset((first, name)) not in played),
+                unpaired[0],
+            )
+            unpaired.remove(opponent)
+            yield self._match(round_number, [first, opponent])
+            yield self._match(round_number, [opponent, first])
+
+    def config(self) -> dict:
+        """Return the settings that determine the match results, as in the file header
+
+        The number of rounds is left out so that a finished league can be extended.
+        """
+        return {
+            "format": self.format,
+            "players_per_match": self.players_per_match,
+            "hands_per_match": self.hands_per_match,
+            "starting_chips": self.starting_chips,
+            "seed": self.seed,
+            "strategies": self.strategies,
+        }
+
+    def _load_results(self):
+        """Read the results already streamed to the results file
+
+        Raises:
+            ValueError: If the file was written by a league with another configuration
+        """
+        self.results = {}
+        if not os.path.exists(self.results_path):
+            return
+        valid_size = 0
+        with open(self.results_path, "rb") as f:
+            for index, line in enumerate(f):
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # last line truncated by an interrupted write
+                if index == 0:
+                    if result.get("config") != self.config():
+                        raise ValueError(
+                            f"{self.results_path} holds the results of a league with "
+                            "another configuration"
+                        )
+                else:
+                    self.results[result["match_id"]] = result
+                valid_size += len(line)
+        if valid_size < os.path.getsize(self.results_path):
+            os.truncate(self.results_path, valid_size)
+
+    def _write_result(self, f, result: dict):
+        f.write(json.dumps(result) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+    def _play_round(self, matches: List[Match], f, executor):
+        pending = [m for m in matches if m.match_id not in self.results]
+        if executor is None:
+            completed = (
+                play_match(m, self.strategies, self.starting_chips) for m in pending
+            )
+        else:
+            futures = [
+                executor.submit(play_match, m, self.strategies, self.starting_chips)
+                for m in pending
+            ]
+            completed = (future.result() for future in as_completed(futures))
+        for result in completed:
+            self._write_result(f, result)
+            self.results[result["match_id"]] = result
+
+        # Ratings are updated in a fixed order so that a resumed run pairs identically
+        for match in matches:
+            self.table.add_result(self.results[match.match_id])
+
+    def run(self) -> List[dict]:
+        """Play the league, skipping the matches already in the results file
+
+        Returns:
+            List[dict]: Final standings (see `RatingTable.standings`)
+        """
+        self._load_results()
+        self.table = RatingTable(self.entrants)
+        executor = (
+            ProcessPoolExecutor(max_workers=self.processes)
+            if self.processes != 0
+            else None
+        )
+        try:
+            with open(self.results_path, "a") as f:
+                if f.tell() == 0:
+                    self._write_result(f, {"config": self.config()})
+                for round_number in range(self.rounds):
+                    if self.format == "swiss":
+                        matches = list(self._swiss(round_number))
+                    else:
+                        matches = list(self._round_robin(round_number))
+                    self._play_round(matches, f, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return self.table.standings()
+
+
+def hash_text(text: str) -> int:
+    """Stable 64-bit FNV-1a hash of a string (the builtin `hash` is salted per process)"""
+    value = 0xCBF29CE484222325
+    for byte in text.encode():
+        value = ((value ^ byte) * 0x100000001B3) & 0xFFFFFFFFFFFFFFFF
+    return value
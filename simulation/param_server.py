@@ -0,0 +1,268 @@
+import multiprocessing
+import struct
+import time
+from array import array
+from multiprocessing import shared_memory
+from multiprocessing.synchronize import Lock
+from typing import List, Optional, Sequence, Tuple, Union
+from game_structure import Event, EventType
+
+MAGIC = 0x50415241  # "PARA"
+
+# magic, slot count, slot capacity (float64 values), max readers
+_LAYOUT = struct.Struct("<QQQQ")
+# sequence (odd while the pointer is written), current slot, current version
+_POINTER = struct.Struct("<QQQ")
+_POINTER_OFFSET = _LAYOUT.size
+_PINS_OFFSET = _POINTER_OFFSET + _POINTER.size
+# version (0 while the slot is written), number of values
+_SLOT = struct.Struct("<QQ")
+_PIN = struct.Struct("<q")
+NO_SLOT = -1
+
+
+def _slots_offset(max_readers: int) -> int:
+    return _PINS_OFFSET + max_readers * _PIN.size
+
+
+class _Segment:
+    """Views over the header and the slots of a parameter segment"""
+
+    def __init__(self, shm: shared_memory.SharedMemory):
+        self.shm = shm
+        self.buf = shm.buf
+        magic, self.num_slots, self.capacity, self.max_readers = _LAYOUT.unpack_from(
+            self.buf
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{shm.name} is not a parameter segment")
+        self.slot_size = _SLOT.size + 8 * self.capacity
+        self.slots_offset = _slots_offset(self.max_readers)
+
+    def slot_offset(self, slot: int) -> int:
+        return self.slots_offset + slot * self.slot_size
+
+    def read_pointer(self) -> Tuple[int, int]:
+        """Return the (slot, version) currently published, retrying torn reads"""
+        while True:
+            sequence, slot, version = _POINTER.unpack_from(self.buf, _POINTER_OFFSET)
+            if sequence & 1:
+                continue
+            if _POINTER.unpack_from(self.buf, _POINTER_OFFSET)[0] == sequence:
+                return slot, version
+
+    def slot_header(self, slot: int) -> Tuple[int, int]:
+        return _SLOT.unpack_from(self.buf, self.slot_offset(slot))
+
+    def pins(self) -> List[int]:
+        return [
+            _PIN.unpack_from(self.buf, _PINS_OFFSET + reader * _PIN.size)[0]
+            for reader in range(self.max_readers)
+        ]
+
+    def set_pin(self, reader: int, slot: int):
+        _PIN.pack_into(self.buf, _PINS_OFFSET + reader * _PIN.size, slot)
+
+
+class ParameterServer:
+    """Publishes versions of a policy's weights in shared memory
+
+    The segment holds a small header and `num_slots` slots of `capacity` float64 values.
+    A new version is written into a slot no reader is using, then the published
+    (slot, version) pointer is switched under a sequence lock, so readers always see a
+    complete version. Readers map the slots directly (see `ParameterClient`) and pin the
+    slot they use, which the server never overwrites. Pinning a slot and claiming it for
+    a new version both happen under `lock`, shared with the clients.
+
+    Each reader pins at most one slot and the published slot is never overwritten, so
+    with `max_readers + 2` slots (the default) a free slot always exists. With fewer
+    slots, `publish` may wait for readers to move to the latest version.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        num_slots: Optional[int] = None,
+        max_readers: int = 16,
+        name: Optional[str] = None,
+    ):
+        """Create the shared memory segment
+
+        Args:
+            capacity (int): Maximum number of weights of a version
+            num_slots (int, optional): Number of versions kept at once, at least 2.
+                Defaults to `max_readers + 2`, so that `publish` never waits.
+            max_readers (int, optional): Maximum number of `ParameterClient`
+            name (str, optional): Name of the segment, chosen by the system if None
+        """
+        if num_slots is None:
+            num_slots = max_readers + 2
+        if num_slots < 2:
+            raise ValueError("A parameter server needs at least 2 slots")
+        size = _slots_offset(max_readers) + num_slots * (_SLOT.size + 8 * capacity)
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _LAYOUT.pack_into(self.shm.buf, 0, MAGIC, num_slots, capacity, max_readers)
+        _POINTER.pack_into(self.shm.buf, _POINTER_OFFSET, 0, 0, 0)
+        self.segment = _Segment(self.shm)
+        for reader in range(max_readers):
+            self.segment.set_pin(reader, NO_SLOT)
+        for slot in range(num_slots):
+            _SLOT.pack_into(self.shm.buf, self.segment.slot_offset(slot), 0, 0)
+        self.name = self.shm.name
+        # Python has no memory fence: without a lock, a reader's pin could become
+        # visible after the server scanned the pins, and the reader keep using a slot
+        # being overwritten. The lock orders the pins and the slot claims.
+        self.lock = multiprocessing.Lock()
+        self.version = 0
+        self.sequence = 0
+
+    def _free_slot(self) -> Optional[int]:
+        """Oldest slot that is neither published nor pinned by a reader, if any"""
+        current, _ = self.segment.read_pointer()
+        pinned = set(self.segment.pins())
+        free = [
+            slot
+            for slot in range(self.segment.num_slots)
+            if slot not in pinned and (slot != current or self.version == 0)
+        ]
+        if not free:
+            return None
+        return min(free, key=lambda slot: self.segment.slot_header(slot)[0])
+
+    def _claim_slot(self, timeout: float) -> int:
+        """Mark a free slot as being written and return it
+
+        Under the lock, a reader pins a slot and then checks its version, while the
+        server clears the version and then checks the pins, so they cannot both go ahead
+        on the same slot. When every slot is pinned, waits for a reader to switch to the
+        latest version.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.lock:
+                slot = self._free_slot()
+                if slot is not None:
+                    _SLOT.pack_into(self.shm.buf, self.segment.slot_offset(slot), 0, 0)
+                    return slot
+            if time.monotonic() > deadline:
+                raise TimeoutError("Every slot is used by a reader, add slots")
+            time.sleep(0.0005)
+
+    def publish(
+        self, weights: Union[Sequence[float], memoryview], timeout: float = 10.0
+    ) -> int:
+        """Publish a new version of the weights
+
+        With at least two more slots than readers a slot is always free; otherwise the
+        server may wait for readers to finish the hand they play with an older version.
+        The server is the only writer: `publish` must not be called concurrently.
+
+        Args:
+            weights (Sequence[float] | memoryview): Weights, e.g. an `array("d")` or a
+                float64 memoryview
+            timeout (float, optional): Maximum number of seconds to wait for a free slot
+
+        Returns:
+            int: Version number of the published weights
+        """
+        count = len(weights)
+        if count > self.segment.capacity:
+            raise ValueError(f"{count} weights exceed the capacity of {self.name}")
+        if not isinstance(weights, memoryview):
+            if not (isinstance(weights, array) and weights.typecode == "d"):
+                weights = array("d", weights)
+            weights = memoryview(weights)
+
+        slot = self._claim_slot(timeout)
+        offset = self.segment.slot_offset(slot)
+        buf = self.shm.buf
+        data = buf[offset + _SLOT.size : offset + _SLOT.size + 8 * count].cast("d")
+        data[:] = weights
+        data.release()
+
+        self.version += 1
+        _SLOT.pack_into(buf, offset, self.version, count)
+        self.sequence += 1
+        _POINTER.pack_into(buf, _POINTER_OFFSET, self.sequence, slot, self.version)
+        self.sequence += 1
+        _POINTER.pack_into(buf, _POINTER_OFFSET, self.sequence, slot, self.version)
+        return self.version
+
+    def close(self):
+        """Close and destroy the segment, once every client is closed"""
+        self.shm.close()
+        self.shm.unlink()
+
+
+class ParameterClient:
+    """Reads the weights published by a `ParameterServer` without copying them
+
+    `weights` is a float64 memoryview over the slot of the version in use. The client
+    switches to the latest version only when `refresh` is called, e.g. between hands by
+    subscribing the client to a game's events, so a hand is played with a single version.
+    """
+
+    event_types = [EventType.DEAL]
+
+    def __init__(self, name: str, reader_id: int, lock: Lock):
+        """Attach to a parameter server
+
+        Args:
+            name (str): Name of the server's segment
+            reader_id (int): Index of the client, unique among the server's readers
+            lock (Lock): The server's `lock`. Like any multiprocessing lock, it reaches
+                other processes through inheritance, e.g. as an argument of `Process`
+                or of a pool's initializer.
+        """
+        self.lock = lock
+        self.shm = shared_memory.SharedMemory(name=name)
+        self.segment = _Segment(self.shm)
+        if not 0 <= reader_id < self.segment.max_readers:
+            raise ValueError(f"Reader id must be below {self.segment.max_readers}")
+        self.reader_id = reader_id
+        self.version = 0
+        self.slot = NO_SLOT
+        self.weights: Optional[memoryview] = None
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Switch to the latest published version
+
+        Returns:
+            bool: True if the weights changed
+        """
+        segment = self.segment
+        while True:
+            slot, version = segment.read_pointer()
+            if version == self.version:
+                return False
+            with self.lock:
+                segment.set_pin(self.reader_id, slot)
+                # the slot may have been reused before the pin: check it still holds it
+                slot_version, count = segment.slot_header(slot)
+            if slot_version == version:
+                break
+
+        if self.weights is not None:
+            self.weights.release()
+        offset = segment.slot_offset(slot) + _SLOT.size
+        self.weights = self.shm.buf[offset : offset + 8 * count].cast("d")
+        self.slot = slot
+        self.version = version
+        return True
+
+    def is_valid(self) -> bool:
+        """Whether the weights in use have not been overwritten"""
+        return self.segment.slot_header(self.slot)[0] == self.version
+
+    def __call__(self, event: Event):
+        self.refresh()
+
+    def close(self):
+        """Release the weights and detach from the segment"""
+        if self.weights is not None:
+            self.weights.release()
+            self.weights = None
+        self.segment.set_pin(self.reader_id, NO_SLOT)
+        self.segment.buf = None
+        self.shm.close()
@@ -0,0 +1,16 @@
+# flake8: noqa
+
+from .game_tree import GameTree, GameTreeBuilder
+from .best_response import (
+    BestResponse,
+    exploitability,
+    uniform_policy,
+    player_policy,
+)
+from .preflop_equity import PreflopEquity
+from .icm import (
+    PushFoldSolver,
+    icm_equities,
+    player_equities,
+    push_fold_equilibrium,
+)
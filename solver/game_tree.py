@@ -0,0 +1,388 @@
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+from game_structure import ActionType
+
+if TYPE_CHECKING:
+    from game_structure import Game
+
+# Node types
+PLAYER = 0  # a player acts
+CHANCE = 1  # the betting round is over, the next community cards are dealt
+FOLD = 2  # terminal, every player but one folded
+SHOWDOWN = 3  # terminal, the remaining players reveal their hands
+LEAF = 4  # end of the last street built (depth-limited trees)
+# A SHOWDOWN before the river follows an all-in, the missing cards are dealt at showdown
+
+ACTION_TYPES = list(ActionType)
+FOLD_ACTION = ACTION_TYPES.index(ActionType.FOLD)
+CHECK_ACTION = ACTION_TYPES.index(ActionType.CHECK)
+CALL_ACTION = ACTION_TYPES.index(ActionType.CALL)
+RAISE_ACTION = ACTION_TYPES.index(ActionType.RAISE)
+NO_ACTION = -1
+
+
+class GameTree:
+    """Public betting tree stored in flat arrays
+
+    Node `n` has type `node_type[n]`, player `to_act[n]` (-1 if nobody acts), stage
+    `stage[n]` and pot `pot[n]`. The chips invested by player `p` in the tree are
+    `invested[n * num_players + p]`, the pot also holding `dead_pot` chips from before the
+    root; their street bets and chips behind are stored the same way in `bets` and
+    `stacks`. `folded[n]` is a bitmask of the folded players. The edges leaving `n` are
+    `child_start[n]` to `child_start[n] + child_count[n]` (exclusive) in `edge_child`,
+    `edge_action` (index in ActionType) and `edge_amount` (street bet reached by a raise,
+    chips put in by a call). Identical states reached by different action sequences are
+    merged, so a node can have several parents; `parent[n]` is the first one.
+    """
+
+    def __init__(self, num_players: int):
+        self.num_players = num_players
+        self.dead_pot = 0
+        self.node_type = array("b")
+        self.to_act = array("b")
+        self.stage = array("b")
+        self.pot = array("q")
+        self.invested = array("q")
+        self.bets = array("q")
+        self.stacks = array("q")
+        self.folded = array("l")
+        self.parent = array("l")
+        self.child_start = array("l")
+        self.child_count = array("l")
+        self.edge_child = array("l")
+        self.edge_action = array("b")
+        self.edge_amount = array("q")
+
+    def __len__(self):
+        return len(self.node_type)
+
+    def children(self, node: int) -> range:
+        """Return the edge indices leaving a node"""
+        start = self.child_start[node]
+        return range(start, start + self.child_count[node])
+
+    def is_terminal(self, node: int) -> bool:
+        return self.node_type[node] in (FOLD, SHOWDOWN, LEAF)
+
+    def node_invested(self, node: int) -> List[int]:
+        """Return the chips invested by each player at a node"""
+        start = node * self.num_players
+        return list(self.invested[start : start + self.num_players])
+
+    def node_bets(self, node: int) -> List[int]:
+        """Return the street bet of each player at a node"""
+        start = node * self.num_players
+        return list(self.bets[start : start + self.num_players])
+
+    def node_stacks(self, node: int) -> List[int]:
+        """Return the chips behind of each player at a node"""
+        start = node * self.num_players
+        return list(self.stacks[start : start + self.num_players])
+
+    def nbytes(self) -> int:
+        """Memory used by the arrays"""
+        return sum(
+            len(column) * column.itemsize
+            for column in vars(self).values()
+            if isinstance(column, array)
+        )
+
+
+class GameTreeBuilder:
+    """Enumerates the betting tree implied by the `Game` rules from a given state
+
+    Players may fold when facing a bet, check when there is nothing to call, call, or
+    raise to one of the configured pot fractions or all-in. A raise never exceeds what
+    the biggest opponent stack can match, and chips nobody called are returned when the
+    betting round ends, as `build_pots` does. A betting round ends when every player able
+    to act has spoken and matched the highest bet.
+    """
+
+    def __init__(
+        self,
+        stacks: Sequence[int],
+        pot: int = 0,
+        invested: Optional[Sequence[int]] = None,
+        bets: Optional[Sequence[int]] = None,
+        current_bet: Optional[int] = None,
+        stage: int = 0,
+        to_act: int = 0,
+        folded: Sequence[bool] = (),
+        first_to_act_postflop: int = 0,
+        bet_sizes: Sequence[float] = (0.5, 1.0),
+        max_raises: int = 3,
+        last_stage: int = 3,
+    ):
+        """Initialize the builder
+
+        Args:
+            stacks (Sequence[int]): Chips behind of each player at the root
+            pot (int, optional): Chips already in the pot that are not counted in
+                `invested` (e.g. previous streets of a subgame)
+            invested (Sequence[int], optional): Chips each player put in the pot that
+                are tracked by the tree, defaults to the street bets
+            bets (Sequence[int], optional): Street bet of each player at the root
+            current_bet (int, optional): Bet to call on the root street, defaults to the
+                highest street bet (it is higher when the big blind was short)
+            stage (int, optional): Stage of the root (0=preflop ... 3=river)
+            to_act (int, optional): Player acting at the root
+            folded (Sequence[bool], optional): Players who already folded
+            first_to_act_postflop (int, optional): Player acting first on later streets
+            bet_sizes (Sequence[float], optional): Raise sizes as fractions of the pot
+                after calling, an all-in raise (capped by the biggest opponent stack) is
+                always available
+            max_raises (int, optional): Maximum number of raises per street
+            last_stage (int, optional): Last street built, its end is a LEAF node when it
+                is not the river
+        """
+        n = len(stacks)
+        self.num_players = n
+        self.stacks = tuple(stacks)
+        self.dead_pot = pot
+        self.bets = tuple(bets) if bets is not None else (0,) * n
+        self.invested = tuple(invested) if invested is not None else self.bets
+        self.current_bet = max(self.bets) if current_bet is None else current_bet
+        self.stage = stage
+        self.to_act = to_act
+        self.folded = sum(1 << p for p, f in enumerate(folded) if f)
+        self.first_to_act_postflop = first_to_act_postflop
+        self.bet_sizes = bet_sizes
+        self.max_raises = max_raises
+        self.last_stage = last_stage
+
+    @classmethod
+    def from_game(cls, game: "Game", **kwargs) -> "GameTreeBuilder":
+        """Create a builder rooted at the current state of a game
+
+        Args:
+            game (Game): Game whose betting round is in progress
+            **kwargs: Other arguments of the builder (bet_sizes, max_raises, last_stage)
+        """
+        bets = [p.current_bet for p in game.players]
+        return cls(
+            stacks=[p.chips for p in game.players],
+            pot=game.current_round.pot - sum(bets),
+            bets=bets,
+            current_bet=game.current_round.current_bet,
+            stage=game.current_round.stage,
+            to_act=game.current_round.current_player_index,
+            folded=[p.folded for p in game.players],
+            first_to_act_postflop=game.small_blind_position,
+            **kwargs,
+        )
+
+    def _next_actor(self, player: int, stacks: Tuple, folded: int) -> int:
+        """Next player after `player` who has not folded and still has chips, or -1"""
+        n = self.num_players
+        for step in range(1, n + 1):
+            p = (player + step) % n
+            if not folded >> p & 1 and stacks[p] > 0:
+                return p
+        return -1
+
+    def _max_bet(self, stage: int, bets: Tuple) -> int:
+        """Bet to call on a street"""
+        if stage == self.stage:
+            return max(self.current_bet, *bets)
+        return max(bets)
+
+    def _raise_sizes(
+        self, player: int, bets: Tuple, stacks: Tuple, folded: int, pot: int, stage: int
+    ) -> List[int]:
+        """Street bets a player can raise to"""
+        max_bet = self._max_bet(stage, bets)
+        to_call = max_bet - bets[player]
+        covered = max(
+            bets[p] + stacks[p]
+            for p in range(self.num_players)
+            if p != player and not folded >> p & 1
+        )
+        all_in = min(bets[player] + stacks[player], covered)
+        if all_in <= max_bet:
+            return []
+        sizes = {all_in}
+        for fraction in self.bet_sizes:
+            raise_to = max_bet + max(int(round(fraction * (pot + to_call))), 1)
+            if raise_to < all_in:
+                sizes.add(raise_to)
+        return sorted(sizes)
+
+    def build(self) -> GameTree:
+        """Build the tree breadth-first, merging identical states
+
+        Returns:
+            GameTree: Tree whose node 0 is the root
+        """
+        n = self.num_players
+        tree = GameTree(n)
+        tree.dead_pot = self.dead_pot
+        # state: (node type, to_act, stage, bets, stacks, invested, folded, spoke, raises)
+        table: Dict[Tuple, int] = {}
+        queue: "deque[Tuple[int, Tuple]]" = deque()
+
+        def add_node(state: Tuple, parent: int) -> int:
+            node = table.get(state)
+            if node is not None:
+                return node
+            node = len(tree.node_type)
+            table[state] = node
+            node_type, to_act, stage, bets, stacks, invested, folded, _, _ = state
+            tree.node_type.append(node_type)
+            tree.to_act.append(to_act)
+            tree.stage.append(stage)
+            tree.pot.append(self.dead_pot + sum(invested))
+            tree.invested.extend(invested)
+            tree.bets.extend(bets)
+            tree.stacks.extend(stacks)
+            tree.folded.append(folded)
+            tree.parent.append(parent)
+            tree.child_start.append(0)
+            tree.child_count.append(0)
+            if node_type in (PLAYER, CHANCE):
+                queue.append((node, state))
+            return node
+
+        root = (
+            PLAYER,
+            self.to_act,
+            self.stage,
+            self.bets,
+            self.stacks,
+            self.invested,
+            self.folded,
+            0,
+            0,
+        )
+        add_node(root, -1)
+
+        while queue:
+            node, state = queue.popleft()
+            tree.child_start[node] = len(tree.edge_child)
+            edges = self._edges(state)
+            tree.child_count[node] = len(edges)
+            for action, amount, child_state in edges:
+                tree.edge_child.append(add_node(child_state, node))
+                tree.edge_action.append(action)
+                tree.edge_amount.append(amount)
+        return tree
+
+    def _edges(self, state: Tuple) -> List[Tuple[int, int, Tuple]]:
+        """Return the (action, amount, child state) of the edges leaving a state"""
+        node_type, player, stage, bets, stacks, invested, folded, spoke, raises = state
+        if node_type == CHANCE:
+            child = (PLAYER, -1, stage + 1, (0,) * self.num_players, stacks, invested)
+            child += (folded, 0, 0)
+            return [(NO_ACTION, 0, self._resolve(child))]
+
+        edges = []
+        max_bet = self._max_bet(stage, bets)
+        to_call = max_bet - bets[player]
+        spoke_after = spoke | 1 << player
+
+        if to_call > 0:
+            child = (PLAYER, player, stage, bets, stacks, invested)
+            child += (folded | 1 << player, spoke_after, raises)
+            edges.append((FOLD_ACTION, 0, self._resolve(child)))
+            paid = min(to_call, stacks[player])
+            child = (
+                PLAYER,
+                player,
+                stage,
+                _add(bets, player, paid),
+                _add(stacks, player, -paid),
+                _add(invested, player, paid),
+                folded,
+                spoke_after,
+                raises,
+            )
+            edges.append((CALL_ACTION, paid, self._resolve(child)))
+        else:
+            child = (PLAYER, player, stage, bets, stacks, invested, folded)
+            child += (spoke_after, raises)
+            edges.append((CHECK_ACTION, 0, self._resolve(child)))
+
+        if raises < self.max_raises:
+            pot = self.dead_pot + sum(invested)
+            for raise_to in self._raise_sizes(player, bets, stacks, folded, pot, stage):
+                paid = raise_to - bets[player]
+                child = (
+                    PLAYER,
+                    player,
+                    stage,
+                    _add(bets, player, paid),
+                    _add(stacks, player, -paid),
+                    _add(invested, player, paid),
+                    folded,
+                    1 << player,  # everybody else must speak again
+                    raises + 1,
+                )
+                edges.append((RAISE_ACTION, raise_to, self._resolve(child)))
+        return edges
+
+    def _resolve(self, state: Tuple) -> Tuple:
+        """Turn the state following an action into the state of the next node
+
+        `state[1]` holds the player who just acted (-1 at the start of a street); the
+        returned state holds the player to act, or describes a chance or terminal node.
+        """
+        _, last, stage, bets, stacks, invested, folded, spoke, raises = state
+        n = self.num_players
+        active = [p for p in range(n) if not folded >> p & 1]
+        if len(active) == 1:
+            bets, stacks, invested = self._return_uncalled(bets, stacks, invested)
+            return (FOLD, -1, stage, bets, stacks, invested, folded, 0, 0)
+
+        max_bet = self._max_bet(stage, bets)
+        can_act = [p for p in active if stacks[p] > 0]
+        # a single player left to act who matched the bet has nobody to bet against,
+        # even with the big blind option; on a new street nobody has spoken yet
+        complete = (len(can_act) == 1 and bets[can_act[0]] == max_bet) or all(
+            spoke >> p & 1 and bets[p] == max_bet for p in can_act
+        )
+        if not complete:
+            if last == -1:
+                first = self.first_to_act_postflop
+                to_act = (
+                    first
+                    if first in can_act
+                    else self._next_actor(first, stacks, folded)
+                )
+            else:
+                to_act = self._next_actor(last, stacks, folded)
+            return (
+                PLAYER,
+                to_act,
+                stage,
+                bets,
+                stacks,
+                invested,
+                folded,
+                spoke,
+                raises,
+            )
+
+        bets, stacks, invested = self._return_uncalled(bets, stacks, invested)
+        if stage == 3 or len(can_act) <= 1:
+            return (SHOWDOWN, -1, stage, bets, stacks, invested, folded, 0, 0)
+        if stage >= self.last_stage:
+            return (LEAF, -1, stage, bets, stacks, invested, folded, 0, 0)
+        return (CHANCE, -1, stage, (0,) * n, stacks, invested, folded, 0, 0)
+
+    @staticmethod
+    def _return_uncalled(bets: Tuple, stacks: Tuple, invested: Tuple) -> Tuple:
+        """Give the highest street bet back down to the second highest one"""
+        top = max(range(len(bets)), key=bets.__getitem__)
+        uncalled = bets[top] - max(bet for p, bet in enumerate(bets) if p != top)
+        if uncalled <= 0:
+            return bets, stacks, invested
+        return (
+            _add(bets, top, -uncalled),
+            _add(stacks, top, uncalled),
+            _add(invested, top, -uncalled),
+        )
+
+
+def _add(values: Tuple, index: int, amount: int) -> Tuple:
+    """Return a copy of a tuple with `amount` added at `index`"""
+    return values[:index] + (values[index] + amount,) + values[index + 1 :]
@@ -0,0 +1,376 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from game_structure import Game
+from game_structure.player import Player
+from game_structure.hand_range import CLASS_COMBOS, HAND_CLASSES, NUM_COMBOS
+from .preflop_equity import NUM_CLASSES, PreflopEquity
+
+
+@lru_cache(maxsize=1 << 16)
+def _icm(stacks: Tuple[float, ...], payouts: Tuple[float, ...]) -> Tuple[float, ...]:
+    n = len(stacks)
+    equities = [0.0] * n
+    # probability that the players of each mask took the places awarded so far, the
+    # order among them being irrelevant to what comes next
+    reach = {0: 1.0}
+    for payout in payouts[:n]:
+        following: Dict[int, float] = {}
+        for mask, probability in reach.items():
+            remaining = [i for i in range(n) if not mask >> i & 1]
+            total = sum(stacks[i] for i in remaining)
+            for i in remaining:
+                if total > 0:
+                    if not stacks[i]:
+                        continue
+                    p = probability * stacks[i] / total
+                else:  # only busted players left: they share the places
+                    p = probability / len(remaining)
+                equities[i] += p * payout
+                placed = mask | 1 << i
+                following[placed] = following.get(placed, 0.0) + p
+        reach = following
+    return tuple(equities)
+
+
+def icm_equities(stacks: Sequence[float], payouts: Sequence[float]) -> List[float]:
+    """Prize equity of each player under the Independent Chip Model
+
+    A player takes the next place with probability proportional to their stack among the
+    players not placed yet. Summing over finishing orders is factorial in the number of
+    players, but the chance of the remaining places only depends on the set of players
+    already placed, so the recursion runs over subsets (bitmasks):
+    O(n * sum(C(n, k) for k < places)), at most O(n * 2^n). Results are memoized, as
+    push/fold solving evaluates the same outcomes over and over.
+
+    Args:
+        stacks (Sequence[float]): Chips of each player
+        payouts (Sequence[float]): Prize of each place, first place first
+
+    Returns:
+        List[float]: Expected prize of each player
+    """
+    if any(stack < 0 for stack in stacks):
+        raise ValueError("Stacks cannot be negative")
+    return list(_icm(tuple(stacks), tuple(payouts)))
+
+
+def player_equities(
+    players: Sequence[Player], payouts: Sequence[float]
+) -> Dict[str, float]:
+    """Prize equity of each player from their chips, see `icm_equities`"""
+    equities = icm_equities([player.chips for player in players], payouts)
+    return {player.name: equity for player, equity in zip(players, equities)}
+
+
+class _Chart:
+    """Frequency at which a decision plays each hand class, with the equity of every
+    class against the hands it plays (see `PreflopEquity.versus`)
+
+    The equity sums are linear in the frequencies, so they are updated along with them
+    from those of the best response, which are themselves updated only for the classes
+    whose best action changed since the previous iteration.
+    """
+
+    def __init__(self, equity: PreflopEquity, frequencies: List[float]):
+        self.equity = equity
+        self.frequencies = frequencies
+        self.weights = [0.0] * NUM_CLASSES
+        self.wins = [0.0] * NUM_CLASSES
+        self.combos = [0.0] * NUM_CLASSES
+        self.probability = 0.0
+        self.best = [0] * NUM_CLASSES
+        self.best_wins = [0.0] * NUM_CLASSES
+        self.best_combos = [0.0] * NUM_CLASSES
+
+    def equities(self) -> List[float]:
+        """Equity of every class against the hands played"""
+        return [w / c if c else 0.5 for w, c in zip(self.wins, self.combos)]
+
+    def range_equity(self, other: "_Chart") -> float:
+        """Equity of the hands played against those played by `other`"""
+        weights = [f * p for f, p in zip(self.frequencies, self.weights)]
+        total = sum(w * c for w, c in zip(weights, other.combos))
+        if not total:
+            return 0.5
+        return sum(w * e for w, e in zip(weights, other.wins)) / total
+
+    def update(self, values: Sequence[float], fold_value: float, step: float) -> float:
+        """Move the chart towards its best response
+
+        Args:
+            values (Sequence[float]): Value of playing each class
+            fold_value (float): Value of folding
+            step (float): Share of the best response in the new chart
+
+        Returns:
+            float: Average gain of the best response over the chart
+        """
+        gain = 0.0
+        best = self.best
+        equity = self.equity
+        for hand, (value, frequency) in enumerate(zip(values, self.frequencies)):
+            current = self.weights[hand]
+            if value > fold_value:
+                gain += frequency * (1 - current) * (value - fold_value)
+                play = 1
+            else:
+                gain += frequency * current * (fold_value - value)
+                play = 0
+            if play != best[hand]:
+                best[hand] = play
+                sign = 1 if play else -1
+                self.best_wins = [
+                    w + sign * c
+                    for w, c in zip(self.best_wins, equity.weighted_columns[hand])
+                ]
+                self.best_combos = [
+                    w + sign * c
+                    for w, c in zip(self.best_combos, equity.count_columns[hand])
+                ]
+
+        keep = 1 - step
+        self.weights = [keep * w + step * b for w, b in zip(self.weights, best)]
+        self.wins = [keep * w + step * b for w, b in zip(self.wins, self.best_wins)]
+        self.combos = [
+            keep * c + step * b for c, b in zip(self.combos, self.best_combos)
+        ]
+        self.probability = sum(f * p for f, p in zip(self.frequencies, self.weights))
+        return gain
+
+
+class PushFoldSolver:
+    """Push/fold equilibrium of a preflop all-in game under ICM
+
+    Players act in preflop order (the small and big blinds last). The first player may
+    push all-in or fold; once someone has pushed, the following players call or fold, and
+    only the first caller plays the all-in (a common simplification, as multiway all-ins
+    are rare at these stack depths). If everybody folds to the big blind it wins the
+    blinds and antes.
+
+    Strategies are a probability per hand class: one push chart per position and one
+    call chart per (pusher, caller) pair. They are found by fictitious play: every
+    iteration computes the ICM value of each decision given the current charts,
+    takes the best response of every hand and averages it into the charts. Hand
+    distributions ignore card removal between players except for the all-in equities,
+    which come from `PreflopEquity`. The ICM equities of the possible outcomes do not
+    depend on the charts and are computed once.
+    """
+
+    def __init__(
+        self,
+        stacks: Sequence[int],
+        payouts: Sequence[float],
+        small_blind: int,
+        big_blind: int,
+        ante: int = 0,
+        equity: Union[PreflopEquity, str, None] = None,
+    ):
+        """Initialize the solver
+
+        Args:
+            stacks (Sequence[int]): Chips of each player before posting, in preflop order
+                of action: first to act first, small blind and big blind last
+            payouts (Sequence[float]): Prize of each place, first place first
+            small_blind (int): Small blind
+            big_blind (int): Big blind
+            ante (int, optional): Ante posted by every player
+            equity (PreflopEquity | str, optional): All-in equities, or the file they
+                are cached in (see `PreflopEquity.cached`). The user's cache directory is
+                used if None.
+        """
+        if len(stacks) < 2:
+            raise ValueError("Push/fold needs at least 2 players")
+        if any(stack <= 0 for stack in stacks):
+            raise ValueError("Every player needs chips")
+        self.stacks = list(stacks)
+        self.payouts = list(payouts)
+        self.num_players = n = len(stacks)
+        if not isinstance(equity, PreflopEquity):
+            equity = PreflopEquity.cached(equity)
+        self.equity = equity
+        self.posted = [min(ante, stack) for stack in stacks]
+        for position, blind in ((n - 2, small_blind), (n - 1, big_blind)):
+            self.posted[position] = min(self.posted[position] + blind, stacks[position])
+
+        frequencies = [len(combos) / NUM_COMBOS for combos in CLASS_COMBOS]
+        self.push = [_Chart(self.equity, frequencies) for _ in range(n - 1)]
+        self.call: Dict[Tuple[int, int], _Chart] = {
+            (pusher, caller): _Chart(self.equity, frequencies)
+            for pusher in range(n - 1)
+            for caller in range(pusher + 1, n)
+        }
+        # ICM equities when a player takes the blinds, and when (pusher, caller) go
+        # all-in and the pusher wins or loses
+        self.steals = [self._outcome(player) for player in range(n)]
+        self.showdowns = {
+            key: (self._outcome(*key), self._outcome(key[1], key[0]))
+            for key in self.call
+        }
+        self.iterations = 0
+        self.gain = float("inf")
+
+    @classmethod
+    def from_game(
+        cls,
+        game: Game,
+        payouts: Sequence[float],
+        ante: int = 0,
+        equity: Union[PreflopEquity, str, None] = None,
+    ) -> "PushFoldSolver":
+        """Solver for the players of a game, with its current blind positions
+
+        Position `i` of the solver is the player `i` seats left of the big blind, so the
+        big blind is the last one.
+        """
+        n = len(game.players)
+        order = [(game.big_blind_position + 1 + i) % n for i in range(n)]
+        return cls(
+            [game.players[seat].chips for seat in order],
+            payouts,
+            game.parameter["small_blind"],
+            game.parameter["big_blind"],
+            ante,
+            equity,
+        )
+
+    def _outcome(self, winner: int, loser: Optional[int] = None) -> List[float]:
+        """ICM equities after `winner` takes the pot, all-in against `loser` if any"""
+        stacks = [stack - posted for stack, posted in zip(self.stacks, self.posted)]
+        pot = sum(self.posted)
+        if loser is not None:
+            for player in (winner, loser):
+                pot -= self.posted[player]
+            risked = min(self.stacks[winner], self.stacks[loser])
+            stacks[winner] = self.stacks[winner] - risked
+            stacks[loser] = self.stacks[loser] - risked
+            pot += 2 * risked
+        stacks[winner] += pot
+        return icm_equities(stacks, self.payouts)
+
+    def _iterate(self) -> float:
+        """Run one fictitious play iteration
+
+        Returns:
+            float: Largest gain, in prize, of a best response at one decision, averaged
+                over the hand classes
+        """
+        n = self.num_players
+        step = 2.0 / (self.iterations + 3)
+        self.iterations += 1
+        versus_call = {key: chart.equities() for key, chart in self.call.items()}
+        versus_push = [chart.equities() for chart in self.push]
+
+        # expected equities of every player once the action reaches each point
+        after_push: Dict[Tuple[int, int], List[float]] = {}
+        for pusher in range(n - 1):
+            value = self.steals[pusher]
+            after_push[(pusher, n)] = value
+            for caller in range(n - 1, pusher, -1):
+                key = (pusher, caller)
+                won, lost = self.showdowns[key]
+                chart = self.call[key]
+                equity = self.push[pusher].range_equity(chart)
+                probability = chart.probability
+                value = [
+                    probability * (equity * w + (1 - equity) * l)
+                    + (1 - probability) * v
+                    for w, l, v in zip(won, lost, value)
+                ]
+                after_push[key] = value
+        folded_to: List[List[float]] = [[] for _ in range(n)]
+        folded_to[n - 1] = self.steals[n - 1]
+        for pusher in range(n - 2, -1, -1):
+            probability = self.push[pusher].probability
+            folded_to[pusher] = [
+                probability * p + (1 - probability) * f
+                for p, f in zip(after_push[(pusher, pusher + 1)], folded_to[pusher + 1])
+            ]
+
+        gain = 0.0
+        for pusher in range(n - 1):
+            push_values = [0.0] * NUM_CLASSES
+            reach = 1.0
+            for caller in range(pusher + 1, n):
+                key = (pusher, caller)
+                probability = reach * self.call[key].probability
+                if probability:
+                    won = probability * self.showdowns[key][0][pusher]
+                    lost = probability * self.showdowns[key][1][pusher]
+                    push_values = [
+                        v + e * won + (1 - e) * lost
+                        for v, e in zip(push_values, versus_call[key])
+                    ]
+                reach *= 1 - self.call[key].probability
+            steal = reach * self.steals[pusher][pusher]
+            push_values = [value + steal for value in push_values]
+            fold_value = folded_to[pusher + 1][pusher]
+            gain = max(gain, self.push[pusher].update(push_values, fold_value, step))
+
+            for caller in range(pusher + 1, n):
+                key = (pusher, caller)
+                lost, won = self.showdowns[key]
+                won, lost = won[caller], lost[caller]
+                call_values = [e * won + (1 - e) * lost for e in versus_push[pusher]]
+                fold_value = after_push[(pusher, caller + 1)][caller]
+                gain = max(gain, self.call[key].update(call_values, fold_value, step))
+        return gain
+
+    def solve(self, iterations: int = 1000, tolerance: float = 1e-5) -> int:
+        """Iterate until no decision gains more than `tolerance` of the prize pool on
+        average by deviating, or the iteration limit is reached
+
+        Args:
+            iterations (int, optional): Maximum number of iterations
+            tolerance (float, optional): Largest average gain allowed, as a share of the
+                prize pool
+
+        Returns:
+            int: Number of iterations run
+        """
+        threshold = tolerance * sum(self.payouts)
+        for iteration in range(iterations):
+            self.gain = self._iterate()
+            if self.gain < threshold:
+                return iteration + 1
+        return iterations
+
+    def push_chart(self, position: int) -> List[float]:
+        """Probability of pushing each class of `HAND_CLASSES` when folded to
+        `position`"""
+        return list(self.push[position].weights)
+
+    def call_chart(self, pusher: int, caller: int) -> List[float]:
+        """Probability of calling with each class of `HAND_CLASSES` at `caller` facing a
+        push from `pusher`"""
+        return list(self.call[(pusher, caller)].weights)
+
+    @staticmethod
+    def _chart_range(chart: _Chart, threshold: float) -> str:
+        return ", ".join(
+            name for name, p in zip(HAND_CLASSES, chart.weights) if p >= threshold
+        )
+
+    def push_range(self, position: int, threshold: float = 0.5) -> str:
+        """Classes pushed at least `threshold` of the time when folded to `position`"""
+        return self._chart_range(self.push[position], threshold)
+
+    def call_range(self, pusher: int, caller: int, threshold: float = 0.5) -> str:
+        """Classes `caller` calls with at least `threshold` of the time facing a push
+        from `pusher`"""
+        return self._chart_range(self.call[(pusher, caller)], threshold)
+
+
+def push_fold_equilibrium(
+    stacks: Sequence[int],
+    payouts: Sequence[float],
+    small_blind: int,
+    big_blind: int,
+    ante: int = 0,
+    iterations: int = 1000,
+    tolerance: float = 1e-5,
+    equity: Union[PreflopEquity, str, None] = None,
+) -> PushFoldSolver:
+    """Solve the push/fold game of a table, see `PushFoldSolver`"""
+    solver = PushFoldSolver(stacks, payouts, small_blind, big_blind, ante, equity)
+    solver.solve(iterations, tolerance)
+    return solver
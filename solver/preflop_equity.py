@@ -0,0 +1,218 @@
+import os
+import struct
+from array import array
+from functools import lru_cache
+from operator import mul
+from typing import List, Optional, Sequence, Tuple
+from game_structure.evaluator import evaluate_codes
+from game_structure.hand_range import CLASS_COMBOS, COMBOS, HAND_CLASSES
+from game_structure.rng import PCG32
+
+NUM_CLASSES = len(HAND_CLASSES)  # 169
+MAGIC = b"PFEQ"
+VERSION = 1
+# magic, version, number of sampled deals
+_HEADER = struct.Struct("<4sHI")
+
+
+@lru_cache(maxsize=1)
+def compatible_counts() -> array:
+    """Number of combos of each class that share no card with a combo of another class
+
+    By suit symmetry the count is the same for every combo of the first class.
+
+    Returns:
+        array: Counts indexed by `hero * 169 + villain`
+    """
+    masks = [1 << a | 1 << b for a, b in COMBOS]
+    counts = array("d", bytes(8 * NUM_CLASSES * NUM_CLASSES))
+    for hero, combos in enumerate(CLASS_COMBOS):
+        mask = masks[combos[0]]
+        for villain, villain_combos in enumerate(CLASS_COMBOS):
+            counts[hero * NUM_CLASSES + villain] = sum(
+                1 for i in villain_combos if not mask & masks[i]
+            )
+    return counts
+
+
+class PreflopEquity:
+    """Heads-up all-in equity of every preflop hand class against every other one
+
+    Equities are estimated by Monte Carlo: each sampled deal draws a board, one combo of
+    every class compatible with it, and compares the 169 hands pairwise, skipping the
+    pairs sharing a card. A deal thus costs 169 evaluations for 14196 matchups. Drawing
+    the board first favors the boards blocking a class, so each matchup is weighted by
+    the number of combos both classes had left. The table is saved to a file once
+    computed, see `cached`.
+    """
+
+    def __init__(self, equities: Sequence[float], samples: int):
+        """Initialize the table
+
+        Args:
+            equities (Sequence[float]): Equity of the first class against the second one,
+                indexed by `hero * 169 + villain`
+            samples (int): Number of deals the equities were estimated from
+        """
+        if len(equities) != NUM_CLASSES * NUM_CLASSES:
+            raise ValueError(f"An equity table has {NUM_CLASSES ** 2} entries")
+        self.equities = array("d", equities)
+        self.samples = samples
+        # one row per hero class, to average over villain ranges with card removal,
+        # and one column per villain class, to update those averages class by class
+        counts = compatible_counts().tolist()
+        weighted = [e * c for e, c in zip(self.equities, counts)]
+        self.counts = [
+            counts[i : i + NUM_CLASSES] for i in range(0, len(counts), NUM_CLASSES)
+        ]
+        self.weighted = [
+            weighted[i : i + NUM_CLASSES] for i in range(0, len(weighted), NUM_CLASSES)
+        ]
+        self.count_columns = [list(column) for column in zip(*self.counts)]
+        self.weighted_columns = [list(column) for column in zip(*self.weighted)]
+
+    @classmethod
+    def compute(cls, samples: int = 2000, seed: int = 0) -> "PreflopEquity":
+        """Estimate the table from sampled deals
+
+        Args:
+            samples (int, optional): Number of sampled deals
+            seed (int, optional): Seed of the sampling stream
+
+        Returns:
+            PreflopEquity: Estimated table
+        """
+        rng = PCG32(seed)
+        masks = [1 << a | 1 << b for a, b in COMBOS]
+        size = NUM_CLASSES * NUM_CLASSES
+        points = [0] * size  # 2 per win, 1 per tie
+        matchups = [0] * size
+        deck = list(range(52))
+        values = [0] * NUM_CLASSES
+        hand_masks = [0] * NUM_CLASSES
+        live_counts = [0] * NUM_CLASSES
+        for _ in range(samples):
+            for i in range(5):
+                j = i + rng.randbelow(52 - i)
+                deck[i], deck[j] = deck[j], deck[i]
+            board = tuple(deck[:5])
+            board_mask = 0
+            for card in board:
+                board_mask |= 1 << card
+            for c, combos in enumerate(CLASS_COMBOS):
+                live = [i for i in combos if not masks[i] & board_mask]
+                live_counts[c] = len(live)
+                if not live:  # e.g. a pair whose rank shows three times on board
+                    hand_masks[c] = -1  # blocks every matchup of the deal
+                    continue
+                combo = live[rng.randbelow(len(live))]
+                hand_masks[c] = masks[combo]
+                values[c] = evaluate_codes(COMBOS[combo] + board)
+
+            for hero in range(NUM_CLASSES):
+                hero_value = values[hero]
+                hero_mask = hand_masks[hero]
+                hero_live = live_counts[hero]
+                row = hero * NUM_CLASSES
+                for villain in range(hero + 1, NUM_CLASSES):
+                    if hero_mask & hand_masks[villain]:
+                        continue
+                    weight = hero_live * live_counts[villain]
+                    matchups[row + villain] += weight
+                    villain_value = values[villain]
+                    if hero_value > villain_value:
+                        points[row + villain] += 2 * weight
+                    elif hero_value == villain_value:
+                        points[row + villain] += weight
+
+        equities = array("d", [0.5] * size)
+        for hero in range(NUM_CLASSES):
+            for villain in range(hero + 1, NUM_CLASSES):
+                index = hero * NUM_CLASSES + villain
+                if matchups[index]:
+                    equity = points[index] / (2 * matchups[index])
+                    equities[index] = equity
+                    equities[villain * NUM_CLASSES + hero] = 1.0 - equity
+        return cls(equities, samples)
+
+    def save(self, path: str):
+        """Atomically write the table to a file
+
+        The table is written to a temporary file which then replaces `path`, so an
+        interrupted write never leaves a truncated table behind.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, self.samples))
+            f.write(self.equities.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "PreflopEquity":
+        """Read a table written by `save`, raising ValueError if it is invalid"""
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) != _HEADER.size + 8 * NUM_CLASSES * NUM_CLASSES:
+            raise ValueError(f"{path} is not a complete preflop equity table")
+        magic, version, samples = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a preflop equity table")
+        if version != VERSION:
+            raise ValueError(f"Unsupported preflop equity table version {version}")
+        equities = array("d")
+        equities.frombytes(data[_HEADER.size :])
+        return cls(equities, samples)
+
+    @classmethod
+    def cached(
+        cls, path: Optional[str] = None, samples: int = 2000, seed: int = 0
+    ) -> "PreflopEquity":
+        """Load the table from a file, computing and saving it if the file is missing
+        or invalid
+
+        Computing the default table takes about 10 seconds.
+
+        Args:
+            path (str, optional): File of the table, in the user's cache directory by
+                default
+            samples (int, optional): Number of sampled deals if the table is computed
+            seed (int, optional): Seed of the sampling stream if the table is computed
+
+        Returns:
+            PreflopEquity: Loaded or computed table
+        """
+        if path is None:
+            directory = os.path.join(os.path.expanduser("~"), ".cache", "poker")
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"preflop_equity_{samples}_{seed}.bin")
+        if os.path.exists(path):
+            try:
+                return cls.load(path)
+            except ValueError:
+                pass  # overwritten below
+        table = cls.compute(samples, seed)
+        table.save(path)
+        return table
+
+    def equity(self, hero: str, villain: str) -> float:
+        """Equity of a hand class against another one, e.g. ("AKo", "QQ")"""
+        index = HAND_CLASSES.index(hero) * NUM_CLASSES + HAND_CLASSES.index(villain)
+        return self.equities[index]
+
+    def versus(self, weights: Sequence[float]) -> Tuple[List[float], List[float]]:
+        """Equity of every class against a range of classes, taking card removal into
+        account
+
+        Args:
+            weights (Sequence[float]): Frequency at which the range holds each class
+
+        Returns:
+            Tuple[List[float], List[float]]: For each class, the equity summed over the
+                compatible villain combos, and the number of those combos. Their ratio
+                is the equity against the range.
+        """
+        wins = [sum(map(mul, row, weights)) for row in self.weighted]
+        combos = [sum(map(mul, row, weights)) for row in self.counts]
+        return wins, combos
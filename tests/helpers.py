@@ -0,0 +1,32 @@
+import random
+from game_structure import Action, ActionType, AIPlayer, Game
+
+
+def make_game(seed, stacks, names=None, big_blind=2):
+    """Game with an `AIPlayer` per stack"""
+    game = Game(seed=seed)
+    game.parameter = {"small_blind": big_blind // 2, "big_blind": big_blind}
+    for index, chips in enumerate(stacks):
+        name = names[index] if names else f"p{index}"
+        game.add_player(AIPlayer(name, chips))
+    return game
+
+
+def random_action(game: Game, rng: random.Random) -> Action:
+    """Legal action drawn at random for the player to act"""
+    player = game.players[game.current_round.current_player_index]
+    current_bet = game.current_round.current_bet
+    to_call = current_bet - player.current_bet
+    draw = rng.random()
+    if draw < 0.3 and player.chips > to_call:
+        top = player.chips + player.current_bet
+        return Action(ActionType.RAISE, rng.randint(current_bet + 1, top))
+    if draw < 0.45 and to_call > 0:
+        return Action(ActionType.FOLD)
+    return Action(ActionType.CALL if to_call > 0 else ActionType.CHECK)
+
+
+def step(game: Game, rng: random.Random):
+    """Play one random action of the hand in progress"""
+    player = game.players[game.current_round.current_player_index]
+    assert game.handle_action(player, random_action(game, rng))
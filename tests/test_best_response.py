@@ -0,0 +1,122 @@
+import random
+from itertools import combinations
+import pytest
+from game_structure import Range, evaluate_codes
+from game_structure.hand_range import COMBOS
+from solver import BestResponse, GameTreeBuilder
+from solver.game_tree import CHANCE, FOLD, SHOWDOWN
+
+# Ah Kd 7c 4s, then 2h on the river
+TURN = (12, 24, 31, 41)
+RIVER = TURN + (0,)
+HERO = Range.from_string("AA, KK, JTs, 76s")
+VILLAIN = Range.from_string("QQ, T9s, A4o")
+
+
+def random_policy(tree, seed, per_combo=False):
+    """Fixed random policy, optionally with a different mix for every holding"""
+    rng = random.Random(seed)
+    table = {}
+
+    def mix(count):
+        weights = [rng.random() for _ in range(count)]
+        return [w / sum(weights) for w in weights]
+
+    def policy(node, board):
+        if node not in table:
+            count = tree.child_count[node]
+            if per_combo:
+                mixes = [mix(count) for _ in COMBOS]
+                table[node] = [[m[k] for m in mixes] for k in range(count)]
+            else:
+                table[node] = mix(count)
+        return table[node]
+
+    return policy
+
+
+def brute_force_value(tree, board, ranges, policy, player):
+    """Best-response value computed holding by holding, dealing every card"""
+
+    def result(hero, villain, cards):
+        a = evaluate_codes(list(COMBOS[hero]) + cards)
+        b = evaluate_codes(list(COMBOS[villain]) + cards)
+        return 1.0 if a > b else 0.5 if a == b else 0.0
+
+    def walk(node, hero, villains, board):
+        node_type = tree.node_type[node]
+        pot = tree.pot[node]
+        invested = tree.invested[2 * node + player]
+        if node_type == FOLD:
+            won = pot if not tree.folded[node] >> player & 1 else 0
+            return (won - invested) * sum(villains.values())
+        deck = [c for c in range(52) if c not in board and c not in COMBOS[hero]]
+        if node_type == SHOWDOWN:
+            total = 0.0
+            for villain, weight in villains.items():
+                cards = [c for c in deck if c not in COMBOS[villain]]
+                runouts = list(combinations(cards, 5 - len(board)))
+                won = sum(result(hero, villain, list(board + r)) for r in runouts)
+                total += weight * (pot * won / len(runouts) - invested)
+            return total
+        children = [tree.edge_child[e] for e in tree.children(node)]
+        if node_type == CHANCE:
+            total = 0.0
+            for card in deck:
+                dealt = {v: w for v, w in villains.items() if card not in COMBOS[v]}
+                total += walk(children[0], hero, dealt, board + (card,))
+            return total / (len(deck) - 2)
+        if tree.to_act[node] == player:
+            return max(walk(child, hero, villains, board) for child in children)
+        total = 0.0
+        for child, probability in zip(children, policy(node, board)):
+            if isinstance(probability, float):
+                reach = {v: w * probability for v, w in villains.items()}
+            else:
+                reach = {v: w * probability[v] for v, w in villains.items()}
+            total += walk(child, hero, reach, board)
+        return total
+
+    own = ranges[player].remove_dead(board).weights
+    opponent = ranges[1 - player].remove_dead(board).weights
+    total = pairs = 0.0
+    for hero, weight in enumerate(own):
+        if not weight:
+            continue
+        villains = {
+            v: w
+            for v, w in enumerate(opponent)
+            if w and not set(COMBOS[v]) & set(COMBOS[hero])
+        }
+        total += weight * walk(0, hero, villains, tuple(board))
+        pairs += weight * sum(villains.values())
+    return total / pairs + tree.invested[player]
+
+
+@pytest.mark.parametrize("per_combo", [False, True])
+def test_river_values_match_brute_force(per_combo):
+    tree = GameTreeBuilder(
+        [40, 60], pot=10, stage=3, bet_sizes=(0.5, 1.0), max_raises=2
+    ).build()
+    policy = random_policy(tree, 1, per_combo)
+    ranges = [HERO, VILLAIN]
+    calculator = BestResponse(tree, RIVER, ranges)
+    for player in (0, 1):
+        expected = brute_force_value(tree, RIVER, ranges, policy, player)
+        assert calculator.value(policy, player) == pytest.approx(expected, rel=1e-9)
+
+
+def test_turn_all_in_is_scored_over_the_river_cards():
+    # the all-in call ends the betting on the turn: the river must still be dealt
+    tree = GameTreeBuilder(
+        [10, 10], pot=20, stage=2, bet_sizes=(), max_raises=1
+    ).build()
+    assert any(
+        tree.node_type[n] == SHOWDOWN and tree.stage[n] == 2 for n in range(len(tree))
+    )
+    policy = random_policy(tree, 2)
+    ranges = [HERO, VILLAIN]
+    calculator = BestResponse(tree, TURN, ranges)
+    for player in (0, 1):
+        expected = brute_force_value(tree, TURN, ranges, policy, player)
+        assert calculator.value(policy, player) == pytest.approx(expected, rel=1e-9)
@@ -0,0 +1,98 @@
+from game_structure import AIPlayer, BlindSchedule, Game, HistoryWriter, Session
+from game_structure.checkpoint import (
+    dumps,
+    dumps_session,
+    load_checkpoint,
+    load_session,
+    loads,
+    save_checkpoint,
+    save_session,
+)
+
+
+def make_game(seed):
+    game = Game(name="checkpoint", seed=seed)
+    for name in "abc":
+        game.add_player(AIPlayer(name, 100))
+    game.events.subscribe(HistoryWriter(game.game_state))
+    return game
+
+
+def finish(game, hands=5):
+    while not game.game_over:
+        player = game.players[game.current_round.current_player_index]
+        game.handle_action(player, player.get_action(game.current_round))
+    results = [game.play_hand() for _ in range(hands)]
+    return results, [player.chips for player in game.players], game.game_state.historic
+
+
+def test_round_trip_mid_hand_replays_identically(tmp_path):
+    game = make_game(9)
+    for _ in range(3):
+        game.play_hand()
+    game.start_new_hand()
+    for _ in range(4):
+        player = game.players[game.current_round.current_player_index]
+        game.handle_action(player, player.get_action(game.current_round))
+
+    path = str(tmp_path / "game.ckpt")
+    save_checkpoint(game, path)
+    restored = load_checkpoint(path)
+    assert dumps(restored) == dumps(game)
+    restored.events.subscribe(HistoryWriter(restored.game_state))
+    assert finish(restored) == finish(game)
+
+
+def test_corrupted_snapshot_is_rejected():
+    snapshot = bytearray(dumps(make_game(1)))
+    snapshot[10] ^= 0xFF
+    try:
+        loads(bytes(snapshot))
+    except ValueError:
+        return
+    raise AssertionError("corruption not detected")
+
+
+def make_session(seed):
+    game = Game(name="session", seed=seed)
+    for name, chips in zip("abcd", (30, 60, 90, 120)):
+        game.add_player(AIPlayer(name, chips))
+    schedule = BlindSchedule([(1, 2), (2, 4), (5, 10)], hands_per_level=6)
+    return Session(game, schedule, rebuy_chips=40, max_rebuys=1, freeze_gc=False)
+
+
+def session_state(session):
+    return (
+        session.hands_played,
+        session.rebuys,
+        session.eliminated,
+        session.standings(),
+        [player.chips for player in session.game.players],
+        session.game.parameter["big_blind"],
+    )
+
+
+def test_session_round_trip_mid_level_plays_identically(tmp_path):
+    session = make_session(4)
+    session.play(9)  # in the middle of the second level
+    path = str(tmp_path / "session.ckpt")
+    save_session(session, path)
+    restored = load_session(path)
+    assert session_state(restored) == session_state(session)
+    assert dumps_session(restored) == dumps_session(session)
+
+    session.play(40)
+    restored.play(40)
+    assert session_state(restored) == session_state(session)
+
+
+def test_negative_and_large_seeds_round_trip():
+    for seed in (-1, -(2**40), 2**64 + 7, 2**80):
+        game = make_game(seed)
+        assert game.seed == seed % 2**64
+        game.play_hand()
+        restored = loads(dumps(game))
+        assert restored.seed == game.seed
+        restored.events.subscribe(HistoryWriter(restored.game_state))
+        assert finish(restored) == finish(game)
+    assert make_game(-1).seed == make_game(2**64 - 1).seed
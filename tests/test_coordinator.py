@@ -0,0 +1,12 @@
+from simulation import Coordinator, make_matches, play_match, run_local
+
+STRATEGIES = {"a": "allways_call", "b": "allways_call", "c": "allways_call"}
+
+
+def test_distributed_results_equal_sequential_play():
+    matches = make_matches(STRATEGIES, range(4), hands=5)
+    coordinator = Coordinator(matches, STRATEGIES, batch_size=2, prefetch=2)
+    results = run_local(coordinator, workers=2, fail_after={0: 1}, timeout=120)
+    expected = {match.match_id: play_match(match, STRATEGIES) for match in matches}
+    assert len(results) == len(matches)
+    assert {result["match_id"]: result for result in results} == expected
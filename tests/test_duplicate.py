@@ -0,0 +1,20 @@
+from simulation import DuplicateEvaluator
+
+
+def test_identical_strategies_cancel_exactly():
+    strategies = {"a": "allways_call", "b": "allways_call", "c": "allways_call"}
+    report = DuplicateEvaluator(strategies, seed=3, equity_samples=50).run(40)
+    for name in strategies:
+        assert report[name]["duplicate_se"] == 0.0
+        assert report[name]["adjusted_se"] == 0.0
+        assert report[name]["adjusted_bb_per_100"] == 0.0
+        assert report[name]["best"] == "duplicate"
+
+
+def test_without_control_variate_reports_duplicate_only():
+    strategies = {"a": "allways_call", "b": "allways_call"}
+    evaluator = DuplicateEvaluator(strategies, seed=1, control_variate=False)
+    report = evaluator.run(10)
+    assert "adjusted_se" not in report["a"]
+    assert report["a"]["best"] == "duplicate"
+    assert report["a"]["deals"] == 10
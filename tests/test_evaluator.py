@@ -0,0 +1,64 @@
+import random
+from itertools import combinations
+from game_structure.evaluator import CATEGORY_FACTOR, evaluate_codes
+
+
+def reference_key(codes):
+    """Rank a five-card hand the textbook way: (category, ranks to compare)"""
+    ranks = sorted((code % 13 + 2 for code in codes), reverse=True)
+    flush = len({code // 13 for code in codes}) == 1
+    distinct = sorted(set(ranks), reverse=True)
+    straight_high = 0
+    if len(distinct) == 5:
+        if distinct[0] - distinct[4] == 4:
+            straight_high = distinct[0]
+        elif distinct == [14, 5, 4, 3, 2]:
+            straight_high = 5
+    groups = sorted(((ranks.count(r), r) for r in distinct), reverse=True)
+    shape = [count for count, _ in groups]
+    by_group = [rank for _, rank in groups]
+    if straight_high and flush:
+        return 8, [straight_high]
+    if shape == [4, 1]:
+        return 7, by_group
+    if shape == [3, 2]:
+        return 6, by_group
+    if flush:
+        return 5, ranks
+    if straight_high:
+        return 4, [straight_high]
+    if shape == [3, 1, 1]:
+        return 3, by_group
+    if shape == [2, 2, 1]:
+        return 2, by_group
+    if shape == [2, 1, 1, 1]:
+        return 1, by_group
+    return 0, ranks
+
+
+def test_five_card_order_matches_reference():
+    rng = random.Random(0)
+    hands = [rng.sample(range(52), 5) for _ in range(3000)]
+    for a, b in zip(hands, hands[1:]):
+        value_a, value_b = evaluate_codes(a), evaluate_codes(b)
+        key_a, key_b = reference_key(a), reference_key(b)
+        assert value_a // CATEGORY_FACTOR == key_a[0]
+        assert (value_a > value_b) == (key_a > key_b)
+        assert (value_a == value_b) == (key_a == key_b)
+
+
+def test_seven_cards_is_best_five_card_subset():
+    rng = random.Random(1)
+    for _ in range(500):
+        cards = rng.sample(range(52), 7)
+        best = max(evaluate_codes(five) for five in combinations(cards, 5))
+        assert evaluate_codes(cards) == best
+
+
+def test_wheel_and_steel_wheel():
+    ace, two, three, four, five = 12, 0, 1, 2, 3  # hearts, code = rank - 2
+    wheel = [ace, two + 13, three, four, five]
+    assert reference_key(wheel) == (4, [5])
+    assert evaluate_codes(wheel) // CATEGORY_FACTOR == 4
+    steel_wheel = [ace, two, three, four, five]
+    assert evaluate_codes(steel_wheel) // CATEGORY_FACTOR == 8
@@ -0,0 +1,138 @@
+import game_structure.game
+from game_structure import Action, ActionType, EventType, HistoryWriter
+from tests.helpers import make_game
+
+RAISE, CALL, CHECK, FOLD = (
+    ActionType.RAISE,
+    ActionType.CALL,
+    ActionType.CHECK,
+    ActionType.FOLD,
+)
+# (stage, action, raise-to amount): the opener raises, the small blind calls and the big
+# blind folds; two checks on the flop, a bet and a call on the turn, two river checks
+SCRIPT = [
+    (0, RAISE, 6),
+    (0, CALL, None),
+    (0, FOLD, None),
+    (1, CHECK, None),
+    (1, CHECK, None),
+    (2, RAISE, 10),
+    (2, CALL, None),
+    (3, CHECK, None),
+    (3, CHECK, None),
+]
+
+
+def play_script(game):
+    game.start_new_hand()
+    actors = []
+    for stage, action_type, amount in SCRIPT:
+        assert game.current_round.stage == stage
+        player = game.players[game.current_round.current_player_index]
+        actors.append(player.position)
+        assert game.handle_action(player, Action(action_type, amount))
+    assert game.game_over
+    return actors
+
+
+def test_event_order_and_payloads():
+    game = make_game(5, [100, 100, 100])
+    events = []
+    game.events.subscribe(events.append)
+    actors = play_script(game)
+    sb, bb = game.small_blind_position, game.big_blind_position
+
+    types = [event.type for event in events]
+    reveals = types.count(EventType.REVEAL)
+    assert types == (
+        [EventType.BLIND, EventType.BLIND, EventType.DEAL]
+        + [EventType.ACTION] * 3
+        + [EventType.STREET]
+        + [EventType.ACTION] * 2
+        + [EventType.STREET]
+        + [EventType.ACTION] * 2
+        + [EventType.STREET]
+        + [EventType.ACTION] * 2
+        + [EventType.REVEAL] * reveals
+        + [EventType.AWARD]
+    )
+    assert reveals in (1, 2)
+    assert all(event.hand_number == 1 for event in events)
+
+    blinds = [(event.position, event.amount) for event in events[:2]]
+    assert blinds == [(sb, 1), (bb, 2)]
+
+    actions = [event for event in events if event.type == EventType.ACTION]
+    assert [(event.stage, event.action) for event in actions] == [
+        (stage, action) for stage, action, _ in SCRIPT
+    ]
+    assert [event.position for event in actions] == actors
+    # raises carry the street bet reached, the other actions the chips put in
+    assert [event.amount for event in actions] == [6, 5, 0, 0, 0, 10, 10, 0, 0]
+
+    streets = [event for event in events if event.type == EventType.STREET]
+    assert [event.stage for event in streets] == [1, 2, 3]
+    assert [len(event.cards) for event in streets] == [3, 1, 1]
+    board = game.players[0].hand.community_cards
+    assert [card for event in streets for card in event.cards] == list(board)
+
+    for event in events:
+        if event.type == EventType.REVEAL:
+            player = game.players[event.position]
+            assert not player.folded and player.revealed
+            assert event.value == player.hand.evaluate()
+
+    award = events[-1]
+    assert award.amount == 6 + 6 + 2 + 10 + 10
+    assert sum(share * len(winners) for share, winners in award.pots) <= award.amount
+    assert award.winners == sorted({p for _, winners in award.pots for p in winners})
+    assert bb not in award.winners
+
+
+def test_history_writer_lines():
+    game = make_game(5, [100, 100, 100], names=["ann", "bob", "cid"])
+    game.events.subscribe(HistoryWriter(game.game_state))
+    awards = []
+    game.events.subscribe(awards.append, [EventType.AWARD])
+    actors = play_script(game)
+    names = [game.players[position].name for position in actors]
+
+    lines = game.game_state.historic.splitlines()
+    assert lines[:9] == [
+        f"{names[0]} raises to 6",
+        f"{names[1]} calls 5",
+        f"{names[2]} folds",
+        f"{names[3]} checks",
+        f"{names[4]} checks",
+        f"{names[5]} raises to 10",
+        f"{names[6]} calls 10",
+        f"{names[7]} checks",
+        f"{names[8]} checks",
+    ]
+    reveals = lines[9:-1]
+    assert reveals and all(" reveals " in line for line in reveals)
+    ((share, winners),) = awards[0].pots
+    assert lines[-1] == ", ".join(game.players[p].name for p in winners) + (
+        f" win {share} chips"
+    )
+
+
+def test_unobserved_events_are_not_built(monkeypatch):
+    built = []
+
+    class CountingEvent(game_structure.game.Event):
+        __slots__ = ()
+
+        def __init__(self, type, *args, **kwargs):
+            built.append(type)
+            super().__init__(type, *args, **kwargs)
+
+    monkeypatch.setattr(game_structure.game, "Event", CountingEvent)
+    game = make_game(5, [100, 100, 100])
+    play_script(game)
+    assert built == []
+
+    # a subscriber only pays for the types it listens to
+    game.events.subscribe(lambda event: None, [EventType.STREET])
+    play_script(game)
+    assert built == [EventType.STREET] * 3
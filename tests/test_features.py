@@ -0,0 +1,94 @@
+import random
+from game_structure.features import (
+    ACTION,
+    HAND,
+    STREET,
+    Feature,
+    FeaturePipeline,
+    position_label,
+)
+from tests.helpers import make_game, step
+
+
+def test_position_labels_match_the_game_state():
+    for num_players in range(2, 10):
+        game = make_game(num_players, [100] * num_players)
+        for _ in range(num_players):
+            game.play_hand()
+            game._update_game_state()
+            for player in game.players:
+                name = game.game_state.get_position_name(player.position)
+                expected = "UTG+" if name.startswith("UTG+") else name
+                assert position_label(game, player.position) == expected
+
+
+def counting_pipeline():
+    """Pipeline with one feature per dependency counting its computations"""
+    calls = {HAND: 0, STREET: 0, ACTION: 0}
+
+    def counter(depends_on):
+        def compute(game, player):
+            calls[depends_on] += 1
+            return [float(calls[depends_on])]
+
+        return Feature(depends_on, 1, depends_on, compute)
+
+    return FeaturePipeline([counter(name) for name in (HAND, STREET, ACTION)]), calls
+
+
+def test_features_are_recomputed_when_their_key_changes():
+    pipeline, calls = counting_pipeline()
+    game = make_game(7, [200] * 3)
+    rng = random.Random(0)
+    seen = {HAND: set(), STREET: set(), ACTION: set()}
+    for _ in range(5):
+        for player in game.players:
+            player.chips = 200
+        game.start_new_hand()
+        while not game.game_over:
+            player = game.players[game.current_round.current_player_index]
+            # extracting twice in a row computes nothing the second time
+            first = pipeline.extract(game, player)
+            assert pipeline.extract(game, player) == first
+            hand, street = game.hand_number, game.current_round.stage
+            seen[HAND].add((player.position, hand))
+            seen[STREET].add((player.position, hand, street))
+            seen[ACTION].add((player.position, hand, street, len(game.action_history)))
+            step(game, rng)
+    assert calls == {name: len(keys) for name, keys in seen.items()}
+    assert calls[HAND] < calls[STREET] < calls[ACTION]
+
+
+def test_cached_vectors_match_fresh_extractions():
+    pipeline = FeaturePipeline()
+    game = make_game(8, [200] * 4)
+    rng = random.Random(1)
+    for _ in range(3):
+        for player in game.players:
+            player.chips = 200
+        game.start_new_hand()
+        while not game.game_over:
+            for player in game.players:
+                if player.hand.hole_cards:
+                    fresh = FeaturePipeline().extract(game, player)
+                    assert pipeline.extract(game, player) == fresh
+            step(game, rng)
+
+
+def test_batch_rows_match_single_extractions():
+    games = [make_game(seed, [150] * 3) for seed in (9, 10)]
+    rng = random.Random(2)
+    for game in games:
+        game.start_new_hand()
+        for _ in range(3):
+            if not game.game_over:
+                step(game, rng)
+    seats = [(game, player) for game in games for player in game.players]
+
+    pipeline = FeaturePipeline()
+    batch = pipeline.extract_batch(seats)
+    assert len(batch) == pipeline.size * len(seats)
+    for index, (game, player) in enumerate(seats):
+        row = batch[index * pipeline.size : (index + 1) * pipeline.size]
+        assert row == FeaturePipeline().extract(game, player)
+        assert row == pipeline.extract(game, player)
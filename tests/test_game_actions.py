@@ -0,0 +1,60 @@
+from game_structure import Action, ActionType, EventType
+from tests.helpers import make_game
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event):
+        self.events.append(event)
+
+
+def test_raise_amount_is_the_street_bet_raised_to():
+    game = make_game(3, [100, 100, 100])
+    recorder = Recorder()
+    game.events.subscribe(recorder, [EventType.ACTION])
+    game.start_new_hand()
+
+    opener = game.players[game.current_round.current_player_index]
+    assert game.handle_action(opener, Action(ActionType.RAISE, 6))
+    assert (opener.chips, opener.current_bet) == (94, 6)
+    assert (game.current_round.current_bet, game.current_round.pot) == (6, 9)
+
+    small_blind = game.players[game.small_blind_position]
+    assert game.players[game.current_round.current_player_index] is small_blind
+    assert game.handle_action(small_blind, Action(ActionType.RAISE, 20))
+    assert (small_blind.chips, small_blind.current_bet) == (80, 20)
+    assert (game.current_round.current_bet, game.current_round.pot) == (20, 28)
+    assert [event.amount for event in recorder.events] == [6, 20]
+
+
+def test_award_amount_covers_every_side_pot():
+    stacks = [20, 50, 100]
+    for seed in range(8):
+        game = make_game(seed, stacks)
+        recorder = Recorder()
+        game.events.subscribe(recorder, [EventType.AWARD])
+        game.start_new_hand()
+        while not game.game_over:
+            player = game.players[game.current_round.current_player_index]
+            if player.chips + player.current_bet > game.current_round.current_bet:
+                action = Action(ActionType.RAISE, -1)
+            else:
+                action = Action(ActionType.CALL)
+            assert game.handle_action(player, action)
+
+        (award,) = recorder.events
+        # the 50 chips nobody matched went back to the biggest stack before the pots
+        short, big = stacks.index(20), stacks.index(100)
+        contributed = list(game.table.contributed)
+        assert contributed == [20, 50, 50]
+        assert award.amount == 120
+        assert sum(player.chips for player in game.players) == sum(stacks)
+
+        # main pot of 60 for everyone, side pot of 60 without the shortest stack
+        main, side = award.pots
+        assert main[0] * len(main[1]) == 60
+        assert side[0] * len(side[1]) == 60 and short not in side[1]
+        assert award.winners == sorted(set(main[1] + side[1]))
+        assert (game.players[big].chips == 50) == (big not in award.winners)
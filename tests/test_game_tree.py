@@ -0,0 +1,158 @@
+import random
+from game_structure import Action, ActionType
+from solver import GameTreeBuilder
+from solver.game_tree import (
+    ACTION_TYPES,
+    CHANCE,
+    FOLD,
+    PLAYER,
+    SHOWDOWN,
+)
+from tests.helpers import make_game
+
+
+def test_uncalled_chips_are_returned():
+    tree = GameTreeBuilder(
+        [10, 50], pot=20, stage=3, bet_sizes=(), max_raises=1, to_act=1
+    ).build()
+    raises = [
+        tree.edge_amount[edge]
+        for edge in range(len(tree.edge_child))
+        if ACTION_TYPES[tree.edge_action[edge]] == ActionType.RAISE
+    ]
+    assert max(raises) == 10  # the big stack cannot bet more than the short one has
+    for node in range(len(tree)):
+        if tree.node_type[node] == SHOWDOWN:
+            invested = tree.node_invested(node)
+            assert invested[0] == invested[1]
+            assert tree.pot[node] == 20 + sum(invested)
+
+    # a raise covered by a player who then folds, called all-in by a shorter stack
+    tree = GameTreeBuilder([10, 50, 50], bet_sizes=(), max_raises=2).build()
+    for node in range(len(tree)):
+        if tree.node_type[node] in (CHANCE, SHOWDOWN, FOLD):
+            invested = sorted(tree.node_invested(node))
+            assert invested[-1] == invested[-2]
+
+
+def test_transpositions_are_merged():
+    tree = GameTreeBuilder([100, 100], pot=10, stage=1, bet_sizes=(0.5,)).build()
+
+    def follow(node, *actions):
+        for action in actions:
+            (edge,) = [
+                edge
+                for edge in tree.children(node)
+                if ACTION_TYPES[tree.edge_action[edge]] == action
+            ][:1]
+            node = tree.edge_child[edge]
+        return node
+
+    bet_call = follow(0, ActionType.RAISE, ActionType.CALL)
+    check_bet_call = follow(0, ActionType.CHECK, ActionType.RAISE, ActionType.CALL)
+    assert tree.node_type[bet_call] == CHANCE
+    assert bet_call == check_bet_call
+    # the second path reaches the node after it was created by the first one
+    assert tree.parent[bet_call] == follow(0, ActionType.RAISE)
+
+    table = {}
+    for node in range(len(tree)):
+        key = (
+            tree.node_type[node],
+            tree.to_act[node],
+            tree.stage[node],
+            tuple(tree.node_bets(node)),
+            tuple(tree.node_stacks(node)),
+            tuple(tree.node_invested(node)),
+            tree.folded[node],
+        )
+        # nodes only differ by who already spoke or how many raises were made
+        table.setdefault(key, []).append(node)
+    assert all(len(nodes) == 1 for key, nodes in table.items() if key[0] != PLAYER)
+
+
+def test_flat_arrays():
+    tree = GameTreeBuilder([40, 60, 80], bets=[1, 2, 0], to_act=2).build()
+    n = tree.num_players
+    nodes = len(tree)
+    for column in (tree.invested, tree.bets, tree.stacks):
+        assert len(column) == nodes * n
+    for column in (tree.to_act, tree.stage, tree.pot, tree.folded, tree.parent):
+        assert len(column) == nodes
+    edges = len(tree.edge_child)
+    assert len(tree.edge_action) == len(tree.edge_amount) == edges
+
+    start = 0
+    for node in range(nodes):
+        assert tree.pot[node] == tree.dead_pot + sum(tree.node_invested(node))
+        assert sum(tree.node_invested(node)) + sum(tree.node_stacks(node)) == 183
+        if tree.is_terminal(node):
+            assert tree.child_count[node] == 0
+            continue
+        # edges are stored node after node, in the order the nodes were created
+        assert tree.child_start[node] == start
+        start += tree.child_count[node]
+        for edge in tree.children(node):
+            child = tree.edge_child[edge]
+            assert child > 0 and tree.parent[child] <= node
+    assert start == edges
+    assert tree.parent[0] == -1
+    assert all(tree.parent[node] < node for node in range(1, nodes))
+    assert tree.nbytes() == sum(
+        len(column) * column.itemsize
+        for column in (
+            tree.node_type,
+            tree.to_act,
+            tree.stage,
+            tree.pot,
+            tree.invested,
+            tree.bets,
+            tree.stacks,
+            tree.folded,
+            tree.parent,
+            tree.child_start,
+            tree.child_count,
+            tree.edge_child,
+            tree.edge_action,
+            tree.edge_amount,
+        )
+    )
+
+
+def test_from_game_follows_the_game_rules():
+    """Random walks down the tree, played in the game they were built from"""
+    rng = random.Random(0)
+    walks = 0
+    for seed in range(60):
+        stacks = [rng.choice([1, 3, 8, 20, 60]) for _ in range(rng.randint(2, 4))]
+        game = make_game(seed, stacks)
+        game.start_new_hand()
+        if game.game_over:
+            continue
+        tree = GameTreeBuilder.from_game(game, bet_sizes=(0.5, 1.0)).build()
+        for _ in range(5):
+            game = make_game(seed, stacks)
+            game.start_new_hand()
+            node = 0
+            while not tree.is_terminal(node):
+                if tree.node_type[node] == CHANCE:
+                    (edge,) = tree.children(node)
+                    node = tree.edge_child[edge]
+                    continue
+                assert not game.game_over
+                assert game.current_round.current_player_index == tree.to_act[node]
+                assert game.current_round.stage == tree.stage[node]
+                assert [p.current_bet for p in game.players] == tree.node_bets(node)
+                assert [p.chips for p in game.players] == tree.node_stacks(node)
+                edge = rng.choice(tree.children(node))
+                action_type = ACTION_TYPES[tree.edge_action[edge]]
+                if action_type == ActionType.RAISE:
+                    action = Action(action_type, tree.edge_amount[edge])
+                else:
+                    action = Action(action_type)
+                player = game.players[tree.to_act[node]]
+                assert game.handle_action(player, action)
+                node = tree.edge_child[edge]
+            assert game.game_over
+            walks += 1
+    assert walks > 100
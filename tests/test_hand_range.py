@@ -0,0 +1,40 @@
+from game_structure import Card, Range, range_equity
+from game_structure.evaluator import evaluate_codes
+from game_structure.hand_range import CLASS_COMBOS, HAND_CLASSES, NUM_COMBOS
+
+
+def enumerated_equity(hero, villain, board):
+    deck = [code for code in range(52) if code not in board]
+    numerator = denominator = 0.0
+    for river in deck:
+        cards = board + [river]
+        for hero_combo, hero_weight in hero.combos():
+            if set(hero_combo) & set(cards):
+                continue
+            hero_value = evaluate_codes(list(hero_combo) + cards)
+            for villain_combo, villain_weight in villain.combos():
+                if set(villain_combo) & (set(cards) | set(hero_combo)):
+                    continue
+                villain_value = evaluate_codes(list(villain_combo) + cards)
+                weight = hero_weight * villain_weight
+                denominator += weight
+                if hero_value > villain_value:
+                    numerator += weight
+                elif hero_value == villain_value:
+                    numerator += weight / 2
+    return numerator / denominator
+
+
+def test_range_equity_matches_enumeration():
+    hero = Range.from_string("AKs, QQ+, A5s-A3s, KQo:0.5")
+    villain = Range.from_string("TT+, AJs+, KQs, AhKd")
+    board = [Card(12, 0).code, Card(7, 1).code, Card(2, 2).code, Card(9, 3).code]
+    equity, _ = range_equity(hero, villain, board)
+    assert abs(equity - enumerated_equity(hero, villain, board)) < 1e-12
+
+
+def test_hand_classes_cover_every_combo_once():
+    assert len(HAND_CLASSES) == 169
+    combos = [i for class_combos in CLASS_COMBOS for i in class_combos]
+    assert sorted(combos) == list(range(NUM_COMBOS))
+    assert len(Range.from_string(", ".join(HAND_CLASSES))) == NUM_COMBOS
@@ -0,0 +1,117 @@
+from itertools import combinations
+from game_structure import HandStrengthCalculator, showdown_equities
+from game_structure.evaluator import evaluate_codes
+from game_structure.hand_strength import canonical_key
+from game_structure.rng import PCG32
+
+
+def codes(cards):
+    """Card codes of a string like "Ah Td" (suits h, d, c, s)"""
+    return [
+        "hdcs".index(card[1]) * 13 + "23456789TJQKA".index(card[0])
+        for card in cards.split()
+    ]
+
+
+def brute_force(hole, board):
+    """HS over the opponent holdings and PPot/NPot over the (holding, river) pairs"""
+    deck = [code for code in range(52) if code not in hole + board]
+    # counts[state now][state at the river], states being ahead, tied, behind
+    counts = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
+    now = [0, 0, 0]
+    for opponent in combinations(deck, 2):
+        ours = evaluate_codes(hole + board)
+        theirs = evaluate_codes(list(opponent) + board)
+        state = 0 if ours > theirs else 1 if ours == theirs else 2
+        now[state] += 1
+        for river in deck:
+            if river in opponent:
+                continue
+            ours = evaluate_codes(hole + board + [river])
+            theirs = evaluate_codes(list(opponent) + board + [river])
+            counts[state][0 if ours > theirs else 1 if ours == theirs else 2] += 1
+    hs = (now[0] + now[1] / 2) / sum(now)
+    ahead, tied, behind = (sum(row) for row in counts)
+    ppot = (counts[2][0] + counts[2][1] / 2 + counts[1][0] / 2) / (behind + tied / 2)
+    npot = (counts[0][2] + counts[1][2] / 2 + counts[0][1] / 2) / (ahead + tied / 2)
+    return hs, ppot, npot
+
+
+def test_strength_and_potential_match_brute_force():
+    hole, board = codes("Ah 5h"), codes("Kh 9h 5c 2s")  # flush draw with a pair
+    result = HandStrengthCalculator().evaluate(hole, board)
+    hs, ppot, npot = brute_force(hole, board)
+    assert abs(result.hs - hs) < 1e-12
+    assert abs(result.ppot - ppot) < 1e-12
+    assert abs(result.npot - npot) < 1e-12
+    assert abs(result.ehs - (hs * (1 - npot) + (1 - hs) * ppot)) < 1e-12
+
+
+def test_river_strength_is_the_equity_against_a_random_holding():
+    hole, board = codes("Qs Jd"), codes("Qh 8c 7c 3d 2h")
+    deck = [code for code in range(52) if code not in hole + board]
+    equities = [
+        showdown_equities([hole, list(opponent)], board)[0]
+        for opponent in combinations(deck, 2)
+    ]
+    result = HandStrengthCalculator().evaluate(hole, board)
+    assert abs(result.hs - sum(equities) / len(equities)) < 1e-12
+    assert (result.ppot, result.npot, result.ehs) == (0.0, 0.0, result.hs)
+
+
+def test_suit_isomorphic_hands_share_a_cache_entry():
+    calculator = HandStrengthCalculator()
+    first = calculator.evaluate(codes("Ah Kh"), codes("Qh 7h 2c 9d 3s"))
+    # hearts and spades swapped, cards in another order
+    second = calculator.evaluate(codes("Ks As"), codes("3h 9d 2c 7s Qs"))
+    assert second is first
+    assert (calculator.hits, calculator.misses) == (1, 1)
+
+    # a flush draw is not a rainbow board
+    assert canonical_key(codes("Ah Kh"), codes("Qh 7h 2c")) != canonical_key(
+        codes("Ah Kh"), codes("Qd 7h 2c")
+    )
+    calculator.evaluate(codes("Ah Kh"), codes("Qh 7c 2c 9d 3s"))
+    assert (calculator.hits, calculator.misses) == (1, 2)
+
+
+def test_least_recently_used_entry_is_evicted():
+    calculator = HandStrengthCalculator(cache_size=2)
+    board = codes("Qh 7c 2c 9d 3s")
+    a, b, c = codes("Ah Kh"), codes("As Ad"), codes("8s 8d")
+    calculator.evaluate(a, board)
+    calculator.evaluate(b, board)
+    calculator.evaluate(a, board)  # b is now the least recently used
+    calculator.evaluate(c, board)
+    assert list(calculator.cache) == [canonical_key(a, board), canonical_key(c, board)]
+    calculator.evaluate(b, board)
+    assert (calculator.hits, calculator.misses) == (1, 4)
+    assert canonical_key(a, board) not in calculator.cache
+
+    calculator.clear()
+    assert not calculator.cache and calculator.hits == calculator.misses == 0
+
+
+def test_showdown_equities():
+    # the board plays: a split pot
+    assert showdown_equities(
+        [codes("2c 3d"), codes("4c 5d")], codes("Ah Kh Qh Jh Th")
+    ) == [0.5, 0.5]
+
+    # turn: counted over the 44 rivers
+    holes, board = [codes("As Ad"), codes("Kh Qh")], codes("Jh Th 2c 3d")
+    deck = [code for code in range(52) if code not in sum(holes, board)]
+    wins = sum(
+        evaluate_codes(holes[1] + board + [river])
+        > evaluate_codes(holes[0] + board + [river])
+        for river in deck
+    )
+    equities = showdown_equities(holes, board)
+    assert abs(equities[1] - wins / 44) < 1e-12
+    assert abs(sum(equities) - 1) < 1e-12
+
+    # preflop: sampled runouts, aces are about 82% against kings
+    equities = showdown_equities(
+        [codes("As Ad"), codes("Ks Kd")], [], samples=4000, rng=PCG32(3)
+    )
+    assert 0.78 < equities[0] < 0.86 and abs(sum(equities) - 1) < 1e-12
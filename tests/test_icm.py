@@ -0,0 +1,62 @@
+from itertools import permutations
+import pytest
+from solver import PreflopEquity, PushFoldSolver, icm_equities
+
+
+def brute_force_icm(stacks, payouts):
+    equities = [0.0] * len(stacks)
+    for order in permutations(range(len(stacks))):
+        probability, remaining = 1.0, sum(stacks)
+        for player in order:
+            probability *= stacks[player] / remaining
+            remaining -= stacks[player]
+        for place, player in enumerate(order[: len(payouts)]):
+            equities[player] += probability * payouts[place]
+    return equities
+
+
+@pytest.fixture(scope="module")
+def equity():
+    return PreflopEquity.compute(samples=800, seed=0)
+
+
+def test_icm_matches_brute_force():
+    stacks, payouts = [50, 30, 20, 10, 40, 7], [50, 30, 20]
+    for a, b in zip(icm_equities(stacks, payouts), brute_force_icm(stacks, payouts)):
+        assert a == pytest.approx(b, abs=1e-9)
+
+
+def test_preflop_equity_known_matchups(equity):
+    assert equity.equity("AA", "KK") == pytest.approx(0.82, abs=0.03)
+    assert equity.equity("KK", "AA") == pytest.approx(1 - equity.equity("AA", "KK"))
+    assert equity.equity("22", "AKo") == pytest.approx(0.52, abs=0.03)
+
+
+def test_heads_up_nash_at_10_big_blinds(equity):
+    solver = PushFoldSolver([200, 200], [1], 10, 20, equity=equity)
+    solver.solve()
+    # published heads-up equilibrium: ~58% push, ~37% call
+    assert 0.55 <= solver.push[0].probability <= 0.61
+    assert 0.34 <= solver.call[(0, 1)].probability <= 0.41
+    assert "AA" in solver.push_range(0) and "72o" not in solver.call_range(0, 1)
+
+
+def test_equity_table_round_trip_and_recovery(tmp_path):
+    path = str(tmp_path / "equity.bin")
+    table = PreflopEquity.cached(path, samples=5)
+    assert not (tmp_path / "equity.bin.tmp").exists()
+    assert PreflopEquity.load(path).equities == table.equities
+
+    with open(path, "r+b") as f:  # an interrupted write
+        f.truncate(100)
+    with pytest.raises(ValueError):
+        PreflopEquity.load(path)
+    assert PreflopEquity.cached(path, samples=5).equities == table.equities
+    assert PreflopEquity.load(path).equities == table.equities
+
+
+def test_solver_accepts_a_table_path(tmp_path):
+    path = str(tmp_path / "equity.bin")
+    PreflopEquity.cached(path, samples=5)
+    solver = PushFoldSolver([200, 200], [1], 10, 20, equity=path)
+    assert solver.equity.samples == 5
@@ -0,0 +1,34 @@
+import pytest
+from simulation import League
+
+STRATEGIES = {"a": "allways_call", "b": "allways_call", "c": "allways_call"}
+
+
+def make_league(path, format="round_robin", rounds=1):
+    return League(
+        STRATEGIES,
+        str(path),
+        format=format,
+        hands_per_match=5,
+        rounds=rounds,
+        processes=0,
+    )
+
+
+def test_resume_reads_back_completed_matches(tmp_path):
+    path = tmp_path / "league.jsonl"
+    standings = make_league(path).run()
+    lines = path.read_text().splitlines()
+    assert len(lines) == 1 + 6  # header, then 3 pairs in both seat orders
+
+    assert make_league(path).run() == standings
+    assert path.read_text().splitlines() == lines
+    make_league(path, rounds=2).run()
+    assert path.read_text().splitlines()[: len(lines)] == lines
+
+
+def test_results_of_another_configuration_are_refused(tmp_path):
+    path = tmp_path / "league.jsonl"
+    make_league(path).run()
+    with pytest.raises(ValueError):
+        make_league(path, format="swiss").run()
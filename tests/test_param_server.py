@@ -0,0 +1,42 @@
+import multiprocessing
+from simulation import ParameterClient, ParameterServer
+
+
+def read_latest(name, lock, queue):
+    client = ParameterClient(name, 1, lock)
+    queue.put((client.version, list(client.weights)))
+    client.close()
+
+
+def test_pinned_versions_survive_publishing_without_waiting():
+    server = ParameterServer(capacity=4, max_readers=2)
+    try:
+        server.publish([1.0, 2.0])
+        stale = ParameterClient(server.name, 0, server.lock)
+        fresh = ParameterClient(server.name, 1, server.lock)
+        for version in range(2, 12):
+            # every slot but the published one and the two pinned ones is free
+            assert server.publish([float(version)] * 3, timeout=0) == version
+            assert fresh.refresh()
+            assert fresh.version == version and list(fresh.weights) == [version] * 3
+        assert stale.version == 1 and stale.is_valid()
+        assert list(stale.weights) == [1.0, 2.0]
+        stale.close()
+        fresh.close()
+    finally:
+        server.close()
+
+
+def test_client_in_another_process_reads_the_published_weights():
+    server = ParameterServer(capacity=3, max_readers=2)
+    try:
+        server.publish([0.5, 1.5, 2.5])
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(
+            target=read_latest, args=(server.name, server.lock, queue)
+        )
+        process.start()
+        assert queue.get(timeout=60) == (1, [0.5, 1.5, 2.5])
+        process.join()
+    finally:
+        server.close()
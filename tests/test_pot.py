@@ -0,0 +1,66 @@
+import random
+from game_structure import build_pots, award_pots, uncalled_chips
+
+
+def reference_awards(contributions, values, first_seat):
+    """Pot by pot, every contribution level being a pot of its own"""
+    n = len(contributions)
+    awards = [0] * n
+    previous = 0
+    for level in sorted(set(contributions)):
+        amount = sum(min(c, level) - min(c, previous) for c in contributions)
+        previous = level
+        eligible = [seat for seat in range(n) if contributions[seat] >= level]
+        best = max(values[seat] for seat in eligible)
+        winners = [seat for seat in eligible if values[seat] == best]
+        winners.sort(key=lambda seat: (seat - first_seat) % n)
+        share, odd_chips = divmod(amount, len(winners))
+        for index, seat in enumerate(winners):
+            awards[seat] += share + (index < odd_chips)
+    return awards
+
+
+def test_awards_match_reference():
+    rng = random.Random(0)
+    for _ in range(2000):
+        n = rng.randint(2, 9)
+        contributions = [rng.randint(1, 100) for _ in range(n)]
+        values = [rng.randint(1, 4) for _ in range(n)]
+        ranking = sorted(((values[seat], seat) for seat in range(n)), reverse=True)
+        first_seat = rng.randrange(n)
+        pots = build_pots(contributions, [True] * n)
+        awards, _ = award_pots(pots, contributions, ranking, first_seat)
+        assert awards == reference_awards(contributions, values, first_seat)
+
+
+def test_folded_chips_are_conserved():
+    rng = random.Random(1)
+    for _ in range(2000):
+        n = rng.randint(2, 9)
+        contributions = [rng.randint(0, 100) for _ in range(n)]
+        live = [rng.random() < 0.6 for _ in range(n)]
+        live[rng.randrange(n)] = True
+        pots = build_pots(contributions, live)
+        assert sum(amount for amount, _ in pots) == sum(contributions)
+        ranking = sorted(
+            ((rng.randint(1, 3), seat) for seat in range(n) if live[seat]),
+            reverse=True,
+        )
+        awards, _ = award_pots(pots, contributions, ranking, 0)
+        assert sum(awards) == sum(contributions)
+        assert all(award == 0 for award, alive in zip(awards, live) if not alive)
+
+
+def test_side_pots():
+    assert build_pots([10, 50, 50, 100], [True] * 4) == [(40, 10), (120, 50), (50, 100)]
+    # the chips above the live seats go to the last pot
+    assert build_pots([10, 50, 50, 100], [True, False, True, False]) == [
+        (40, 10),
+        (170, 50),
+    ]
+
+
+def test_uncalled_chips():
+    assert uncalled_chips([10, 50, 50, 100]) == (3, 50)
+    assert uncalled_chips([10, 100, 100]) == (1, 0)
+    assert uncalled_chips([0, 2]) == (1, 2)
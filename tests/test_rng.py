@@ -0,0 +1,46 @@
+from game_structure import AIPlayer, DealGenerator, Game
+from game_structure.rng import DECK_SIZE
+
+
+def test_lazy_deals_match_whole_blocks():
+    deals = DealGenerator(5, block_size=8)
+    first = deals.deal(0)
+    order = [11, 3, 9, 24, 8, 0]  # forward, backward and across blocks
+    served = [bytes(deals.deal(i)) for i in order]
+    blocks = [DealGenerator(5, block_size=8).generate_block(k) for k in range(4)]
+    expected = [bytes(blocks[i // 8][i % 8 * DECK_SIZE :][:DECK_SIZE]) for i in order]
+    assert served == expected
+    assert bytes(first) == expected[-1]
+
+
+def test_games_sharing_a_generator_are_dealt_like_separate_ones():
+    def hole_cards(game):
+        return [
+            [card.code for card in player.hand.hole_cards] for player in game.players
+        ]
+
+    deals = DealGenerator(3)
+    shared = [Game(deals=deals), Game(deals=deals)]
+    separate = Game(seed=3)
+    for game in shared + [separate]:
+        for name in "abc":
+            game.add_player(AIPlayer(name, 100))
+    for _ in range(5):
+        for game in shared + [separate]:
+            game.start_new_hand()
+        assert hole_cards(shared[0]) == hole_cards(shared[1]) == hole_cards(separate)
+
+
+def test_deals_are_uniform_permutations():
+    deals = DealGenerator(11, block_size=100)  # chunks of the block end mid-way
+    block = deals.generate_block(0) + deals.generate_block(1)
+    tops = [0] * DECK_SIZE
+    for index in range(200):
+        order = bytes(deals.deal(index))
+        assert order == bytes(block[index * DECK_SIZE :][:DECK_SIZE])
+        assert sorted(order) == list(range(DECK_SIZE))
+    more = DealGenerator(12, block_size=4096).generate_block(0)
+    for start in range(0, len(more), DECK_SIZE):
+        tops[more[start + DECK_SIZE - 1]] += 1
+    # 4096 / 52 = 78.8 tops per card on average
+    assert 40 < min(tops) and max(tops) < 125
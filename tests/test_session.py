@@ -0,0 +1,93 @@
+import gc
+from game_structure import BlindSchedule, EventType, Session
+from tests.helpers import make_game
+
+
+def test_blind_levels_follow_the_schedule():
+    schedule = BlindSchedule([(1, 2), (5, 10), (25, 50)], hands_per_level=2)
+    game = make_game(0, [10**6] * 3)
+    posted = []
+    game.events.subscribe(lambda event: posted.append(event.amount), [EventType.BLIND])
+    session = Session(game, schedule, freeze_gc=False)
+    for _ in range(7):
+        assert session.play(1) == 1  # chunks of one hand keep the hand count
+    levels = [tuple(posted[index : index + 2]) for index in range(0, len(posted), 2)]
+    assert levels == [(1, 2)] * 2 + [(5, 10)] * 2 + [(25, 50)] * 3
+    assert session.hands_played == 7
+
+
+def test_rebuys_are_limited():
+    game = make_game(1, [3, 1000, 1000])
+    session = Session(game, rebuy_chips=3, max_rebuys=1, freeze_gc=False)
+    session.play(500)
+    assert session.rebuys == {"p0": 1, "p1": 0, "p2": 0}
+    assert [name for name, _ in session.eliminated] == ["p0"]
+    assert [player.name for player in game.players] == ["p1", "p2"]
+
+    # without rebuy chips nobody rebuys
+    game = make_game(1, [3, 1000, 1000])
+    session = Session(game, max_rebuys=None, freeze_gc=False)
+    session.play(500)
+    assert session.rebuys["p0"] == 0 and session.eliminated[0][0] == "p0"
+
+
+def test_standings_rank_eliminated_players_last():
+    game = make_game(2, [4, 6, 30, 60])
+    session = Session(game, freeze_gc=False)
+    assert session.play(10**4) < 10**4 and session.is_over
+    (winner,) = game.players
+    assert winner.chips == 100
+    eliminated = [name for name, _ in session.eliminated]
+    assert sorted(eliminated + [winner.name]) == ["p0", "p1", "p2", "p3"]
+    assert session.standings() == [winner.name] + eliminated[::-1]
+    hands = [hand for _, hand in session.eliminated]
+    assert hands == sorted(hands)
+
+
+def test_players_busted_by_the_same_hand_rank_by_stack():
+    game = make_game(0, [9, 5, 100])
+    session = Session(game, freeze_gc=False)
+    # the big stack won a hand against both short stacks, all-in
+    for player, chips in zip(game.players, [0, 0, 114]):
+        player.chips = chips
+    session._handle_busted([-9, -5, 14])
+    assert [name for name, _ in session.eliminated] == ["p1", "p0"]
+    assert session.standings() == ["p2", "p0", "p1"]
+
+
+def test_button_after_a_player_is_removed():
+    def dealer_after(removed):
+        game = make_game(3, [100] * 5, names="abcde")
+        game.start_new_hand()
+        game.start_new_hand()
+        assert game.players[game.dealer_position].name == "c"
+        game.remove_player(game.players["abcde".index(removed)])
+        game.start_new_hand()
+        return (
+            game.players[game.dealer_position].name,
+            game.players[game.small_blind_position].name,
+            game.players[game.big_blind_position].name,
+        )
+
+    # the button moves on to the next player still seated
+    assert dealer_after("a") == ("d", "e", "b")
+    assert dealer_after("c") == ("d", "e", "a")
+    assert dealer_after("d") == ("e", "a", "b")
+    assert dealer_after("e") == ("d", "a", "b")
+
+
+def test_gc_is_frozen_once():
+    game = make_game(4, [100] * 3)
+    session = Session(game, rebuy_chips=100, max_rebuys=None)
+    frozen = gc.get_freeze_count()
+    try:
+        session.play(2)
+        after_first = gc.get_freeze_count()
+        assert after_first > frozen
+        garbage = [[] for _ in range(1000)]
+        session.play(2)
+        # no second freeze: the objects created since are not frozen
+        assert gc.get_freeze_count() == after_first
+        del garbage
+    finally:
+        gc.unfreeze()
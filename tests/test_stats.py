@@ -0,0 +1,52 @@
+import random
+from game_structure import Action, ActionType, OpponentTracker
+from tests.helpers import make_game, step
+
+
+def test_interleaved_games_keep_separate_hand_state():
+    shared = OpponentTracker()
+    alone = [OpponentTracker(), OpponentTracker()]
+    games = [
+        make_game(1, [100] * 3, names=["a", "b", "c"]),
+        make_game(2, [100] * 3, names=["d", "e", "f"]),
+    ]
+    for game, tracker in zip(games, alone):
+        game.events.subscribe(shared)
+        game.events.subscribe(tracker)
+
+    rng = random.Random(0)
+    for _ in range(60):
+        for game in games:
+            for player in game.players:
+                player.chips = 100
+            game.start_new_hand()
+        while not all(game.game_over for game in games):
+            for game in games:
+                if not game.game_over:
+                    step(game, rng)
+
+    for game, tracker in zip(games, alone):
+        for player in game.players:
+            assert shared.get_stats(player.name) == tracker.get_stats(player.name)
+    assert any(shared.fold_to_cbet(name) for name in "abcdef")
+
+
+def test_uncalled_chips_are_not_a_showdown_win():
+    stacks = [20, 50, 100]
+    game = make_game(4, stacks)
+    tracker = OpponentTracker()
+    game.events.subscribe(tracker)
+    game.start_new_hand()
+    while not game.game_over:
+        player = game.players[game.current_round.current_player_index]
+        if player.chips + player.current_bet > game.current_round.current_bet:
+            action = Action(ActionType.RAISE, -1)
+        else:
+            action = Action(ActionType.CALL)
+        assert game.handle_action(player, action)
+
+    for player, chips in zip(game.players, stacks):
+        won = tracker.won_at_showdown(player.name)
+        assert won == (1.0 if player.chips > chips else 0.0)
+    # the biggest stack lost its 50 matched chips and got its 50 uncalled ones back
+    assert game.players[2].chips == 50
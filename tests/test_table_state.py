@@ -0,0 +1,96 @@
+import pytest
+from game_structure import AIPlayer, TableState
+from game_structure.table_state import NO_CARD
+
+
+def seated(*stacks):
+    table = TableState()
+    players = [AIPlayer(f"p{index}", chips) for index, chips in enumerate(stacks)]
+    for player in players:
+        table.add_seat(player)
+    return table, players
+
+
+def test_add_seat_binds_the_player_to_the_table():
+    player = AIPlayer("a", 100)
+    player.place_bet(30)
+    table = TableState()
+    assert table.add_seat(AIPlayer("b", 50)) == 0
+    assert table.add_seat(player) == 1
+    # the seat starts from the player's state, which is then read from the table
+    assert list(table.chips) == [50, 70]
+    assert (table.current_bet[1], table.spoke[1]) == (30, 1)
+    player.chips += 5
+    table.current_bet[1] = 0
+    assert (table.chips[1], player.current_bet) == (75, 0)
+    assert table.players[1] is player and len(table) == 2
+
+
+def test_remove_seat_rebinds_the_following_seats():
+    table, players = seated(10, 20, 30)
+    table.set_hole_card(2, 1, 7)
+    table.remove_seat(0)
+    assert len(table) == 2 and list(table.chips) == [20, 30]
+    assert table.players == players[1:]
+    assert list(table.hole_cards) == [NO_CARD, NO_CARD, NO_CARD, 7]
+    players[2].chips = 31
+    assert table.chips[1] == 31
+
+    # the removed player keeps its state on a table of its own
+    removed = players[0]
+    removed.chips += 1
+    assert removed.chips == 11 and list(table.chips) == [20, 31]
+
+    # the reset templates follow the number of seats
+    table.reset_hand()
+    table.new_stage()
+    assert len(table.current_bet) == len(table.folded) == 2
+    assert len(table.hole_cards) == 4
+
+
+def test_reset_hand_and_new_stage():
+    table, players = seated(100, 100, 100)
+    table.post_blinds([0, 1], [1, 2])
+    players[2].place_bet(6)
+    players[0].fold()
+    table.set_hole_card(1, 0, 12)
+    players[1].reveal()
+
+    table.new_stage()
+    assert list(table.current_bet) == [0, 0, 0]
+    assert list(table.spoke) == [0, 0, 0]
+    # the rest of the hand is kept until the next one
+    assert list(table.contributed) == [1, 2, 6]
+    assert (players[0].folded, players[1].revealed) == (True, True)
+    assert table.hole_cards[2] == 12
+
+    table.reset_hand()
+    assert list(table.contributed) == [0, 0, 0]
+    assert list(table.folded) == list(table.revealed) == [0, 0, 0]
+    assert list(table.is_active) == [1, 1, 1]
+    assert list(table.hole_cards) == [NO_CARD] * 6
+    assert list(table.chips) == [99, 98, 94]
+
+
+def test_serialization_round_trip():
+    table, players = seated(5, 40, 80)
+    table.post_blinds([0, 1], [10, 20])
+    players[2].place_bet(20)
+    table.set_hole_card(0, 0, 51)
+    table.set_hole_card(0, 1, 0)
+
+    copy = table.copy()
+    assert copy.to_bytes() == table.to_bytes()
+    assert copy.is_all_in[0] == 1 and copy.players == [None] * 3
+    # the copy is unbound: playing on it does not touch the original table
+    copy.chips[1] = 0
+    assert players[1].chips == 20
+
+    restored, _ = seated(0, 0, 0)
+    restored.load_bytes(table.to_bytes())
+    assert restored.to_bytes() == table.to_bytes()
+    assert [player.chips for player in restored.players] == [0, 20, 60]
+
+    smaller, _ = seated(0, 0)
+    with pytest.raises(ValueError):
+        smaller.load_bytes(table.to_bytes())